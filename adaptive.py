@@ -0,0 +1,196 @@
+"""
+Adaptive Difficulty Module
+Per-user, per-topic mastery estimates driven by practice history.
+
+Each topic keeps an Elo rating that is updated incrementally whenever a
+practice session is saved: every answered question is a "match" between the
+child's topic rating and the level's difficulty rating. The ratings are then
+used to suggest the next level and the topics that need the most practice.
+"""
+
+import os
+import re
+import json
+import math
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import question_bank
+
+MASTERY_FILE = "mastery.json"
+
+# Difficulty rating of a typical question at each level
+LEVEL_RATINGS = {"P1": 800, "P2": 900, "P3": 1000, "P4": 1100, "P5": 1200, "P6": 1300, "PLSE": 1400}
+DEFAULT_RATING = 1000
+TARGET_SUCCESS = 0.75  # aim for questions the child gets right ~3 times out of 4
+# Rating gap at which expected success equals TARGET_SUCCESS (~191 points)
+TARGET_GAP = 400.0 * math.log10(TARGET_SUCCESS / (1 - TARGET_SUCCESS))
+
+# Topic classification rules, checked in order (first match wins)
+_TOPIC_RULES = [
+    ("heads_and_legs", re.compile(r"\bheads?\b.*\b(legs|feet)\b", re.IGNORECASE)),
+    ("equations", re.compile(r"\bsolve\b|\b[a-z]\s*=\s*\?", re.IGNORECASE)),
+    ("percentages", re.compile(r"%|percent|discount|profit|loss", re.IGNORECASE)),
+    ("ratios", re.compile(r"\bratio\b|\d+\s*:\s*\d+", re.IGNORECASE)),
+    ("circles", re.compile(r"circle|π|radius|diameter", re.IGNORECASE)),
+    ("volume", re.compile(r"volume|cm³|cubic", re.IGNORECASE)),
+    ("area", re.compile(r"\barea\b|cm²", re.IGNORECASE)),
+    ("perimeter", re.compile(r"perimeter", re.IGNORECASE)),
+    ("speed", re.compile(r"km/h|speed|travels", re.IGNORECASE)),
+    ("statistics", re.compile(r"\bmean\b|average|median", re.IGNORECASE)),
+    ("fractions", re.compile(r"\d+\s*/\s*\d+|fraction", re.IGNORECASE)),
+    ("decimals", re.compile(r"\d\.\d")),
+    ("money", re.compile(r"\$|dollar|cents?\b", re.IGNORECASE)),
+    ("word_problem", re.compile(r"[a-z]{3,}.*[a-z]{3,}.*[a-z]{3,}", re.IGNORECASE)),
+    ("mixed_operations", re.compile(r"\d\s*[-−+]\s*\d+\)?\s*[×÷*]|[×÷*]\s*\(?\d+\s*[-−+]\s*\d")),
+    ("division", re.compile(r"÷")),
+    ("multiplication", re.compile(r"×|\d\s*[x*]\s*\d")),
+    ("subtraction", re.compile(r"\d\s*[-−]\s*\d")),
+    ("addition", re.compile(r"\d\s*\+\s*\d")),
+]
+
+_lock = threading.Lock()
+_cache: Dict[str, object] = {"mtime": None, "data": {}}
+
+
+# ------------------- Helpers -------------------
+
+
+def classify_topic(question: str) -> str:
+    """Map a question to a topic name (matching question_bank topic names where possible)."""
+    for topic, pattern in _TOPIC_RULES:
+        if pattern.search(question):
+            return topic
+    return "other"
+
+
+def expected_success(rating: float, level: str) -> float:
+    """Elo expected score of a child with `rating` against a question at `level`."""
+    difficulty = LEVEL_RATINGS.get(level, DEFAULT_RATING)
+    return 1.0 / (1.0 + 10 ** ((difficulty - rating) / 400.0))
+
+
+def _k_factor(n: int) -> float:
+    """Move quickly for new topics, then settle."""
+    return 48.0 if n < 10 else 32.0 if n < 40 else 20.0
+
+
+def load_mastery() -> dict:
+    """Load all mastery data (cached until the file changes)."""
+    try:
+        mtime = os.path.getmtime(MASTERY_FILE)
+    except OSError:
+        return {}
+    if _cache["mtime"] != mtime:
+        try:
+            with open(MASTERY_FILE, "r") as f:
+                _cache["data"] = json.load(f)
+        except (json.JSONDecodeError, ValueError):
+            _cache["data"] = {}
+        _cache["mtime"] = mtime
+    return _cache["data"]
+
+
+def _save_mastery(data: dict) -> None:
+    tmp_path = f"{MASTERY_FILE}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, MASTERY_FILE)
+
+
+def get_user_mastery(user: str) -> Dict[str, dict]:
+    """Return {topic: {"rating": float, "n": int}} for a user."""
+    return load_mastery().get(user, {}).get("topics", {})
+
+
+# ------------------- Updates -------------------
+
+
+def record_session(user: str, level: str, results: list) -> Dict[str, dict]:
+    """
+    Update a user's topic ratings from one practice session.
+
+    Args:
+        user: The user name/profile
+        level: Level the questions were generated for
+        results: List of {"q", "ans", "correct", "is_correct"} dicts as saved to history
+
+    Returns:
+        The user's updated topic ratings
+    """
+    with _lock:
+        data = dict(load_mastery())
+        user_data = dict(data.get(user, {}))
+        topics = {k: dict(v) for k, v in user_data.get("topics", {}).items()}
+        # New topics start "on target" for the level the child chose
+        start_rating = LEVEL_RATINGS.get(level, DEFAULT_RATING) + TARGET_GAP
+
+        for result in results:
+            topic = classify_topic(result.get("q", ""))
+            state = topics.setdefault(topic, {"rating": float(start_rating), "n": 0})
+            # The page's grade of the typed answer; "ans" is only its numeric value (e.g. "80%" -> 0.8)
+            outcome = 1.0 if result.get("is_correct") else 0.0
+            state["rating"] += _k_factor(state["n"]) * (outcome - expected_success(state["rating"], level))
+            state["rating"] = round(state["rating"], 1)
+            state["n"] += 1
+
+        user_data["topics"] = topics
+        user_data["last_level"] = level
+        user_data["updated"] = datetime.now().isoformat()
+        data[user] = user_data
+        _save_mastery(data)
+        return topics
+
+
+# ------------------- Recommendations -------------------
+
+
+def overall_rating(user: str) -> Optional[float]:
+    """Attempt-weighted mean of a user's topic ratings, or None without history."""
+    topics = get_user_mastery(user)
+    total = sum(t["n"] for t in topics.values())
+    if not total:
+        return None
+    return sum(t["rating"] * t["n"] for t in topics.values()) / total
+
+
+def recommend_level(user: str) -> Optional[str]:
+    """Suggest the level where the child is expected to succeed about TARGET_SUCCESS of the time."""
+    rating = overall_rating(user)
+    if rating is None:
+        return None
+    # Solve expected_success(rating, level) == TARGET_SUCCESS for the difficulty
+    target = rating - TARGET_GAP
+    return min(LEVEL_RATINGS, key=lambda level: abs(LEVEL_RATINGS[level] - target))
+
+
+def plan_session(user: str, level: str, count: int) -> Dict[str, int]:
+    """
+    Pick a question mix for the next session, weighted towards weak topics.
+
+    Returns:
+        {topic: number_of_questions} over the level's topics, summing to `count`
+    """
+    level = level.upper()
+    topics = get_user_mastery(user)
+    weights = {}
+    for topic in question_bank.topics_for_level(level):
+        state = topics.get(topic)
+        success = expected_success(state["rating"], level) if state else TARGET_SUCCESS
+        weights[topic] = (1.0 - success) ** 2 + 0.02  # squared so weak topics stand out
+
+    # Largest-remainder allocation so the counts add up exactly
+    total = sum(weights.values())
+    shares = {t: count * w / total for t, w in weights.items()}
+    plan = {t: int(s) for t, s in shares.items()}
+    for topic in sorted(shares, key=lambda t: shares[t] - plan[t], reverse=True)[:count - sum(plan.values())]:
+        plan[topic] += 1
+    return {t: n for t, n in plan.items() if n}
+
+
+def focus_topics(user: str, level: str, limit: int = 3) -> List[str]:
+    """Topics with the lowest expected success at `level` (only topics already practiced)."""
+    topics = get_user_mastery(user)
+    ranked = sorted(topics, key=lambda t: expected_success(topics[t]["rating"], level))
+    return [t for t in ranked if t != "other" and expected_success(topics[t]["rating"], level) < TARGET_SUCCESS][:limit]
@@ -0,0 +1,204 @@
+"""
+Answer Check Module
+Exact answer normalization and grading built on `fractions.Fraction`.
+
+Accepted answer forms:
+  - integers and decimals: "12", "-3", "0.75", ".5"
+  - thousands separators: "1,200", "12,345.5"
+  - fractions and mixed numbers: "3/4", "1 1/2"
+  - percentages: "25%"
+  - optional currency sign and trailing units: "$40", "12 cm", "96 cm²"
+
+Answer keys are stored as int/float, except percentages, which are kept as
+text ("25%", see `to_key`) so the key remembers it is in percent units
+through JSON storage.
+
+Grading rules (see `grade`):
+  1. exact rational equality
+  2. float noise in the stored answer (e.g. 0.1 + 0.2 stored as 0.30000000000000004)
+  3. a decimal rounded to 2+ places is accepted for answers that do not
+     terminate within that many places (e.g. "0.33" for 1/3)
+  4. percentages mean the same on both sides: a percentage key is compared
+     in percent units ("25" and "25%" both answer "25%"), and against a
+     plain key an answer with "%" is divided by 100 ("80%" answers 0.8, not 80)
+"""
+
+import re
+from fractions import Fraction
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple, Union
+
+Number = Union[int, float, Fraction]
+Answer = Union[Number, str]  # a stored key; str only for percentages such as "25%"
+
+# Relative tolerance for answers stored as floats (covers binary rounding noise only)
+FLOAT_NOISE = Fraction(1, 10**9)
+
+_ANSWER_RE = re.compile(
+    r"""^\s*
+    (?P<sign>[-+−])?\s*\$?\s*
+    (?:
+        (?P<whole>\d+)\s+(?P<mnum>\d+)\s*/\s*(?P<mden>\d+)              # mixed number
+      | (?P<num>\d+(?:\.\d+)?)\s*/\s*(?P<den>\d+(?:\.\d+)?)               # fraction
+      | (?P<dec>\d{1,3}(?:,\d{3})+(?:\.\d+)?|\d+(?:\.\d*)?|\.\d+)       # decimal
+    )
+    \s*(?P<pct>%)?
+    \s*(?:[^\W\d_]+[²³]?\.?)?                                            # trailing unit
+    \s*$""",
+    re.VERBOSE,
+)
+
+
+# ------------------- Parsing -------------------
+
+
+@lru_cache(maxsize=4096)
+def _parse(text: str) -> Optional[Tuple[Fraction, bool, int]]:
+    """Parse text into (value, is_percent, decimal_places) or None."""
+    match = _ANSWER_RE.match(text)
+    if not match:
+        return None
+
+    places = 0
+    if match.group("whole"):
+        den = int(match.group("mden"))
+        if den == 0:
+            return None
+        value = int(match.group("whole")) + Fraction(int(match.group("mnum")), den)
+    elif match.group("num"):
+        den = Fraction(match.group("den"))
+        if den == 0:
+            return None
+        value = Fraction(match.group("num")) / den
+    else:
+        dec = match.group("dec").replace(",", "")
+        if "." in dec:
+            places = len(dec.split(".", 1)[1])
+        value = Fraction(dec.rstrip(".") or "0")
+
+    if match.group("sign") in ("-", "−"):
+        value = -value
+    return value, bool(match.group("pct")), places
+
+
+def parse_answer(text) -> Optional[Fraction]:
+    """
+    Parse a user or LLM answer into an exact Fraction.
+
+    Args:
+        text: Answer text (numbers are accepted too)
+
+    Returns:
+        The exact value (percentages divided by 100), or None if unparseable
+    """
+    if text is None:
+        return None
+    if not isinstance(text, str):
+        return to_fraction(text)
+    parsed = _parse(text.strip())
+    if parsed is None:
+        return None
+    value, is_percent, _ = parsed
+    return value / 100 if is_percent else value
+
+
+def to_key(text: str) -> Optional[Answer]:
+    """
+    Parse an answer key (e.g. an LLM's "A:" line) into its stored form.
+
+    Returns:
+        int/float for numbers, "<n>%" for percentages, or None if unparseable
+    """
+    parsed = _parse(text.strip())
+    if parsed is None:
+        return None
+    value, is_percent, _ = parsed
+    if is_percent:
+        return f"{format_answer(value)}%"
+    return to_number(value)
+
+
+def _percent_key(correct: Answer) -> Optional[Fraction]:
+    """The value in percent units of a percentage key ("25%" -> 25), else None."""
+    if not isinstance(correct, str):
+        return None
+    parsed = _parse(correct.strip())
+    return parsed[0] if parsed and parsed[1] else None
+
+
+def to_fraction(value: Answer) -> Fraction:
+    """Convert a stored answer to a Fraction (floats via their shortest repr, so 0.1 -> 1/10; "25%" -> 1/4)."""
+    if isinstance(value, str):
+        parsed = parse_answer(value)
+        if parsed is None:
+            raise ValueError(f"Not an answer: {value!r}")
+        return parsed
+    if isinstance(value, float):
+        return Fraction(repr(value))
+    return Fraction(value)
+
+
+def to_number(value: Fraction):
+    """Convert an exact value to the int/float form stored in question tuples and history."""
+    value = Fraction(value)
+    return value.numerator if value.denominator == 1 else float(value)
+
+
+def format_answer(value: Answer) -> str:
+    """Format an answer for display ("1/3" for non-terminating values, "0.75" otherwise; keys like "25%" as is)."""
+    if isinstance(value, str):
+        return value.strip()
+    exact = to_fraction(value)
+    value = exact.limit_denominator(1000)
+    if abs(value - exact) > FLOAT_NOISE * max(1, abs(exact)):
+        value = exact
+    if value.denominator == 1:
+        return str(value.numerator)
+    if (value * 10**6).denominator != 1:
+        return f"{value.numerator}/{value.denominator}"
+    return f"{float(value):g}"
+
+
+# ------------------- Grading -------------------
+
+
+def _matches(user: Fraction, correct: Fraction, places: int, correct_is_float: bool) -> bool:
+    if user == correct:
+        return True
+    if correct_is_float and abs(user - correct) <= FLOAT_NOISE * max(1, abs(correct)):
+        return True
+    if places >= 2 and (correct * 10**places).denominator != 1:
+        return abs(user - correct) <= Fraction(1, 2 * 10**places)
+    return False
+
+
+def grade(user_text, correct: Answer) -> bool:
+    """
+    Check a submitted answer against the correct one.
+
+    Args:
+        user_text: The raw answer typed by the user
+        correct: The stored correct answer (int, float, Fraction or a percentage key like "25%")
+
+    Returns:
+        True if the answer is correct under the module's tolerance rules
+    """
+    if user_text is None:
+        return False
+    parsed = _parse(str(user_text).strip())
+    if parsed is None:
+        return False
+
+    value, is_percent, places = parsed
+    percent_key = _percent_key(correct)
+    if percent_key is not None:
+        # The key is in percent units, so the "%" on the answer is optional
+        return _matches(value, percent_key, places, False)
+    if is_percent:
+        value, places = value / 100, places + 2
+    return _matches(value, to_fraction(correct), places, isinstance(correct, float))
+
+
+def grade_batch(submissions: Iterable[Tuple[str, Answer]]) -> List[bool]:
+    """Grade many (user_text, correct) pairs; parsing is cached across calls."""
+    return [grade(user_text, correct) for user_text, correct in submissions]
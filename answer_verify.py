@@ -0,0 +1,142 @@
+"""
+Answer Verify Module
+Checks LLM-generated answer keys for pure-calculation questions.
+
+Questions such as "3/4 × 2/3 = ?", "144 ÷ 12 = ?" or "15% of 80 = ?" are
+rewritten into plain arithmetic and evaluated exactly with a restricted AST
+evaluator (numbers, + - × ÷, brackets only; no names, calls or attributes).
+Word problems cannot be checked this way and are kept as they are.
+"""
+
+import ast
+import operator
+import re
+from fractions import Fraction
+from typing import List, Optional, Tuple
+
+import answer_check
+
+MAX_EXPRESSION_LENGTH = 120
+
+_BIN_OPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+}
+_UNARY_OPS = {
+    ast.UAdd: operator.pos,
+    ast.USub: operator.neg,
+}
+
+_PREFIX_RE = re.compile(r"^\s*(?:what is|calculate|find|work out|evaluate|compute)\s*:?\s*", re.IGNORECASE)
+_TRAILER_RE = re.compile(r"\s*(?:\(give your answer as a decimal\)|=\s*\?|\?|=)\s*$", re.IGNORECASE)
+_PERCENT_OF_RE = re.compile(r"(\d+(?:\.\d+)?)\s*%\s*of\s*")
+_FRACTION_OF_RE = re.compile(r"(\d+\s*/\s*\d+)\s*of\s*")
+_TIMES_RE = re.compile(r"(?<=[\d)])\s*[x×]\s*(?=[\d(])")
+_ARITHMETIC_RE = re.compile(r"^[\d\s.+\-*/()]+$")
+
+
+# ------------------- Evaluation -------------------
+
+
+def _eval_node(node) -> Fraction:
+    if isinstance(node, ast.Expression):
+        return _eval_node(node.body)
+    if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+        return Fraction(str(node.value))
+    if isinstance(node, ast.BinOp) and type(node.op) in _BIN_OPS:
+        left, right = _eval_node(node.left), _eval_node(node.right)
+        if isinstance(node.op, ast.Div) and right == 0:
+            raise ValueError("Division by zero")
+        return _BIN_OPS[type(node.op)](left, right)
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY_OPS:
+        return _UNARY_OPS[type(node.op)](_eval_node(node.operand))
+    raise ValueError(f"Unsupported expression element: {type(node).__name__}")
+
+
+def safe_eval(expression: str) -> Fraction:
+    """
+    Evaluate a plain arithmetic expression exactly.
+
+    Args:
+        expression: Expression using numbers, + - * / and brackets
+
+    Returns:
+        The exact value as a Fraction
+
+    Raises:
+        ValueError: If the expression contains anything else or cannot be evaluated
+    """
+    if len(expression) > MAX_EXPRESSION_LENGTH or not _ARITHMETIC_RE.match(expression):
+        raise ValueError("Not a plain arithmetic expression")
+    try:
+        tree = ast.parse(expression.strip(), mode="eval")
+    except SyntaxError as e:
+        raise ValueError(f"Invalid expression: {e}") from e
+    return _eval_node(tree)
+
+
+def extract_expression(question: str) -> Optional[str]:
+    """
+    Rewrite a pure-calculation question into a plain arithmetic expression.
+
+    Returns:
+        The expression (e.g. "15/100*80" for "15% of 80 = ?"), or None for word problems
+    """
+    text = _PREFIX_RE.sub("", question.strip())
+    while True:
+        stripped = _TRAILER_RE.sub("", text)
+        if stripped == text:
+            break
+        text = stripped
+
+    text = text.replace("÷", "/").replace("−", "-").replace("–", "-")
+    text = _PERCENT_OF_RE.sub(r"\1/100*", text)
+    text = _FRACTION_OF_RE.sub(r"(\1)*", text)
+    text = _TIMES_RE.sub("*", text)
+    text = re.sub(r"(\d+(?:\.\d+)?)\s*%", r"(\1/100)", text)
+
+    if not text or not _ARITHMETIC_RE.match(text) or not re.search(r"\d\s*[-+*/]", text):
+        return None
+    return text
+
+
+# ------------------- Verification -------------------
+
+
+def verify_question(question: str, answer) -> Optional[bool]:
+    """
+    Check a stated answer for a pure-calculation question.
+
+    Returns:
+        True/False if the question could be evaluated, None if it is not verifiable
+    """
+    expression = extract_expression(question)
+    if expression is None:
+        return None
+    try:
+        expected = safe_eval(expression)
+    except (ValueError, ZeroDivisionError, RecursionError):
+        return None
+    stated = answer_check.parse_answer(answer)
+    if stated is None:
+        return False
+    # Keys are stored as floats, so non-terminating values (2/3, 3 1/3) carry binary rounding noise
+    return abs(stated - expected) <= answer_check.FLOAT_NOISE * max(1, abs(expected))
+
+
+def verify_questions(questions: List[Tuple[str, float]]) -> Tuple[List[Tuple[str, float]], List[Tuple[str, float]]]:
+    """
+    Split questions into those whose answers check out (or cannot be checked) and rejected ones.
+
+    Returns:
+        (kept, rejected) lists of (question_string, answer) tuples, order preserved
+    """
+    kept, rejected = [], []
+    for question, answer in questions:
+        if verify_question(question, answer) is False:
+            rejected.append((question, answer))
+        else:
+            kept.append((question, answer))
+    return kept, rejected
@@ -0,0 +1,130 @@
+"""
+App Metrics Module
+Prometheus counters and histograms for the app's hot paths.
+
+  - LLM calls by feature and model (count, latency, time to first token,
+    tokens, retries), fed from llm_telemetry events
+  - Gist load/save latency (chat history)
+  - history.json read/write time
+  - Reruns per page and the number of active sessions
+
+`start_metrics_server()` exposes them on http://127.0.0.1:<METRICS_PORT>/metrics
+(default 9464) once per process. `prometheus_client` is optional: without it
+every metric is a no-op and no server is started.
+"""
+
+import os
+import time
+import threading
+from contextlib import contextmanager
+
+try:
+    from prometheus_client import Counter, Gauge, Histogram, start_http_server
+except ImportError:  # metrics are optional
+    Counter = Gauge = Histogram = start_http_server = None
+
+METRICS_PORT = int(os.environ.get("METRICS_PORT", "9464"))
+METRICS_ADDR = os.environ.get("METRICS_ADDR", "127.0.0.1")
+
+LLM_BUCKETS = (0.25, 0.5, 1, 2, 4, 8, 15, 30, 60, 120)
+IO_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+class _NoOpMetric:
+    """Stands in for a metric when prometheus_client is not installed."""
+
+    def labels(self, *args, **kwargs):
+        return self
+
+    def inc(self, amount=1):
+        pass
+
+    def observe(self, value):
+        pass
+
+    def set(self, value):
+        pass
+
+    def set_function(self, fn):
+        pass
+
+
+def _metric(cls, name: str, doc: str, labels=(), **kwargs):
+    if cls is None:
+        return _NoOpMetric()
+    return cls(name, doc, labels, **kwargs)
+
+
+# ------------------- Metrics -------------------
+
+LLM_CALLS = _metric(Counter, "app_llm_calls_total", "LLM completions", ("feature", "model", "outcome"))
+LLM_LATENCY = _metric(Histogram, "app_llm_latency_seconds", "LLM completion latency including retries",
+                      ("feature", "model"), buckets=LLM_BUCKETS)
+LLM_TTFT = _metric(Histogram, "app_llm_ttft_seconds", "LLM time to first token",
+                   ("feature", "model"), buckets=LLM_BUCKETS)
+LLM_TOKENS = _metric(Counter, "app_llm_tokens_total", "LLM tokens", ("feature", "model", "kind"))
+LLM_RETRIES = _metric(Counter, "app_llm_retries_total", "LLM retries", ("feature",))
+
+GIST_SECONDS = _metric(Histogram, "app_gist_request_seconds", "GitHub gist load/save latency",
+                       ("op", "outcome"), buckets=IO_BUCKETS)
+HISTORY_SECONDS = _metric(Histogram, "app_history_file_seconds", "history.json read/write time",
+                          ("op",), buckets=IO_BUCKETS)
+
+PAGE_RERUNS = _metric(Counter, "app_page_reruns_total", "Script reruns by page", ("page",))
+ACTIVE_SESSIONS = _metric(Gauge, "app_active_sessions", "Streamlit sessions seen recently")
+
+_server_lock = threading.Lock()
+_server = {"attempted": False, "running": False}
+
+
+# ------------------- Helpers -------------------
+
+
+@contextmanager
+def timer(histogram, **labels):
+    """Observe the duration of the block on `histogram` with `labels`."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        histogram.labels(**labels).observe(time.perf_counter() - started)
+
+
+def observe_llm_event(event: dict) -> None:
+    """Update the LLM metrics from one llm_telemetry event."""
+    feature, model = event.get("feature", "unknown"), event.get("model") or "unknown"
+    LLM_CALLS.labels(feature=feature, model=model, outcome="ok" if event.get("ok") else "error").inc()
+    if event.get("latency_ms") is not None:
+        LLM_LATENCY.labels(feature=feature, model=model).observe(event["latency_ms"] / 1000)
+    if event.get("ttft_ms") is not None:
+        LLM_TTFT.labels(feature=feature, model=model).observe(event["ttft_ms"] / 1000)
+    for kind in ("prompt", "completion"):
+        if event.get(f"{kind}_tokens"):
+            LLM_TOKENS.labels(feature=feature, model=model, kind=kind).inc(event[f"{kind}_tokens"])
+    if event.get("retries"):
+        LLM_RETRIES.labels(feature=feature).inc(event["retries"])
+
+
+def start_metrics_server(session_count=None) -> bool:
+    """
+    Serve /metrics once per process.
+
+    Args:
+        session_count: Optional callable returning the number of active sessions
+
+    Returns:
+        True if the endpoint is running in this process
+    """
+    if start_http_server is None:
+        return False
+    with _server_lock:
+        if not _server["attempted"]:
+            _server["attempted"] = True
+            if session_count is not None:
+                ACTIVE_SESSIONS.set_function(session_count)
+            try:
+                start_http_server(METRICS_PORT, addr=METRICS_ADDR)
+                _server["running"] = True
+            except OSError:
+                pass  # port taken (e.g. another app process already serves it)
+        return _server["running"]
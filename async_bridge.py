@@ -0,0 +1,70 @@
+"""
+Async Bridge Module
+Runs coroutines from Streamlit's synchronous script thread.
+
+One event loop per process runs in a daemon thread, so async clients
+(AsyncOpenAI's HTTP connection pool) live on a single loop and are reused
+across reruns and sessions. `run_async()` submits a coroutine to that loop
+and blocks the script thread until it finishes, cancelling it on timeout;
+`gather()` does the same for several coroutines that should overlap, e.g.
+the two translations of a chat message.
+"""
+
+import asyncio
+import threading
+import concurrent.futures
+from typing import Any, Awaitable, List, Optional
+
+_lock = threading.Lock()
+_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """The process-wide background event loop (started on first use)."""
+    global _loop
+    with _lock:
+        if _loop is None or _loop.is_closed():
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="async-bridge", daemon=True).start()
+            _loop = loop
+        return _loop
+
+
+def run_async(coro: Awaitable, timeout: Optional[float] = None) -> Any:
+    """
+    Run a coroutine on the background loop and wait for its result.
+
+    Args:
+        coro: Coroutine to run
+        timeout: Seconds to wait; the coroutine is cancelled when it runs out
+
+    Returns:
+        The coroutine's result
+
+    Raises:
+        TimeoutError: The timeout expired (the coroutine has been cancelled)
+        Whatever the coroutine raised
+    """
+    future = asyncio.run_coroutine_threadsafe(coro, get_loop())
+    try:
+        return future.result(timeout)
+    except concurrent.futures.TimeoutError:  # a distinct class before Python 3.11
+        future.cancel()
+        raise TimeoutError(f"coroutine did not finish within {timeout} s") from None
+    except BaseException:
+        # e.g. Streamlit stopping the script: don't leave the call running unobserved
+        future.cancel()
+        raise
+
+
+def gather(*coros: Awaitable, timeout: Optional[float] = None) -> List[Any]:
+    """
+    Run coroutines concurrently and return their results in order.
+
+    An exception from one coroutine is returned in its place instead of
+    cancelling the others; a timeout cancels all of them.
+    """
+    async def run_all():
+        return await asyncio.gather(*coros, return_exceptions=True)
+
+    return run_async(run_all(), timeout)
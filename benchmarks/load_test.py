@@ -0,0 +1,286 @@
+"""
+Load Test
+Headless concurrent-user load generator for streamlit_app.py.
+
+Each simulated user is a Streamlit `AppTest` session driven from its own
+thread, all in one process (so they share module-level caches exactly like
+sessions on one Streamlit server), against the mock OpenRouter and gist
+backends from mock_openrouter.py:
+
+  - math:  Home -> kid profile -> pick level -> generate -> answer -> submit
+  - chat:  Home -> adult profile -> Translate Chat -> send N messages
+
+For every concurrency level the report shows rerun latency per step
+(p50/p95), errors, and history.json contention: time spent in history
+reads/writes (from render_profiler spans) and lost updates, i.e. practice
+results or chat messages that were submitted but are missing afterwards.
+
+Usage:
+    python benchmarks/load_test.py --sessions 1,5,10,30
+    python benchmarks/load_test.py --sessions 30 --chat-share 0.3 --latency 0.5 --json load.json
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import threading
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, "streamlit_app.py")
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import mock_openrouter  # noqa: E402
+
+
+def _share_app_test_runtime() -> None:
+    """
+    Let AppTest sessions run concurrently.
+
+    Each AppTest run installs a mock Runtime singleton and resets it to None
+    when it finishes, which breaks any other session still running. Keep the
+    latest mock installed instead (they are interchangeable in-memory stubs).
+    """
+    from streamlit.runtime import Runtime
+    from streamlit.testing.v1 import app_test
+
+    class _KeepInstance(type):
+        def __setattr__(cls, name, value):
+            if name == "_instance":
+                if value is not None:
+                    Runtime._instance = value
+                return
+            super().__setattr__(name, value)
+
+    class _SharedRuntime(Runtime, metaclass=_KeepInstance):
+        pass
+
+    app_test.Runtime = _SharedRuntime
+
+KIDS = [("👧 Ella", "ella"), ("🧒 Meimei", "meimei"), ("🧑‍🎓 Lucas", "lucas")]
+ADULTS = ["🕵️ David", "🎧 Mika", "🎨 Wai Wai"]
+LEVELS = ["P1", "P2", "P3", "P4", "P5", "P6", "PLSE"]
+
+
+class Session:
+    """One simulated browser session; records the latency and errors of every rerun."""
+
+    def __init__(self, index: int, timeout: float):
+        from streamlit.testing.v1 import AppTest
+
+        self.index = index
+        self.at = AppTest.from_file(APP, default_timeout=timeout)
+        self.timings: List[tuple] = []  # (step, ms)
+        self.errors: List[str] = []
+
+    def run(self, step: str, action=None) -> bool:
+        """Apply `action` (e.g. a click) and rerun; returns False if the rerun failed."""
+        started = time.perf_counter()
+        try:
+            (action() if action else self.at).run()
+        except Exception as e:
+            self.errors.append(f"{step}: {type(e).__name__}: {e}")
+            return False
+        self.timings.append((step, (time.perf_counter() - started) * 1000))
+        failures = [f"{step}: {e.value}" for e in self.at.exception] + [f"{step}: {e.value}" for e in self.at.error]
+        self.errors.extend(failures)
+        return not failures
+
+    def button(self, label: str):
+        matches = [b for b in self.at.button if b.label == label]
+        if not matches:
+            raise LookupError(f"no button {label!r}")
+        return matches[0]
+
+
+# ------------------- Scenarios -------------------
+
+
+def math_flow(session: Session, rng: random.Random, expected: set) -> None:
+    label, user = KIDS[session.index % len(KIDS)]
+    level = rng.choice(LEVELS)
+    at = session.at
+    if not session.run("home"):
+        return
+    if not session.run("profile", lambda: session.button(label).click()):
+        return
+    if not session.run("select_level", lambda: at.selectbox(key="level_select_main").set_value(level)):
+        return
+    if not session.run("generate", lambda: session.button("🧩 Generate questions").click()):
+        return
+
+    questions = at.session_state["primary_math_questions"]
+    for i, (_, answer) in enumerate(questions):
+        at.text_input(key=f"ans_{i}").input(str(answer))
+    if session.run("submit", lambda: session.button("✅ Submit answers").click()):
+        expected.add(f"{user}_{level}_{datetime.now().strftime('%Y-%m-%d')}")
+
+
+def chat_flow(session: Session, rng: random.Random, sent: list, messages: int) -> None:
+    at = session.at
+    if not session.run("home"):
+        return
+    if not session.run("profile", lambda: session.button(rng.choice(ADULTS)).click()):
+        return
+    for n in range(messages):
+        text = f"load test session {session.index} message {n}"
+        at.text_area[0].input(text)
+        if session.run("send", lambda: session.button("Send").click()):
+            sent.append(text)
+
+
+# ------------------- Runner -------------------
+
+
+def _percentile(values: List[float], q: float) -> Optional[float]:
+    from llm_telemetry import percentile
+    value = percentile(values, q)
+    return round(value, 1) if value is not None else None
+
+
+def run_level(sessions: int, args, server) -> dict:
+    """Run `sessions` concurrent users once and summarize latency, errors and contention."""
+    import render_profiler
+    import translate_chat
+
+    for name in ("history.json", "mastery.json", "review_queue.json"):
+        if os.path.exists(name):
+            os.remove(name)
+    # Fresh gist and chat cache per level so lost messages are counted per run
+    gist_id = f"load-{sessions}-{int(time.time() * 1000)}"
+    os.environ["GITHUB_GIST_ID"] = gist_id
+    start_reruns, start_gist_updates = len(render_profiler.recent_reruns()), server.gist_updates
+
+    expected, sent, all_sessions = set(), [], []
+    lock = threading.Lock()
+    rng = random.Random(args.seed)
+    plans = [("chat" if rng.random() < args.chat_share else "math", random.Random(rng.random()))
+             for _ in range(sessions)]
+
+    def user(index, kind, user_rng):
+        session = Session(index, args.timeout)
+        with lock:
+            all_sessions.append(session)
+        time.sleep(user_rng.uniform(0, args.ramp))  # stagger arrivals
+        try:
+            if kind == "math":
+                math_flow(session, user_rng, expected)
+            else:
+                chat_flow(session, user_rng, sent, args.messages)
+        except Exception as e:
+            session.errors.append(f"{kind}: {type(e).__name__}: {e}")
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=user, args=(i, kind, user_rng), daemon=True)
+               for i, (kind, user_rng) in enumerate(plans)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    seconds = time.perf_counter() - started
+
+    # Steps: rerun latency percentiles
+    by_step: Dict[str, List[float]] = defaultdict(list)
+    for session in all_sessions:
+        for step, ms in session.timings:
+            by_step[step].append(ms)
+    steps = {step: {"reruns": len(v), "p50_ms": _percentile(v, 50), "p95_ms": _percentile(v, 95)}
+             for step, v in sorted(by_step.items())}
+    errors = [e for s in all_sessions for e in s.errors]
+
+    # history.json: time in reads/writes and results that did not survive concurrent writers
+    spans = defaultdict(list)
+    for record in render_profiler.recent_reruns()[start_reruns:]:
+        for s in record["spans"]:
+            if s["name"] in ("history.load", "history.save"):
+                spans[s["name"]].append(s["duration"] * 1000)
+    try:
+        with open("history.json") as f:
+            stored = set(json.load(f))
+    except (OSError, ValueError):
+        stored = set()
+    lost_results = sorted(expected - stored)
+
+    # Chat: messages sent but missing from the gist
+    try:
+        content = server.gist(gist_id)["files"].get(translate_chat.GIST_FILENAME, {}).get("content", "[]")
+        in_gist = {entry.get("original") for entry in json.loads(content)}
+    except ValueError:
+        in_gist = set()
+    lost_messages = [text for text in sent[-translate_chat.MAX_HISTORY:] if text not in in_gist]
+
+    return {
+        "sessions": sessions, "seconds": round(seconds, 2),
+        "reruns": sum(len(s.timings) for s in all_sessions), "errors": len(errors),
+        "first_errors": errors[:3], "steps": steps,
+        "history": {
+            "reads": len(spans["history.load"]), "read_p95_ms": _percentile(spans["history.load"], 95),
+            "writes": len(spans["history.save"]), "write_p95_ms": _percentile(spans["history.save"], 95),
+            "results_submitted": len(expected), "results_lost": len(lost_results), "lost_keys": lost_results,
+        },
+        "chat": {"messages_sent": len(sent), "messages_lost": len(lost_messages),
+                 "gist_updates": server.gist_updates - start_gist_updates},
+    }
+
+
+def print_report(report: dict) -> None:
+    h, c = report["history"], report["chat"]
+    print(f"\n== {report['sessions']} sessions: {report['seconds']} s, {report['reruns']} reruns, "
+          f"{report['errors']} errors")
+    for step, stats in report["steps"].items():
+        print(f"  {step:<14} reruns={stats['reruns']:<4} p50={stats['p50_ms']} ms  p95={stats['p95_ms']} ms")
+    print(f"  history.json   reads={h['reads']} (p95 {h['read_p95_ms']} ms)  writes={h['writes']} "
+          f"(p95 {h['write_p95_ms']} ms)  lost results={h['results_lost']}/{h['results_submitted']}")
+    print(f"  chat           sent={c['messages_sent']}  lost={c['messages_lost']}  gist updates={c['gist_updates']}")
+    for error in report["first_errors"]:
+        print(f"  ! {error}")
+
+
+def main(argv: Optional[List[str]] = None) -> List[dict]:
+    parser = argparse.ArgumentParser(description="Concurrent-user load test against mock backends")
+    parser.add_argument("--sessions", default="1,5,10", help="comma-separated concurrency levels")
+    parser.add_argument("--chat-share", type=float, default=0.2, help="share of sessions using Translate Chat")
+    parser.add_argument("--messages", type=int, default=3, help="messages sent per chat session")
+    parser.add_argument("--ramp", type=float, default=1.0, help="seconds over which sessions arrive")
+    parser.add_argument("--timeout", type=float, default=120, help="seconds allowed per rerun")
+    parser.add_argument("--json", help="also write the reports to this file")
+    mock_openrouter.add_config_arguments(parser)
+    args = parser.parse_args(argv)
+    levels = [int(n) for n in args.sessions.split(",") if n.strip()]
+
+    _share_app_test_runtime()
+    server = mock_openrouter.start_mock_server(mock_openrouter.config_from_args(args))
+    os.environ.update(
+        OPENROUTER_BASE_URL=server.base_url, OPENROUTER_API_KEY="mock",
+        GITHUB_API_URL=server.api_url, GITHUB_TOKEN="mock",
+        APP_PROFILE=os.environ.get("APP_PROFILE") or "spans",  # history spans feed the contention report
+        APP_PROFILE_RERUNS="100000", NEWS_INGEST_INTERVAL=str(24 * 60 * 60),
+    )
+    workdir = tempfile.mkdtemp(prefix="load-")
+    cwd = os.getcwd()
+    os.chdir(workdir)  # history.json and other runtime files go to a scratch directory
+    reports = []
+    try:
+        for sessions in levels:
+            report = run_level(sessions, args, server)
+            print_report(report)
+            reports.append(report)
+    finally:
+        os.chdir(cwd)
+        server.shutdown()
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"config": vars(args), "reports": reports}, f, indent=2)
+    return reports
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""
+Micro Benchmarks
+Scaling benchmarks for the parsers and history operations on the hot path,
+with a stored baseline to gate changes against.
+
+  - parse_math_response  LLMHelper._parse_math_response on 10..10k Q/A pairs
+  - parse_news_items     news_analysis.parse_news_items on 10..10k items
+  - load_user_history    primary_math.load_user_history with 10..100k entries
+  - calendar_stats       primary_math.get_calendar_stats with 10..100k entries
+  - save_practice_result primary_math.save_practice_result with 10..100k entries
+
+Each case is timed over repeated rounds (median reported) and the report
+shows time per entry and the scaling exponent between sizes (~1 = linear).
+
+Usage:
+    python benchmarks/micro_benchmarks.py                 # run and print
+    python benchmarks/micro_benchmarks.py --save          # store benchmarks/baseline.json
+    python benchmarks/micro_benchmarks.py --compare       # exit 1 if slower than baseline (best rounds)
+    python benchmarks/micro_benchmarks.py --only parse --max-size 1000
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import random
+import argparse
+import platform
+import tempfile
+from datetime import date, timedelta
+from typing import Callable, Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import mock_openrouter  # noqa: E402
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+PARSE_SIZES = [10, 100, 1000, 10000]
+HISTORY_SIZES = [10, 100, 1000, 10000, 100000]
+USERS = ["ella", "meimei", "lucas"]
+LEVELS = ["P1", "P2", "P3", "P4", "P5", "P6", "PLSE"]
+NOISE_FLOOR_S = 50e-6  # differences below this are never regressions
+
+
+# ------------------- Synthetic Inputs -------------------
+
+
+def math_response(pairs: int, rng: random.Random) -> str:
+    """An LLM-style reply with `pairs` Q/A pairs and some chatter around them."""
+    lines = ["Here are your questions:", ""]
+    for i in range(pairs):
+        a, b = rng.randint(1, 999), rng.randint(1, 999)
+        lines += [f"Q: Sarah has {a} stickers and buys {b} more. How many stickers does she have now?",
+                  f"A: {a + b}", ""]
+    return "\n".join(lines + ["Good luck!"])
+
+
+def history_entries(size: int, rng: random.Random) -> dict:
+    """`size` history.json entries spread over the users, one per user/level/day like the app writes."""
+    history = {}
+    start = date(2000, 1, 1)
+    for i in range(size):
+        user, level = USERS[i % len(USERS)], LEVELS[(i // len(USERS)) % len(LEVELS)]
+        day = start + timedelta(days=i // (len(USERS) * len(LEVELS)))
+        results = [{"q": f"{n} + {n} = ?", "ans": ans, "correct": 2 * n, "is_correct": ans == 2 * n}
+                   for n, ans in ((n, 2 * n if rng.random() < 0.8 else n) for n in range(10))]
+        history[f"{user}_{level}_{day.isoformat()}"] = {
+            "user": user, "level": level, "score": sum(r["ans"] == r["correct"] for r in results),
+            "total": len(results), "timestamp": f"{day.isoformat()}T16:00:00", "results": results,
+        }
+    return history
+
+
+# ------------------- Cases -------------------
+
+
+def cases(only: str, max_size: int) -> List[tuple]:
+    """(name, size, setup) tuples; setup() prepares the input and returns the function to time."""
+    from llm_helper import LLMHelper
+    from news_analysis import parse_news_items
+    import primary_math
+
+    helper = LLMHelper(api_key="bench", base_url="http://127.0.0.1:9/v1")  # never called
+    results = [{"q": f"{n} + {n} = ?", "ans": 2 * n, "correct": 2 * n, "is_correct": True} for n in range(10)]
+
+    def parse_math(size):
+        text = math_response(size, random.Random(size))
+        return lambda: helper._parse_math_response(text)
+
+    def parse_news(size):
+        text = mock_openrouter.news_reply(random.Random(size), count=size)
+        return lambda: parse_news_items(text)
+
+    def with_history(size, fn):
+        with open(primary_math.HISTORY_FILE, "w") as f:
+            json.dump(history_entries(size, random.Random(size)), f, indent=2)
+        return fn
+
+    selected = []
+    for name, sizes, setup in [
+        ("parse_math_response", PARSE_SIZES, parse_math),
+        ("parse_news_items", PARSE_SIZES, parse_news),
+        ("load_user_history", HISTORY_SIZES,
+         lambda n: with_history(n, lambda: primary_math.load_user_history("ella"))),
+        ("calendar_stats", HISTORY_SIZES,
+         lambda n: with_history(n, lambda: primary_math.get_calendar_stats("ella"))),
+        ("save_practice_result", HISTORY_SIZES,
+         lambda n: with_history(n, lambda: primary_math.save_practice_result("ella", "P3", results, 9))),
+    ]:
+        if name.startswith(only):
+            selected += [(name, size, setup) for size in sizes if size <= max_size]
+    return selected
+
+
+def measure(fn: Callable[[], object], min_time: float, max_rounds: int) -> dict:
+    """Time `fn` for at least `min_time` seconds (at least 3 rounds unless one round is slow)."""
+    timings = []
+    total = 0.0
+    while len(timings) < max_rounds and (total < min_time or len(timings) < 3):
+        started = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - started
+        timings.append(elapsed)
+        total += elapsed
+        if elapsed > min_time:  # one slow round is enough
+            break
+    timings.sort()
+    return {"rounds": len(timings), "min_s": timings[0], "median_s": timings[len(timings) // 2]}
+
+
+def run(only: str = "", max_size: int = max(HISTORY_SIZES), min_time: float = 0.2,
+        max_rounds: int = 200) -> Dict[str, dict]:
+    """Run the selected cases in a scratch directory; returns {"name@size": stats}."""
+    cwd = os.getcwd()
+    os.chdir(tempfile.mkdtemp(prefix="micro-"))  # history.json and friends are scratch files
+    try:
+        results = {}
+        for name, size, setup in cases(only, max_size):
+            stats = measure(setup(size), min_time, max_rounds)
+            results[f"{name}@{size}"] = {"name": name, "size": size, **stats}
+            print(f"  {name:<22} {size:>7}  {stats['median_s'] * 1000:10.3f} ms", flush=True)
+        return results
+    finally:
+        os.chdir(cwd)
+
+
+# ------------------- Reporting -------------------
+
+
+def print_scaling(results: Dict[str, dict]) -> None:
+    """Time per entry and the log-log slope to the previous size of the same case."""
+    print(f"\n{'case':<22} {'size':>7} {'median ms':>11} {'us/entry':>9} {'exponent':>9}")
+    previous: Dict[str, dict] = {}
+    for stats in results.values():
+        prev = previous.get(stats["name"])
+        exponent = ""
+        if prev and prev["median_s"] > 0 and stats["median_s"] > 0:
+            exponent = f"{math.log(stats['median_s'] / prev['median_s']) / math.log(stats['size'] / prev['size']):.2f}"
+        print(f"{stats['name']:<22} {stats['size']:>7} {stats['median_s'] * 1000:>11.3f} "
+              f"{stats['median_s'] / stats['size'] * 1e6:>9.2f} {exponent:>9}")
+        previous[stats["name"]] = stats
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], tolerance: float) -> List[str]:
+    """Cases whose best round is more than `tolerance` slower than the baseline's best round."""
+    regressions = []
+    for key, stats in results.items():
+        base = baseline.get(key)
+        if not base:
+            continue
+        # The fastest round is the least disturbed by other load, so it is the stable one to gate on
+        current, reference = stats["min_s"], base["min_s"]
+        if current > reference * (1 + tolerance) and current - reference > NOISE_FLOOR_S:
+            regressions.append(f"{key}: {current * 1000:.3f} ms vs baseline "
+                               f"{reference * 1000:.3f} ms (+{(current / reference - 1) * 100:.0f}%)")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Parser and history micro-benchmarks")
+    parser.add_argument("--only", default="", help="run cases whose name starts with this prefix")
+    parser.add_argument("--max-size", type=int, default=max(HISTORY_SIZES), help="largest input size to run")
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds to spend per case")
+    parser.add_argument("--save", action="store_true", help=f"store results as the baseline ({BASELINE_FILE})")
+    parser.add_argument("--compare", action="store_true", help="exit 1 if any case regressed against the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown before --compare fails")
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    args = parser.parse_args(argv)
+
+    results = run(args.only, args.max_size, args.min_time)
+    print_scaling(results)
+
+    if args.save:
+        with open(args.baseline, "w") as f:
+            json.dump({"python": platform.python_version(), "machine": platform.machine(), "results": results},
+                      f, indent=2)
+        print(f"\nBaseline saved to {args.baseline}")
+    if args.compare:
+        try:
+            with open(args.baseline) as f:
+                baseline = json.load(f)["results"]
+        except (OSError, ValueError, KeyError):
+            print(f"\nNo baseline at {args.baseline}; run with --save first")
+            return 1
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.tolerance:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"\nNo regressions beyond {args.tolerance:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,286 @@
+"""
+Mock OpenRouter Module
+Local OpenAI-compatible chat completions server (plus a minimal GitHub gist
+API for the chat history) for offline benchmarks.
+
+Replies are picked from the prompt, in the formats the app parses:
+
+  - math question prompts -> "Q:/A:" pairs from question_bank (answers verify)
+  - "Translate this ..."   -> a canned translation of the text
+  - the trending news prompt -> ~10 items in the **標題** format of parse_news_items
+  - anything else          -> a canned news analysis
+
+Latency, jitter, streaming speed and the share of 429 responses are
+configurable, so the benchmark can model a slow or rate-limited provider.
+
+Gists are kept in memory: GET and PATCH /gists/<id> behave like GitHub's
+API for the fields translate_chat uses.
+
+Run standalone and point the app at it:
+    python benchmarks/mock_openrouter.py --port 8765 --latency 0.3
+    OPENROUTER_BASE_URL=http://127.0.0.1:8765/v1 OPENROUTER_API_KEY=mock \
+    GITHUB_API_URL=http://127.0.0.1:8765 GITHUB_TOKEN=mock GITHUB_GIST_ID=local streamlit run streamlit_app.py
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import question_bank  # noqa: E402
+from answer_check import format_answer  # noqa: E402
+
+MODEL = "mock/openrouter"
+
+
+@dataclass
+class MockConfig:
+    """Behaviour of the mock provider."""
+    latency: float = 0.2  # seconds before the first token
+    jitter: float = 0.05  # +/- uniform noise on latency
+    chunk_chars: int = 24  # characters per streamed chunk
+    chunk_delay: float = 0.002  # seconds between streamed chunks
+    rate_429: float = 0.0  # share of requests answered with HTTP 429
+    seed: Optional[int] = None
+
+
+# ------------------- Canned Replies -------------------
+
+
+def _level_from_prompt(prompt: str) -> str:
+    if "Pre-Lower Secondary" in prompt:
+        return "PLSE"
+    match = re.search(r"Primary (\d)", prompt)
+    return f"P{match.group(1)}" if match else "P1"
+
+
+def math_reply(prompt: str, rng: random.Random) -> str:
+    match = re.search(r"Generate (\d+)", prompt)
+    count = int(match.group(1)) if match else 10
+    questions = question_bank.generate_questions(_level_from_prompt(prompt), count, rng=rng)
+    return "\n\n".join(f"Q: {q}\nA: {format_answer(a)}" for q, a in questions)
+
+
+def translation_reply(prompt: str) -> str:
+    text = prompt.split("\n\n")[1] if prompt.count("\n\n") >= 2 else prompt
+    target = "Myanmar" if "Myanmar" in prompt else "English"
+    return f"[{target}] {text}"
+
+
+def news_reply(rng: random.Random, count: int = 10) -> str:
+    items = []
+    for i in range(1, count + 1):
+        items.append(
+            f"{i}. **標題**: 模擬新聞標題 {i} {rng.randrange(10_000)}\n"
+            f"2. **媒體/來源**: 模擬媒體 {rng.choice('ABCDE')}\n"
+            f"3. **熱度指數**: {rng.randint(1, 10)}\n"
+            f"4. **簡介**: 這是第 {i} 則模擬新聞的簡短摘要，用於離線效能測試。\n"
+            f"5. **涉及公司/個人/組織**: 公司{i}, 組織{i}"
+        )
+    return "\n---\n".join(items)
+
+
+def analysis_reply() -> str:
+    return ("### 影響分析\n" + "這是一段模擬的新聞影響分析內容。" * 40 +
+            "\n\n### 建議\n" + "- 模擬建議\n" * 10)
+
+
+def reply_for(prompt: str, rng: random.Random) -> str:
+    """Canned completion text for a prompt."""
+    if "math questions" in prompt:
+        return math_reply(prompt, rng)
+    if prompt.startswith("Translate this"):
+        return translation_reply(prompt)
+    if "**標題**" in prompt:
+        return news_reply(rng)
+    return analysis_reply()
+
+
+# ------------------- Server -------------------
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "MockServer"
+
+    def log_message(self, *args):
+        pass
+
+    def _body(self) -> dict:
+        return json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+
+    def do_GET(self):
+        if not self.path.startswith("/gists/"):
+            return self._json(404, {"message": "Not Found"})
+        self._json(200, self.server.gist(self.path.split("/")[2]))
+
+    def do_PATCH(self):
+        if not self.path.startswith("/gists/"):
+            return self._json(404, {"message": "Not Found"})
+        self._json(200, self.server.update_gist(self.path.split("/")[2], self._body()))
+
+    def do_POST(self):
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            return self._json(404, {"error": {"message": "not found"}})
+        body = self._body()
+        config, rng = self.server.config, self.server.next_rng()
+        self.server.count_request()
+
+        if rng.random() < config.rate_429:
+            return self._json(429, {"error": {"message": "Rate limit exceeded (mock)", "code": 429}})
+        time.sleep(max(0.0, config.latency + rng.uniform(-config.jitter, config.jitter)))
+
+        prompt = "\n".join(m.get("content", "") for m in body.get("messages", []) if isinstance(m.get("content"), str))
+        text = reply_for(prompt, rng)
+        text, finish_reason = self._truncate(text, body.get("max_tokens"))
+        usage = {"prompt_tokens": len(prompt) // 4, "completion_tokens": max(1, len(text) // 4)}
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+
+        if body.get("stream"):
+            include_usage = (body.get("stream_options") or {}).get("include_usage")
+            self._stream(text, finish_reason, usage if include_usage else None)
+        else:
+            self._json(200, {
+                "id": "mock", "object": "chat.completion", "created": int(time.time()), "model": MODEL,
+                "choices": [{"index": 0, "finish_reason": finish_reason,
+                             "message": {"role": "assistant", "content": text}}],
+                "usage": usage,
+            })
+
+    @staticmethod
+    def _truncate(text: str, max_tokens: Optional[int]) -> Tuple[str, str]:
+        """Cut the reply at ~4 characters per token, like a provider hitting max_tokens."""
+        if max_tokens and len(text) > max_tokens * 4:
+            return text[:max_tokens * 4], "length"
+        return text, "stop"
+
+    def _json(self, status: int, payload: dict) -> None:
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _stream(self, text: str, finish_reason: str, usage: Optional[dict]) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        def send(choices, **extra):
+            chunk = {"id": "mock", "object": "chat.completion.chunk", "created": int(time.time()),
+                     "model": MODEL, "choices": choices, **extra}
+            self.wfile.write(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+
+        step = max(1, self.server.config.chunk_chars)
+        for start in range(0, len(text), step):
+            send([{"index": 0, "delta": {"content": text[start:start + step]}, "finish_reason": None}])
+            if self.server.config.chunk_delay:
+                time.sleep(self.server.config.chunk_delay)
+        send([{"index": 0, "delta": {}, "finish_reason": finish_reason}])
+        if usage:
+            send([], usage=usage)
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+
+class MockServer(ThreadingHTTPServer):
+    """Threaded mock provider; `base_url` is what OpenAI clients should use."""
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], config: MockConfig):
+        super().__init__(address, _Handler)
+        self.config = config
+        self.requests = 0
+        self.gist_updates = 0
+        self._gists: Dict[str, dict] = {}
+        self._rng = random.Random(config.seed)
+        self._lock = threading.Lock()
+
+    def handle_error(self, request, client_address):
+        if not isinstance(sys.exc_info()[1], ConnectionError):  # clients hanging up (timeouts) are expected
+            super().handle_error(request, client_address)
+
+    @property
+    def api_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def base_url(self) -> str:
+        return f"{self.api_url}/v1"
+
+    def gist(self, gist_id: str) -> dict:
+        """The gist's current JSON (an empty gist is created on first access)."""
+        with self._lock:
+            gist = self._gists.setdefault(gist_id, {"id": gist_id, "description": "", "files": {}})
+            return json.loads(json.dumps(gist))
+
+    def update_gist(self, gist_id: str, update: dict) -> dict:
+        """Apply a PATCH: replace the description and the given files."""
+        with self._lock:
+            gist = self._gists.setdefault(gist_id, {"id": gist_id, "description": "", "files": {}})
+            gist["description"] = update.get("description", gist["description"])
+            for filename, file_info in (update.get("files") or {}).items():
+                gist["files"][filename] = {"filename": filename, "content": file_info.get("content", "")}
+            self.gist_updates += 1
+            return json.loads(json.dumps(gist))
+
+    def next_rng(self) -> random.Random:
+        with self._lock:
+            return random.Random(self._rng.random())
+
+    def count_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+
+def start_mock_server(config: Optional[MockConfig] = None, host: str = "127.0.0.1", port: int = 0) -> MockServer:
+    """Start the mock provider in a daemon thread (port 0 picks a free port)."""
+    server = MockServer((host, port), config or MockConfig())
+    threading.Thread(target=server.serve_forever, name="mock-openrouter", daemon=True).start()
+    return server
+
+
+def add_config_arguments(parser: argparse.ArgumentParser) -> None:
+    """Command line flags for MockConfig (shared by the benchmark scripts)."""
+    defaults = MockConfig()
+    parser.add_argument("--latency", type=float, default=defaults.latency, help="seconds before the first token")
+    parser.add_argument("--jitter", type=float, default=defaults.jitter, help="+/- seconds of latency noise")
+    parser.add_argument("--chunk-chars", type=int, default=defaults.chunk_chars, help="characters per stream chunk")
+    parser.add_argument("--chunk-delay", type=float, default=defaults.chunk_delay, help="seconds between chunks")
+    parser.add_argument("--rate-429", type=float, default=defaults.rate_429, help="share of requests rate limited")
+    parser.add_argument("--seed", type=int, default=None)
+
+
+def config_from_args(args: argparse.Namespace) -> MockConfig:
+    return MockConfig(latency=args.latency, jitter=args.jitter, chunk_chars=args.chunk_chars,
+                      chunk_delay=args.chunk_delay, rate_429=args.rate_429, seed=args.seed)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mock OpenAI-compatible server for offline benchmarks")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    add_config_arguments(parser)
+    args = parser.parse_args()
+
+    server = MockServer((args.host, args.port), config_from_args(args))
+    print(f"Mock OpenRouter on {server.base_url} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
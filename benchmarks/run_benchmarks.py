@@ -0,0 +1,189 @@
+"""
+Benchmark Runner
+Offline throughput and latency benchmarks against the mock OpenRouter server.
+
+Each scenario runs for a fixed number of operations (optionally from several
+threads at once) and reports ops/s and latency percentiles:
+
+  - llm.math_questions   LLMHelper.generate_math_questions (parse + verify)
+  - llm.translate        LLMHelper.translate_to_english
+  - llm.news_trending    fetch_trending_text + parse_news_items
+  - parse_news_items     parsing a canned trending response (no network)
+  - history.save / history.load / history.calendar_stats
+                         primary_math's history.json store, in a temp directory
+
+Usage:
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --ops 200 --threads 8 --latency 0.05 --rate-429 0.1
+    python benchmarks/run_benchmarks.py --only llm. --json results.json
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import threading
+from typing import Callable, Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import mock_openrouter  # noqa: E402
+from llm_telemetry import percentile  # noqa: E402
+
+
+# ------------------- Harness -------------------
+
+
+def run_scenario(name: str, op: Callable[[int], None], ops: int, threads: int = 1) -> dict:
+    """
+    Run `op(i)` for i in range(ops) over `threads` threads and time each call.
+
+    Returns:
+        {"name", "ops", "errors", "seconds", "ops_per_s", "p50_ms", "p95_ms", "p99_ms", "max_ms"}
+    """
+    latencies: List[float] = []
+    errors = []
+    counter = iter(range(ops))
+    lock = threading.Lock()
+
+    def worker():
+        while True:
+            with lock:
+                i = next(counter, None)
+            if i is None:
+                return
+            started = time.perf_counter()
+            try:
+                op(i)
+            except Exception as e:
+                with lock:
+                    errors.append(f"{type(e).__name__}: {e}")
+                continue
+            elapsed = (time.perf_counter() - started) * 1000
+            with lock:
+                latencies.append(elapsed)
+
+    started = time.perf_counter()
+    workers = [threading.Thread(target=worker, daemon=True) for _ in range(max(1, threads))]
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    seconds = time.perf_counter() - started
+
+    def ms(q):
+        value = percentile(latencies, q)
+        return round(value, 2) if value is not None else None
+
+    return {
+        "name": name, "ops": ops, "threads": threads, "errors": len(errors),
+        "first_error": errors[0] if errors else None, "seconds": round(seconds, 3),
+        "ops_per_s": round(len(latencies) / seconds, 1) if seconds else None,
+        "p50_ms": ms(50), "p95_ms": ms(95), "p99_ms": ms(99), "max_ms": ms(100),
+    }
+
+
+def print_table(results: List[dict]) -> None:
+    if not results:
+        print("No scenarios matched.")
+        return
+    columns = ["name", "ops", "threads", "errors", "ops_per_s", "p50_ms", "p95_ms", "p99_ms", "max_ms"]
+    widths = {c: max(len(c), *(len(str(r[c])) for r in results)) for c in columns}
+    print("  ".join(c.ljust(widths[c]) for c in columns))
+    for r in results:
+        print("  ".join(str(r[c]).ljust(widths[c]) for c in columns))
+    for r in results:
+        if r["first_error"]:
+            print(f"{r['name']}: first error: {r['first_error']}")
+
+
+# ------------------- Scenarios -------------------
+
+
+def llm_scenarios(helper) -> Dict[str, Callable[[int], None]]:
+    from news_analysis import fetch_trending_text, parse_news_items
+
+    levels = ["P1", "P2", "P3", "P4", "P5", "P6", "PLSE"]
+
+    def math_questions(i):
+        questions = helper.generate_math_questions(levels[i % len(levels)], count=10)
+        if not questions:
+            raise RuntimeError("no questions")
+
+    def translate(i):
+        text = helper.translate_to_english(f"Benchmark message {i}")
+        if text.startswith("Translation error"):
+            raise RuntimeError(text)
+
+    def news_trending(i):
+        if not parse_news_items(fetch_trending_text(helper)):
+            raise RuntimeError("no news items")
+
+    return {"llm.math_questions": math_questions, "llm.translate": translate, "llm.news_trending": news_trending}
+
+
+def local_scenarios() -> Dict[str, Callable[[int], None]]:
+    from news_analysis import parse_news_items
+    import primary_math
+
+    news_text = mock_openrouter.news_reply(random.Random(0))
+    results = [{"q": f"{n} + {n} = ?", "ans": 2 * n, "correct": 2 * n, "is_correct": True} for n in range(10)]
+    users = ["ella", "meimei", "lucas"]
+
+    def save(i):
+        # Keys are user_level_day, so repeated saves overwrite a handful of entries
+        primary_math.save_practice_result(users[i % 3], f"P{i % 6 + 1}", results, score=i % 11)
+
+    return {
+        "parse_news_items": lambda i: parse_news_items(news_text),
+        "history.save": save,
+        "history.load": lambda i: primary_math.load_user_history(users[i % 3]),
+        "history.calendar_stats": lambda i: primary_math.get_calendar_stats(users[i % 3]),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> List[dict]:
+    parser = argparse.ArgumentParser(description="Offline benchmarks against a mock OpenRouter server")
+    parser.add_argument("--ops", type=int, default=50, help="operations per LLM scenario")
+    parser.add_argument("--local-ops", type=int, default=2000, help="operations per local scenario")
+    parser.add_argument("--threads", type=int, default=4, help="concurrent callers per LLM scenario")
+    parser.add_argument("--only", default="", help="run scenarios whose name starts with this prefix")
+    parser.add_argument("--json", help="also write the results to this file")
+    mock_openrouter.add_config_arguments(parser)
+    args = parser.parse_args(argv)
+
+    server = mock_openrouter.start_mock_server(mock_openrouter.config_from_args(args))
+    workdir = tempfile.mkdtemp(prefix="bench-")
+    cwd = os.getcwd()
+    os.chdir(workdir)  # history.json, llm_metrics.jsonl etc. go to a scratch directory
+    try:
+        from llm_helper import LLMHelper
+
+        helper = LLMHelper(api_key="mock", base_url=server.base_url)
+        results = []
+        for name, op in llm_scenarios(helper).items():
+            if name.startswith(args.only):
+                results.append(run_scenario(name, op, args.ops, args.threads))
+        for name, op in local_scenarios().items():
+            if name.startswith(args.only):
+                results.append(run_scenario(name, op, args.local_ops))
+    finally:
+        os.chdir(cwd)
+        server.shutdown()
+
+    print(f"mock: latency={args.latency}s jitter={args.jitter}s rate_429={args.rate_429} "
+          f"requests={server.requests} workdir={workdir}")
+    print_table(results)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"config": vars(args), "results": results}, f, indent=2)
+    return results
+
+
+if __name__ == "__main__":
+    main()
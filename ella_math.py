@@ -3,6 +3,10 @@ import random
 import datetime
 import json
 import os
+import zlib
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
 
 from snake_game import snake_game
 
@@ -42,10 +46,67 @@ def generate_question():
     return expr, answer
 
 
+def generate_question_arrays(n: int, rng: Optional[np.random.Generator] = None) -> Dict[str, np.ndarray]:
+    """
+    Draw operands for `n` Primary 1 questions as NumPy arrays.
+
+    Same distribution as `generate_question`: half add/subtract with a
+    non-negative `a + b - c`, half single-digit multiplication. Invalid
+    add/subtract rows are redrawn with a vectorized mask instead of a
+    per-question rejection loop.
+
+    Returns:
+        Dict of arrays: "is_add_sub" (bool), "a", "b", "c" and "answer" (int)
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    is_add_sub = rng.random(n) < 0.5
+    a, b, c = rng.integers(1, 61, size=(3, n))
+
+    bad = is_add_sub & (a + b < c)
+    while bad.any():
+        a[bad], b[bad], c[bad] = rng.integers(1, 61, size=(3, int(bad.sum())))
+        bad &= a + b < c
+
+    x, y = rng.integers(2, 10, size=(2, n))
+    a = np.where(is_add_sub, a, x)
+    b = np.where(is_add_sub, b, y)
+    answer = np.where(is_add_sub, a + b - c, a * b)
+    return {"is_add_sub": is_add_sub, "a": a, "b": b, "c": c, "answer": answer}
+
+
+def generate_questions_batch(n: int = 10, seed: Optional[int] = None) -> List[Tuple[str, int]]:
+    """
+    Generate `n` Primary 1 questions in one call.
+
+    Args:
+        n: Number of questions
+        seed: Optional seed for a reproducible worksheet
+
+    Returns:
+        List of tuples (expression, answer), like `generate_question`
+    """
+    arrays = generate_question_arrays(n, np.random.default_rng(seed))
+    # tolist() converts to plain ints so results stay JSON serializable
+    rows = zip(arrays["is_add_sub"].tolist(), arrays["a"].tolist(), arrays["b"].tolist(),
+               arrays["c"].tolist(), arrays["answer"].tolist())
+    return [
+        (f"{a} + {b} - {c}" if add_sub else f"{a} × {b}", answer)
+        for add_sub, a, b, c, answer in rows
+    ]
+
+
+def build_question_banks(users: Iterable[str], n: int = 1000, seed: int = 0) -> Dict[str, List[Tuple[str, int]]]:
+    """Build a reproducible question bank per child (stable seed per user name)."""
+    return {
+        user: generate_questions_batch(n, seed=[seed, zlib.crc32(user.encode("utf-8"))])
+        for user in users
+    }
+
+
 def show():
     # ------------------- Session State -------------------
     if "questions" not in st.session_state:
-        st.session_state.questions = [generate_question() for _ in range(10)]
+        st.session_state.questions = generate_questions_batch(10)
         st.session_state.answers = [""] * 10
         st.session_state.completed = False
         st.session_state.reward_unlocked = False
@@ -0,0 +1,84 @@
+"""
+Game Component Module
+Serves the reward games as a static Streamlit component.
+
+The game bundles live in `game_frontend/` (`index.html`, the shared
+`engine.js` and one JS file per game) and are declared as a component once
+per process. Each bundle is referenced with a content hash
+(`snake.js?v=<hash>`) so the browser caches it until the file changes. On a rerun only a small args object (game name,
+version, height and per-session config) is sent, and the iframe is not
+rebuilt while those args stay the same.
+
+Game-over scores come back as the component value (batched in the iframe)
+and are stored with `leaderboard.record_scores`; the stored position is
+sent back as `acked` so the iframe stops re-sending them.
+"""
+
+import os
+import hashlib
+from functools import lru_cache
+from typing import Dict
+
+import streamlit as st
+import streamlit.components.v1 as components
+
+import leaderboard
+
+GAME_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "game_frontend")
+GAMES = ("snake", "parkour", "flappy")
+BUNDLES = ("engine",) + GAMES  # engine.js is shared by every game
+
+_component = components.declare_component("reward_game", path=GAME_DIR)
+
+
+@lru_cache(maxsize=1)
+def asset_hashes() -> Dict[str, str]:
+    """Content hash of each JS bundle, computed once per process."""
+    hashes = {}
+    for name in BUNDLES:
+        with open(os.path.join(GAME_DIR, f"{name}.js"), "rb") as f:
+            hashes[name] = hashlib.sha256(f.read()).hexdigest()[:12]
+    return hashes
+
+
+def render_game(game: str, height: int, user: str = None, key: str = None, **config):
+    """
+    Render a reward game and store the scores it reports.
+
+    Args:
+        game: One of GAMES
+        height: Iframe height in pixels
+        user: Profile the scores are saved for (scores are not saved without one)
+        key: Streamlit widget key (defaults to "game_<game>")
+        **config: Per-session settings, exposed to the game as window.GAME_CONFIG
+    """
+    if game not in GAMES:
+        raise ValueError(f"Unknown game: {game}")
+    key = key or f"game_{game}"
+    ack_key = f"{key}_acked"
+
+    # The value from the iframe's last batch is available before the widget is drawn,
+    # so the acknowledgement goes out in this same rerun
+    batch = st.session_state.get(key)
+    if user and isinstance(batch, dict) and batch.get("run"):
+        leaderboard.record_scores(user, game, batch.get("scores"), run=batch["run"])
+        st.session_state[ack_key] = {"run": batch["run"], "seq": batch.get("seq", 0)}
+
+    hashes = asset_hashes()
+    _component(
+        game=game,
+        version=hashes[game],
+        engine_version=hashes["engine"],
+        height=height,
+        config=config,
+        acked=st.session_state.get(ack_key),
+        key=key,
+        default=None,
+    )
+
+    if user:
+        best = leaderboard.best_score(game, user)
+        top = leaderboard.top_scores(game, n=3)
+        if best is not None:
+            board = " · ".join(f"{row['user'].title()} {row['score']}" for row in top)
+            st.caption(f"🏆 Your best: {best}  |  Top scores: {board}")
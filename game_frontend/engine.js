@@ -0,0 +1,258 @@
+// Shared reward-game engine, loaded by index.html before the game bundle.
+//
+//   GameEngine.createGame  builds a game from a declarative spec: markup,
+//                          input wiring, countdown, score HUD, game-over
+//                          overlay and restart, static background and the
+//                          frame loop; final scores go to window.GameBridge
+//   GameEngine.createLoop  requestAnimationFrame loop with a fixed-timestep
+//                          simulation and an interpolation factor for render
+//   GameEngine.createLayer static layer (background, ground) drawn once into
+//                          an offscreen canvas and blitted each frame
+//   GameEngine.DirtyRects  repaints only the regions drawn last frame from a
+//                          cached layer instead of clearing the whole canvas
+//   GameEngine.Pool        recycles obstacle/pipe objects instead of
+//                          allocating new ones while the game runs
+//   GameEngine.overlaps / circleRect
+//                          allocation-free collision tests
+(function () {
+  const MAX_FRAME_MS = 250;  // after a stall (tab hidden, slow tablet) don't try to catch up forever
+  const RESTART_DELAY_MS = 800;
+
+  function createLoop(opts) {
+    // opts.step(): advance the simulation by one fixed step of opts.stepMs
+    // opts.render(alpha): draw; alpha in [0, 1) is how far we are into the next step
+    const stepMs = opts.stepMs || 1000 / 60;
+    let last = null, acc = 0, running = false, handle = 0;
+
+    function frame(now) {
+      if (!running) return;
+      if (last === null) last = now;
+      acc += Math.min(now - last, MAX_FRAME_MS);
+      last = now;
+      while (acc >= stepMs && running) {
+        opts.step();
+        acc -= stepMs;
+      }
+      opts.render(acc / stepMs);
+      if (running) handle = requestAnimationFrame(frame);
+    }
+
+    return {
+      start() {
+        if (running) return;
+        running = true; last = null; acc = 0;
+        handle = requestAnimationFrame(frame);
+      },
+      stop() {
+        running = false;
+        cancelAnimationFrame(handle);
+      },
+      get running() { return running; },
+    };
+  }
+
+  function createLayer(width, height, draw) {
+    const canvas = typeof OffscreenCanvas !== "undefined"
+      ? new OffscreenCanvas(width, height)
+      : Object.assign(document.createElement("canvas"), { width: width, height: height });
+    draw(canvas.getContext("2d"), width, height);
+    return {
+      canvas: canvas,
+      blit(ctx) { ctx.drawImage(canvas, 0, 0); },
+      blitRect(ctx, x, y, w, h) { ctx.drawImage(canvas, x, y, w, h, x, y, w, h); },
+    };
+  }
+
+  class DirtyRects {
+    // Usage per frame: dirty.restore(ctx); draw sprites, calling dirty.mark(...) for each
+    constructor(layer, width, height, pad) {
+      this.layer = layer;
+      this.width = width;
+      this.height = height;
+      this.pad = pad === undefined ? 2 : pad;  // covers anti-aliased edges
+      this.prev = [];
+      this.next = [];
+      this.full = true;
+    }
+
+    invalidate() { this.full = true; }
+
+    mark(x, y, w, h) {
+      const p = this.pad;
+      const x0 = Math.max(0, Math.floor(x - p)), y0 = Math.max(0, Math.floor(y - p));
+      const x1 = Math.min(this.width, Math.ceil(x + w + p)), y1 = Math.min(this.height, Math.ceil(y + h + p));
+      if (x1 > x0 && y1 > y0) this.next.push(x0, y0, x1 - x0, y1 - y0);
+    }
+
+    restore(ctx) {
+      if (this.full) {
+        this.layer.blit(ctx);
+        this.full = false;
+      } else {
+        const r = this.prev;
+        for (let i = 0; i < r.length; i += 4) this.layer.blitRect(ctx, r[i], r[i + 1], r[i + 2], r[i + 3]);
+      }
+      // Swap buffers instead of allocating a new array each frame
+      const spare = this.prev;
+      this.prev = this.next;
+      this.next = spare;
+      this.next.length = 0;
+    }
+  }
+
+  class Pool {
+    // spawn() returns a recycled (or new) object in `active`; the caller resets its fields
+    constructor(create) {
+      this.create = create;
+      this.active = [];
+      this.free = [];
+    }
+
+    spawn() {
+      const item = this.free.length ? this.free.pop() : this.create();
+      this.active.push(item);
+      return item;
+    }
+
+    releaseAt(i) {
+      // Swap-remove: safe while iterating `active` backwards
+      const active = this.active;
+      const item = active[i];
+      active[i] = active[active.length - 1];
+      active.pop();
+      this.free.push(item);
+    }
+  }
+
+  // ------------------- Collision -------------------
+
+  function overlaps(ax, ay, aw, ah, bx, by, bw, bh) {
+    return ax < bx + bw && ax + aw > bx && ay < by + bh && ay + ah > by;
+  }
+
+  function circleRect(cx, cy, r, x, y, w, h) {
+    const nx = Math.max(x, Math.min(cx, x + w)), ny = Math.max(y, Math.min(cy, y + h));
+    const dx = cx - nx, dy = cy - ny;
+    return dx * dx + dy * dy < r * r;
+  }
+
+  function lerp(a, b, t) { return a + (b - a) * t; }
+
+  // ------------------- Games -------------------
+
+  function createGame(spec) {
+    // spec: width, height, background(g, w, h), init(game) -> state, step(state, game),
+    //   draw(ctx, state, alpha, game), onAction(state, action, game); optional stepMs,
+    //   countdown (seconds), hud {color, font}, hint, controls (extra markup),
+    //   keys {code: action}, tap (action for click/touch), buttons {elementId: action}
+    const width = spec.width, height = spec.height;
+    const stepMs = spec.stepMs || 1000 / 60;
+    const root = document.getElementById("game-root");
+    root.innerHTML =
+      "<div style='text-align:center'>" +
+      "<canvas width='" + width + "' height='" + height + "' style='border:1px solid #ccc; display:block; margin:auto;'></canvas>" +
+      (spec.controls || "") +
+      (spec.hint ? "<div style='margin-top:6px;font-size:12px;color:#333;'>" + spec.hint + "</div>" : "") +
+      "</div>";
+    const canvas = root.querySelector("canvas");
+    const ctx = canvas.getContext("2d");
+    const dirty = new DirtyRects(createLayer(width, height, spec.background), width, height);
+    const hud = Object.assign({ color: "#000", font: "18px sans-serif" }, spec.hud);
+
+    const game = {
+      width: width,
+      height: height,
+      score: 0,
+      phase: "countdown",  // -> "running" -> "over"
+      countdownSteps: Math.round((spec.countdown || 3) * 1000 / stepMs),
+      mark(x, y, w, h) { dirty.mark(x, y, w, h); },
+      over() {
+        if (game.phase === "over") return;
+        game.phase = "over";
+        overAt = performance.now();
+        if (window.GameBridge) window.GameBridge.submit(game.score);
+      },
+    };
+    let state = spec.init(game), overAt = 0;
+
+    function restart() {
+      state = spec.init(game);
+      game.score = 0;
+      game.phase = "countdown";
+      game.countdownSteps = Math.round((spec.countdown || 3) * 1000 / stepMs);
+      dirty.invalidate();
+      loop.start();
+    }
+
+    function act(action) {
+      if (game.phase !== "over") { if (action) spec.onAction(state, action, game); }
+      else if (performance.now() - overAt > RESTART_DELAY_MS) restart();  // ignore the input that ended the game
+    }
+    const keys = spec.keys || {};
+    document.addEventListener("keydown", function (e) {
+      if (keys[e.code]) { e.preventDefault(); act(keys[e.code]); }
+      else if (game.phase === "over") act(null);
+    });
+    canvas.addEventListener("pointerdown", function () { act(spec.tap || null); });
+    Object.keys(spec.buttons || {}).forEach(function (id) {
+      document.getElementById(id).addEventListener("click", function () { act(spec.buttons[id]); });
+    });
+
+    function overlay(text, font, subtitle) {
+      ctx.fillStyle = "rgba(0,0,0,0.6)";
+      ctx.fillRect(0, 0, width, height);
+      ctx.fillStyle = "#fff";
+      ctx.font = font;
+      ctx.textAlign = "center";
+      ctx.fillText(text, width / 2, height / 2);
+      if (subtitle) {
+        ctx.font = "14px sans-serif";
+        ctx.fillText(subtitle, width / 2, height / 2 + 28);
+      }
+      ctx.textAlign = "start";
+      dirty.invalidate();
+    }
+
+    function drawHud() {
+      ctx.fillStyle = hud.color;
+      ctx.font = hud.font;
+      ctx.fillText("Score: " + game.score, 10, 28);
+      dirty.mark(0, 8, 180, 28);
+      if (game.phase === "countdown") {
+        overlay(String(Math.ceil(game.countdownSteps * stepMs / 1000)), "48px sans-serif");
+      } else if (game.phase === "over") {
+        overlay("Game Over! Score: " + game.score, "24px sans-serif", "Tap or press a key to play again");
+      }
+    }
+
+    const loop = createLoop({
+      stepMs: stepMs,
+      step() {
+        if (game.phase === "countdown") {
+          if (--game.countdownSteps <= 0) game.phase = "running";
+        } else if (game.phase === "running") {
+          spec.step(state, game);
+        }
+      },
+      render(alpha) {
+        dirty.restore(ctx);
+        spec.draw(ctx, state, alpha, game);
+        drawHud();
+        if (game.phase === "over") loop.stop();  // the game-over overlay is the final frame
+      },
+    });
+    loop.start();
+    return game;
+  }
+
+  window.GameEngine = {
+    createGame: createGame,
+    createLoop: createLoop,
+    createLayer: createLayer,
+    DirtyRects: DirtyRects,
+    Pool: Pool,
+    overlaps: overlaps,
+    circleRect: circleRect,
+    lerp: lerp,
+  };
+})();
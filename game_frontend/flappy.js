@@ -0,0 +1,97 @@
+// Flappy reward game: tap/click or press Space to flap.
+// Loaded by index.html after engine.js; per-session settings arrive in window.GAME_CONFIG.
+(function () {
+  const WIDTH = 540, HEIGHT = 360, GROUND_Y = HEIGHT - 50;
+  const GRAVITY = 0.4, FLAP_VY = -7;
+  const PIPE_SPEED = 1.2, PIPE_W = 40, GAP = 120;
+
+  function drawBird(ctx, x, y) {
+    ctx.save();
+    ctx.translate(x, y);
+    // Body (yellow ellipse)
+    ctx.fillStyle = '#ffd700';
+    ctx.beginPath();
+    ctx.ellipse(0, 0, 14, 10, 0, 0, Math.PI*2);
+    ctx.fill();
+    // Wing
+    ctx.fillStyle = '#ffaa00';
+    ctx.beginPath();
+    ctx.ellipse(6, 2, 6, 4, -0.3, 0, Math.PI*2);
+    ctx.fill();
+    // Eye
+    ctx.fillStyle = '#000';
+    ctx.beginPath();
+    ctx.arc(5, -2, 2, 0, Math.PI*2);
+    ctx.fill();
+    // Beak
+    ctx.fillStyle = '#ff6b35';
+    ctx.beginPath();
+    ctx.moveTo(10, -1);
+    ctx.lineTo(14, 0);
+    ctx.lineTo(10, 1);
+    ctx.fill();
+    ctx.restore();
+  }
+
+  GameEngine.createGame({
+    width: WIDTH,
+    height: HEIGHT,
+    countdown: 5,
+    hint: 'Tap/click or press Space to flap. Pass through gaps to score.',
+    keys: { Space: 'flap' },
+    tap: 'flap',
+
+    background(g, w, h) {
+      g.fillStyle = '#87ceeb'; g.fillRect(0, 0, w, h);
+      g.fillStyle = '#ffd700'; g.fillRect(0, GROUND_Y, w, h - GROUND_Y);
+    },
+
+    init() {
+      return {
+        bird: { x: 80, y: 180, prevY: 180, r: 12, vy: 0 },
+        pipes: new GameEngine.Pool(() => ({ x: 0, top: 0, passed: false })),
+        frame: 0,
+      };
+    },
+
+    onAction(s, action, game) {
+      if (game.phase === 'running') s.bird.vy = FLAP_VY;
+    },
+
+    step(s, game) {
+      const b = s.bird, pool = s.pipes, pipes = pool.active;
+      b.prevY = b.y;
+      if (++s.frame % 120 === 0) {
+        const p = pool.spawn();
+        p.x = WIDTH; p.top = Math.random()*(HEIGHT - 280) + 40; p.passed = false;
+      }
+      b.vy += GRAVITY; b.y += b.vy;
+      if (b.y - b.r < 0 || b.y + b.r > GROUND_Y) game.over();
+
+      for (let i = pipes.length - 1; i >= 0; i--) {
+        const p = pipes[i];
+        p.x -= PIPE_SPEED;
+        if (p.x + PIPE_W < 0) { pool.releaseAt(i); continue; }
+        if (!p.passed && p.x + PIPE_W < b.x - b.r) { p.passed = true; game.score++; }
+        if (GameEngine.circleRect(b.x, b.y, b.r, p.x, 0, PIPE_W, p.top) ||
+            GameEngine.circleRect(b.x, b.y, b.r, p.x, p.top + GAP, PIPE_W, GROUND_Y - p.top - GAP)) {
+          game.over();
+        }
+      }
+    },
+
+    draw(ctx, s, alpha, game) {
+      const b = s.bird, y = GameEngine.lerp(b.prevY, b.y, alpha);
+      drawBird(ctx, b.x, y);
+      game.mark(b.x - 14, y - 10, 28, 20);
+      ctx.fillStyle = '#228B22';
+      for (const p of s.pipes.active) {
+        const x = p.x + PIPE_SPEED*(1 - alpha), bottom = p.top + GAP;
+        ctx.fillRect(x, 0, PIPE_W, p.top);
+        ctx.fillRect(x, bottom, PIPE_W, GROUND_Y - bottom);
+        game.mark(x, 0, PIPE_W, p.top);
+        game.mark(x, bottom, PIPE_W, GROUND_Y - bottom);
+      }
+    },
+  });
+})();
@@ -0,0 +1,85 @@
+// Parkour reward game: tap/click or press Space to jump.
+// Loaded by index.html after engine.js; per-session settings arrive in window.GAME_CONFIG.
+(function () {
+  const WIDTH = 640, HEIGHT = 300, GROUND_Y = 250;
+  const GRAVITY = 0.9, JUMP_VY = -12;
+
+  function drawPlayer(ctx, p, y) {
+    // Simple character with head, body and eyes; y is the feet position
+    ctx.fillStyle = '#ff6b6b';
+    ctx.beginPath();
+    ctx.arc(p.x + p.w/2, y - p.h + 8, 6, 0, Math.PI*2);
+    ctx.fill();
+    ctx.fillRect(p.x + 6, y - p.h + 15, 8, 12);
+    ctx.fillStyle = '#fff';
+    ctx.beginPath();
+    ctx.arc(p.x + p.w/2 - 2, y - p.h + 6, 2, 0, Math.PI*2);
+    ctx.fill();
+    ctx.beginPath();
+    ctx.arc(p.x + p.w/2 + 2, y - p.h + 6, 2, 0, Math.PI*2);
+    ctx.fill();
+  }
+
+  GameEngine.createGame({
+    width: WIDTH,
+    height: HEIGHT,
+    countdown: 5,
+    hint: 'Tap/click or press Space to jump. Survive as long as possible.',
+    hud: { color: '#333', font: '16px sans-serif' },
+    keys: { Space: 'jump' },
+    tap: 'jump',
+
+    background(g, w, h) {
+      g.fillStyle = '#eaf6ff'; g.fillRect(0, 0, w, h);
+      g.fillStyle = '#88c070'; g.fillRect(0, GROUND_Y, w, h - GROUND_Y);
+    },
+
+    init() {
+      return {
+        player: { x: 50, y: GROUND_Y, prevY: GROUND_Y, w: 20, h: 30, vy: 0 },
+        obstacles: new GameEngine.Pool(() => ({ x: 0, y: 0, w: 20, h: 0 })),
+        speed: 1.5,
+        tick: 0,
+      };
+    },
+
+    onAction(s, action, game) {
+      if (game.phase === 'running' && s.player.y >= GROUND_Y) s.player.vy = JUMP_VY;
+    },
+
+    step(s, game) {
+      const p = s.player, pool = s.obstacles, obstacles = pool.active;
+      p.prevY = p.y;
+      if (s.tick % 90 === 0) {
+        const o = pool.spawn();
+        o.h = 20 + Math.random()*40; o.x = WIDTH; o.y = GROUND_Y - o.h;
+      }
+      if (s.tick % 600 === 0) s.speed += 0.2;
+
+      p.vy += GRAVITY; p.y += p.vy;
+      if (p.y > GROUND_Y) { p.y = GROUND_Y; p.vy = 0; }
+
+      for (let i = obstacles.length - 1; i >= 0; i--) {
+        const o = obstacles[i];
+        o.x -= s.speed;
+        if (o.x + o.w < 0) { pool.releaseAt(i); continue; }
+        // The player is drawn from (y - h) to y
+        if (GameEngine.overlaps(p.x, p.y - p.h, p.w, p.h, o.x, o.y, o.w, o.h)) game.over();
+      }
+      s.tick++;
+      game.score = Math.floor(s.tick / 10);
+    },
+
+    draw(ctx, s, alpha, game) {
+      const p = s.player, y = GameEngine.lerp(p.prevY, p.y, alpha);
+      drawPlayer(ctx, p, y);
+      game.mark(p.x, y - p.h, p.w, p.h);
+      ctx.fillStyle = '#b33';
+      for (const o of s.obstacles.active) {
+        const x = o.x + s.speed*(1 - alpha);
+        ctx.fillRect(x, o.y, o.w, o.h);
+        game.mark(x, o.y, o.w, o.h);
+      }
+    },
+  });
+})();
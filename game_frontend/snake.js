@@ -0,0 +1,80 @@
+// Snake reward game: arrow keys or the on-screen buttons steer the snake.
+// Loaded by index.html after engine.js; per-session settings arrive in window.GAME_CONFIG.
+(function () {
+  const config = window.GAME_CONFIG || {};
+  const BOX = 20, CELLS = 20, SIZE = BOX * CELLS;
+  const OPPOSITE = { UP: 'DOWN', DOWN: 'UP', LEFT: 'RIGHT', RIGHT: 'LEFT' };
+  const MOVES = { UP: [0, -BOX], DOWN: [0, BOX], LEFT: [-BOX, 0], RIGHT: [BOX, 0] };
+
+  function randomCell() {
+    return { x: Math.floor(Math.random()*CELLS)*BOX, y: Math.floor(Math.random()*CELLS)*BOX };
+  }
+
+  function button(id, label) {
+    return '<button id="' + id + '" style="font-size:20px; margin:4px;">' + label + '</button>';
+  }
+
+  GameEngine.createGame({
+    width: SIZE,
+    height: SIZE,
+    stepMs: 200,  // the snake moves one cell per step; rendering runs every frame
+    countdown: 3,
+    hud: { color: 'white', font: '20px Arial' },
+    controls: '<div style="text-align:center; margin-top:8px;">' +
+      button('btnLeft', '⬅️') + button('btnUp', '⬆️') + button('btnDown', '⬇️') + button('btnRight', '➡️') +
+      '</div>',
+    keys: { ArrowUp: 'UP', ArrowDown: 'DOWN', ArrowLeft: 'LEFT', ArrowRight: 'RIGHT' },
+    buttons: { btnUp: 'UP', btnDown: 'DOWN', btnLeft: 'LEFT', btnRight: 'RIGHT' },
+
+    background(g, w, h) {
+      g.fillStyle = 'black'; g.fillRect(0, 0, w, h);
+    },
+
+    init() {
+      const start = { x: 9*BOX, y: 9*BOX };
+      return {
+        snake: [start],
+        prev: [start],  // positions before the last step, for interpolation
+        food: randomCell(),
+        direction: MOVES[config.direction] ? config.direction : 'RIGHT',
+      };
+    },
+
+    onAction(s, direction) {
+      if (direction !== OPPOSITE[s.direction]) s.direction = direction;
+    },
+
+    step(s, game) {
+      const move = MOVES[s.direction];
+      const head = { x: s.snake[0].x + move[0], y: s.snake[0].y + move[1] };
+      const hitsBody = s.snake.some(seg => seg.x === head.x && seg.y === head.y);
+      if (head.x < 0 || head.x >= SIZE || head.y < 0 || head.y >= SIZE || hitsBody) {
+        game.over();
+        return;
+      }
+
+      s.prev = s.snake.slice();
+      s.snake.unshift(head);
+      if (head.x === s.food.x && head.y === s.food.y) {
+        game.score++;
+        s.food = randomCell();
+      } else {
+        s.snake.pop();
+      }
+    },
+
+    draw(ctx, s, alpha, game) {
+      for (let i = 0; i < s.snake.length; i++) {
+        // Slide each segment from where it was before the last step (new tail segments don't move)
+        const to = s.snake[i], from = s.prev[i] || to;
+        const x = GameEngine.lerp(from.x, to.x, alpha), y = GameEngine.lerp(from.y, to.y, alpha);
+        ctx.fillStyle = i === 0 ? 'lime' : 'green';
+        ctx.fillRect(x, y, BOX, BOX);
+        game.mark(x, y, BOX, BOX);
+      }
+      ctx.fillStyle = 'red';
+      ctx.fillRect(s.food.x, s.food.y, BOX, BOX);
+      game.mark(s.food.x, s.food.y, BOX, BOX);
+    },
+  });
+})();
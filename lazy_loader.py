@@ -0,0 +1,115 @@
+"""
+Lazy Loader Module
+Defers importing page and game modules until they are first used, and
+measures what imports cost.
+
+  - `load("snake_game")` imports a page or game module on first use and
+    records what it cost, so heavy modules (games, `openai` via
+    `llm_helper`) are only loaded by the pages that actually need them.
+  - `load_stats()` reports the in-process first-use load time per module.
+  - `importtime_report()` runs `python -X importtime` in a fresh process and
+    parses the per-module self/cumulative breakdown for cold-start analysis.
+"""
+
+import os
+import sys
+import time
+import importlib
+import subprocess
+import threading
+from functools import lru_cache
+from types import ModuleType
+from typing import Dict, List, Tuple
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+_lock = threading.RLock()
+_load_stats: Dict[str, dict] = {}
+
+
+def load(name: str) -> ModuleType:
+    """Import a module by name, recording the time and number of modules it pulled in."""
+    module = sys.modules.get(name)
+    # A module another thread is still importing is in sys.modules but half built;
+    # import_module below waits for that import to finish
+    if module is not None and not getattr(getattr(module, "__spec__", None), "_initializing", False):
+        return module
+
+    with _lock:
+        before = len(sys.modules)
+        start = time.perf_counter()
+        module = importlib.import_module(name)
+        if name not in _load_stats:
+            _load_stats[name] = {
+                "ms": (time.perf_counter() - start) * 1000,
+                "new_modules": len(sys.modules) - before,
+            }
+    return module
+
+
+def load_stats() -> Dict[str, dict]:
+    """First-use load times recorded in this process: {module: {"ms", "new_modules"}}."""
+    return dict(_load_stats)
+
+
+@lru_cache(maxsize=16)
+def importtime_report(modules: Tuple[str, ...], limit: int = 25) -> List[dict]:
+    """
+    Profile importing `modules` in a fresh interpreter with `-X importtime`.
+
+    Args:
+        modules: Module names to import (as a tuple, so results can be cached)
+        limit: Number of most expensive entries (by cumulative time) to return
+
+    Returns:
+        List of {"module", "self_ms", "cumulative_ms", "depth"} dicts, slowest first
+    """
+    code = "; ".join(f"import {name}" for name in modules)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=APP_DIR,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+
+    records = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        try:
+            self_us, cumulative_us = int(parts[0]), int(parts[1])
+        except ValueError:
+            continue  # header line
+        name = parts[2].rstrip()
+        stripped = name.lstrip()
+        records.append({
+            "module": stripped,
+            "self_ms": self_us / 1000,
+            "cumulative_ms": cumulative_us / 1000,
+            "depth": (len(name) - len(stripped) - 1) // 2,
+        })
+
+    records.sort(key=lambda r: r["cumulative_ms"], reverse=True)
+    return records[:limit]
+
+
+def render_debug_panel(st, modules: Tuple[str, ...]) -> None:
+    """Show load stats and an on-demand `-X importtime` report in a sidebar expander."""
+    with st.sidebar.expander("🛠️ Debug: Import Times"):
+        stats = load_stats()
+        if stats:
+            st.write("**Loaded on first use (this process):**")
+            for name, info in sorted(stats.items(), key=lambda kv: kv[1]["ms"], reverse=True):
+                st.write(f"- `{name}`: {info['ms']:.0f} ms ({info['new_modules']} modules)")
+        else:
+            st.write("No lazy modules loaded yet.")
+
+        if st.button("⏱️ Profile cold imports", key="debug_importtime"):
+            with st.spinner("Running python -X importtime..."):
+                report = importtime_report(tuple(modules))
+            st.dataframe(
+                [{"module": "  " * r["depth"] + r["module"], "self (ms)": round(r["self_ms"], 1),
+                  "cumulative (ms)": round(r["cumulative_ms"], 1)} for r in report]
+            )
@@ -0,0 +1,118 @@
+"""
+Leaderboard Module
+Reward game scores per user and game.
+
+Scores reported by the game component are appended to `game_scores.jsonl`
+(one JSON object per line, never rewritten) and indexed in memory as
+sorted lists per (user, game) and per game, so top-N queries are a slice
+instead of a rescan of the file. Only lines appended since the last read
+are parsed, and each score carries the reporting iframe's run id and
+sequence number so a batch that is re-sent is stored once.
+"""
+
+import os
+import json
+import bisect
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+SCORES_FILE = "game_scores.jsonl"
+MAX_SCORE = 1_000_000  # anything above this is not a real game result
+
+ALL_USERS = "*"
+
+_lock = threading.Lock()
+# (user, game) -> sorted [(-score, at, user)]; (ALL_USERS, game) holds every user's scores
+_boards: Dict[Tuple[str, str], List[Tuple[int, str, str]]] = {}
+_seen = set()  # (run, seq) of stored scores
+_state = {"offset": 0}
+
+
+# ------------------- Index -------------------
+
+
+def _index(entry: dict) -> None:
+    item = (-entry["score"], entry["at"], entry["user"])
+    for key in ((entry["user"], entry["game"]), (ALL_USERS, entry["game"])):
+        bisect.insort(_boards.setdefault(key, []), item)
+    if entry.get("run"):
+        _seen.add((entry["run"], entry.get("seq")))
+
+
+def _refresh() -> None:
+    """Index lines appended to the scores file since the last read (caller holds _lock)."""
+    try:
+        size = os.path.getsize(SCORES_FILE)
+    except OSError:
+        return
+    if size < _state["offset"]:  # file was replaced or truncated: rebuild
+        _boards.clear()
+        _seen.clear()
+        _state["offset"] = 0
+    if size == _state["offset"]:
+        return
+
+    with open(SCORES_FILE, "rb") as f:
+        f.seek(_state["offset"])
+        data = f.read()
+    end = data.rfind(b"\n") + 1  # leave a partially written last line for next time
+    for line in data[:end].splitlines():
+        try:
+            _index(json.loads(line))
+        except (ValueError, KeyError, TypeError):
+            continue
+    _state["offset"] += end
+
+
+# ------------------- Public API -------------------
+
+
+def record_scores(user: str, game: str, scores: list, run: Optional[str] = None) -> int:
+    """
+    Store scores reported by one game iframe.
+
+    Args:
+        user: The user name/profile
+        game: Game name (e.g. "snake")
+        scores: List of {"score", "seq"} dicts from the component
+        run: Id of the reporting iframe; with "seq" it makes re-sent scores a no-op
+
+    Returns:
+        Number of new scores stored
+    """
+    with _lock:
+        _refresh()
+        lines = []
+        for item in scores or []:
+            try:
+                score = int(item["score"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            seq = item.get("seq")
+            if not 0 <= score <= MAX_SCORE or (run and (run, seq) in _seen):
+                continue
+            entry = {"user": user, "game": game, "score": score,
+                     "at": datetime.now().isoformat(timespec="seconds"), "run": run, "seq": seq}
+            _index(entry)
+            lines.append(json.dumps(entry) + "\n")
+
+        if lines:
+            with open(SCORES_FILE, "a") as f:
+                f.write("".join(lines))
+            _state["offset"] = os.path.getsize(SCORES_FILE)
+        return len(lines)
+
+
+def top_scores(game: str, user: Optional[str] = None, n: int = 5) -> List[dict]:
+    """Top `n` scores for a game, for one user or (user=None) across all users."""
+    with _lock:
+        _refresh()
+        board = _boards.get((user or ALL_USERS, game), [])
+        return [{"user": u, "score": -neg, "at": at} for neg, at, u in board[:n]]
+
+
+def best_score(game: str, user: str) -> Optional[int]:
+    """A user's best score for a game, or None if they have not played it."""
+    top = top_scores(game, user, n=1)
+    return top[0]["score"] if top else None
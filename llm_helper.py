@@ -4,22 +4,62 @@ Centralized module for LLM interactions used by various parts of the application
 Supports:
   - Generating math questions tailored to specific primary levels (P1-P6, PLSE)
   - Text translation (English ↔ Myanmar)
+  - Instrumented completions for other features (`complete`, see llm_telemetry)
+  - The same operations as coroutines on AsyncOpenAI (`AsyncLLMHelper`)
 """
 
 import os
-from typing import Optional, List, Dict, Tuple
-from openai import OpenAI
+from dataclasses import dataclass, field
+from typing import Generator, Optional, List, Dict, Tuple
+
+import answer_check
+import answer_verify
+import llm_telemetry
+import prompts
+import question_bank
+import token_budget
+
+DEFAULT_BASE_URL = "https://openrouter.ai/api/v1"
+MAX_CONTINUATIONS = 2  # follow-up requests for questions cut off at max_tokens
+
+
+@dataclass
+class MathQuestionSet:
+    """
+    One generated question set and how it was produced.
+
+    Returned rather than stored on the helper, which is shared by all sessions.
+    """
+    questions: List[Tuple[str, float]]
+    rejected: List[Tuple[str, float]] = field(default_factory=list)  # answer keys that failed verification
+    error: Optional[str] = None  # last LLM error, if any request failed
+    local_count: int = 0  # questions filled in from question_bank
+
+
+@dataclass
+class Translation:
+    """A translation, or a user-facing error message in its place plus the error."""
+    text: str
+    error: Optional[str] = None
+
+
+# Shared request logic is written as generators: they yield `complete()` keyword
+# arguments, are sent each response (or thrown its error) and return the result.
+# LLMHelper._run_steps and AsyncLLMHelper._run_steps drive them.
+Steps = Generator[dict, "llm_telemetry.CompletionResult", object]
 
 
 class LLMHelper:
     """Helper class for LLM operations across the application."""
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None):
         """
         Initialize LLM Helper.
         
         Args:
             api_key: OpenRouter API key. If None, will attempt to load from environment.
+            base_url: OpenAI-compatible API URL. Defaults to OPENROUTER_BASE_URL or OpenRouter
+                (point it at benchmarks/mock_openrouter.py to run offline).
         """
         if api_key is None:
             api_key = os.environ.get("OPENROUTER_API_KEY") or os.environ.get("DEEPSEEK_API_KEY")
@@ -28,21 +68,56 @@ class LLMHelper:
             raise ValueError("API key not provided and not found in environment")
         
         self.api_key = api_key
-        self.client = OpenAI(
-            base_url="https://openrouter.ai/api/v1",
-            api_key=api_key
-        )
+        self.client = self._make_client(api_key, base_url or os.environ.get("OPENROUTER_BASE_URL") or DEFAULT_BASE_URL)
         self.model = "openai/gpt-oss-120b:free"
         # self.model ="qwen/qwen3-coder:free"
         # self.model ="qwen/qwen3-next-80b-a3b-instruct:free"
         # self.model = "deepseek/deepseek-r1-0528:free"
-        self.last_error: Optional[str] = None
+
+    def _make_client(self, api_key: str, base_url: str):
+        # Imported here because `openai` is slow to import and most pages never need it
+        from openai import OpenAI
+
+        # Retries happen in llm_telemetry.complete so they are recorded
+        return OpenAI(base_url=base_url, api_key=api_key, max_retries=0)
     
+    # ==========================================
+    # COMPLETIONS
+    # ==========================================
+
+    def complete(self, feature: str, messages: List[Dict[str, str]], max_tokens: int, temperature: float,
+                 title: str = "Math Practice App", **tags) -> "llm_telemetry.CompletionResult":
+        """
+        Run one instrumented chat completion (timing, tokens and retries are recorded).
+
+        Args:
+            feature: Telemetry group for the Admin page (e.g. "translate")
+            messages: Chat messages
+            max_tokens: Completion token limit
+            temperature: Sampling temperature
+            title: X-Title header sent to OpenRouter
+            **tags: Extra fields stored with the telemetry event
+
+        Returns:
+            CompletionResult with .text and .finish_reason
+        """
+        return llm_telemetry.complete(
+            self.client,
+            feature=feature,
+            model=self.model,
+            messages=messages,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            extra_headers={"HTTP-Referer": "http://localhost:8501", "X-Title": title},
+            tags=tags,
+        )
+
     # ==========================================
     # MATH QUESTION GENERATION
     # ==========================================
     
-    def generate_math_questions(self, level: str, count: int = 10, style: str = "Balanced (Mixed)", fast: bool = True) -> List[Tuple[str, float]]:
+    def generate_math_questions(self, level: str, count: int = 10, style: str = "Balanced (Mixed)", fast: bool = True,
+                                topic_mix: Optional[Dict[str, int]] = None) -> List[Tuple[str, float]]:
         """
         Generate math questions for a specific primary level.
         
@@ -50,161 +125,162 @@ class LLMHelper:
             level: One of "P1", "P2", "P3", "P4", "P5", "P6", or "PLSE"
             count: Number of questions to generate (default: 10)
             style: One of the style descriptors (e.g., "Balanced (Mixed)") to bias question types
-            fast: When True, ask for a shorter/concise response and reduce max tokens for speed
+            fast: When True, use a low temperature for quicker, more uniform responses
+            topic_mix: Optional {topic: count} mix for this learner (see adaptive.plan_session)
         
         Returns:
-            List of tuples (question_string, correct_answer)
+            Exactly `count` tuples (question_string, correct_answer); any the LLM did
+            not provide (or got wrong) are topped up, finally from question_bank
             Example: [("3 + 5 = ?", 8), ("12 - 4 = ?", 8)]
         """
-        level = level.upper()
-        valid_levels = ["P1", "P2", "P3", "P4", "P5", "P6", "PLSE"]
-        
-        if level not in valid_levels:
-            raise ValueError(f"Invalid level: {level}. Must be one of {valid_levels}")
-        
-        try:
-            prompt = self._build_math_prompt(level, count, style=style)
-
-            # Tune request for speed when requested
-            if fast:
-                max_tokens = max(300, min(1200, 80 * int(count)))
-                temperature = 0.2
-            else:
-                max_tokens = 2000
-                temperature = 0.7
-
-            response = self.client.chat.completions.create(
-                extra_headers={
-                    "HTTP-Referer": "http://localhost:8501",
-                    "X-Title": "Math Practice App"
-                },
-                model=self.model,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=max_tokens,
-                temperature=temperature
-            )
+        return self.generate_math_question_set(level, count, style=style, fast=fast, topic_mix=topic_mix).questions
 
-            response_text = response.choices[0].message.content.strip()
-            questions = self._parse_math_response(response_text)
+    def generate_math_question_set(self, level: str, count: int = 10, style: str = "Balanced (Mixed)",
+                                   fast: bool = True, topic_mix: Optional[Dict[str, int]] = None) -> MathQuestionSet:
+        """`generate_math_questions`, also returning the rejected answer keys, any LLM error and the local count."""
+        return self._run_steps(self._math_question_steps(self._check_level(level), count, style, fast, topic_mix))
 
-            return questions
+    def _run_steps(self, steps: Steps):
+        """Run a steps generator, sending each request it yields through `complete()`."""
+        try:
+            request = next(steps)
+            while True:
+                try:
+                    response = self.complete(**request)
+                except Exception as e:
+                    request = steps.throw(e)  # handled by the generator as if it had made the call
+                else:
+                    request = steps.send(response)
+        except StopIteration as done:
+            return done.value
 
-        except Exception as e:
-            self.last_error = str(e)
-            return self._fallback_math_questions(level, count)
-    
-    def _build_math_prompt(self, level: str, count: int, style: str = "Balanced (Mixed)") -> str:
-        """Build the prompt for generating math questions by level."""
-        level_specs = {
-            "P1": {
-                "desc": "Primary 1 (Ages 6-7), matching Singapore Primary 1 Math syllabus",
-                "topics": "addition and subtraction within 20, simple multiplication facts, basic word problems",
-                "examples": "3 + 5, 12 - 4, 2 × 3, simple story problems with objects",
-                "bonus": "Use simple numbers, friendly characters like animals and kids"
-            },
-            "P2": {
-                "desc": "Primary 2 (Ages 7-8), matching Singapore Primary 2 Math syllabus",
-                "topics": "addition and subtraction within 100, multiplication and division facts (1-12 times tables), word problems with everyday items",
-                "examples": "25 + 18, 50 - 23, 6 × 7, 30 ÷ 5, 'Tom has 15 apples, buys 8 more, how many total?'",
-                "bonus": "Make scenarios about school, toys, snacks, animals, daily life"
-            },
-            "P3": {
-                "desc": "Primary 3 (Ages 8-9), matching Singapore Primary 3 Math syllabus",
-                "topics": "operations within 1000, multiplication/division (up to 12×12), fractions, word problems, logic/puzzle problems",
-                "examples": "234 + 156, 500 - 278, 9 × 8, 48 ÷ 6, 1/2 + 1/4, 'Rabbits and chickens have 10 heads and 28 legs, how many of each?'",
-                "bonus": "Include logic puzzles and multi-step decisions"
-            },
-            "P4": {
-                "desc": "Primary 4 (Ages 9-10), matching Singapore Primary 4 Math syllabus",
-                "topics": "multi-digit operations, fractions and decimals, geometry (area/perimeter), word problems, mixed operations",
-                "examples": "1234 + 567, 2000 - 845, 12 × 15, 144 ÷ 12, 0.5 + 0.25, 'Rectangle 12cm × 8cm, find area', 'If apples cost $3 each and I buy 5, total cost?'",
-                "bonus": "Include money problems, shopping, measurements, real-world scenarios",
-                "requirment": "More focus on word problems and real-world applications, less on pure calculations compared to earlier levels"
-            },
-            "P5": {
-                "desc": "Primary 5 (Ages 10-11), matching Singapore Primary 5 Math syllabus",
-                "topics": "fractions/decimals/percentages, ratios, basic algebra, geometry, word problems with multiple steps, consumer math",
-                "examples": "3/4 × 2/3, 15% of 80, ratio 2:3, solve x + 5 = 12, 'Discount of 20% on $50, final price?', 'Speed and distance problems'",
-                "bonus": "Include discounts, taxes, speed-distance-time, proportion problems",
-                "requirment": "More focus on word problems and real-world applications, less on pure calculations compared to earlier levels"
-            },
-            "P6": {
-                "desc": "Primary 6 (Ages 11-12), matching Singapore Primary 6 Math syllabus",
-                "topics": "advanced algebra, percentages/ratios/proportions, geometry (area, volume, perimeter), statistics, multi-step problems, profit/loss",
-                "examples": "120% of 50, solve 2x + 3 = 11, 'If cost is $80 and profit margin is 25%, selling price?', 'Ratio 2:5, if total is 70, find first part'",
-                "bonus": "Include complex scenarios with profit/loss, compound ratios, advanced geometry",
-                "requirment": "More focus on word problems and real-world applications, less on pure calculations compared to earlier levels"
-            },
-            "PLSE": {
-                "desc": "Pre-Lower Secondary Exam (Ages 11-13), matching Singapore PLSE syllabus, preparing for secondary school math",
-                "topics": "comprehensive: algebra equations, geometry proofs, statistics, number theory, problem-solving, real-world applications",
-                "examples": "Solve quadratic equations, find area and volume, 'A train travels at 60km/h for 2.5 hours, distance?', 'Profit and loss calculations', 'Probability problems'",
-                "bonus": "Include challenging multi-step problems, algebra, geometry proofs, statistics",
-                "requirment": "More focus on real PSLE questions."
-            }
-        }
-        
-        spec = level_specs.get(level, level_specs["P1"])
-        
-        # Incorporate style into the prompt to bias question types.
-        style_line = f"Prefer style: {style}." if style else ""
+    def _math_question_steps(self, level: str, count: int, style: str, fast: bool,
+                             topic_mix: Optional[Dict[str, int]]) -> Steps:
+        """Generate, verify, re-request and fill from the bank (see `Steps`)."""
+        result = MathQuestionSet([])
+        try:
+            questions = yield from self._math_request_steps(level, count, style, fast, topic_mix)
 
-        prompt = f"""Generate {count} DIVERSE and ENGAGING math questions suitable for {spec['desc']}.
+            # Drop questions whose stated answer fails an exact re-calculation,
+            # then request the rejected and any missing ones together in one extra call
+            questions, result.rejected = answer_verify.verify_questions(questions)
+            if questions and len(questions) < count:
+                try:
+                    extra = yield from self._math_request_steps(level, count - len(questions), style, fast)
+                    extra, _ = answer_verify.verify_questions(extra)
+                    self._merge_questions(questions, extra, count)
+                except Exception as e:
+                    result.error = str(e)
+
+            result.questions, result.local_count = self._fill_from_bank(level, questions, count, topic_mix)
 
-Topics to cover: {spec['topics']}
-Example question types: {spec['examples']}
-Special focus: {spec['bonus']}
+        except Exception as e:
+            result.error = str(e)
+            result.questions, result.local_count = self._fill_from_bank(level, [], count, topic_mix)
+        return result
 
-    {style_line}
+    @staticmethod
+    def _check_level(level: str) -> str:
+        level = level.upper()
+        valid_levels = ["P1", "P2", "P3", "P4", "P5", "P6", "PLSE"]
+        if level not in valid_levels:
+            raise ValueError(f"Invalid level: {level}. Must be one of {valid_levels}")
+        return level
+    
+    def _math_request_steps(self, level: str, count: int, style: str, fast: bool,
+                            topic_mix: Optional[Dict[str, int]] = None) -> Steps:
+        """
+        Request `count` questions, continuing for the missing ones if a reply is cut off.
 
-IMPORTANT: Create a BALANCED MIX of question types:
-1. Pure calculations (mental math, operations) - about 3-4 questions
-2. REAL WORLD WORD PROBLEMS - about 4-5 questions (with context, names, items, money)
-3. LOGIC/PUZZLE PROBLEMS - about 1-2 questions (multi-step thinking)
-4. GEOMETRY/MEASUREMENTS - about 1-2 questions (where applicable for this level)
+        Each request's max_tokens comes from token_budget. When a reply stops at
+        that limit, the complete Q/A pairs are kept and only the remainder is
+        requested again (up to MAX_CONTINUATIONS times).
+        """
+        questions: List[Tuple[str, float]] = []
+        for continuation in range(MAX_CONTINUATIONS + 1):
+            missing = count - len(questions)
+            # The learner's topic mix describes the whole set, so it only applies to the first request
+            request = self._math_request(level, missing, style, fast, topic_mix if not questions else None)
+            response = yield dict(request, continuation=continuation)
+            if not self._add_math_batch(questions, response, count):
+                break
+        return questions
 
-Format each question EXACTLY as follows (IMPORTANT):
-Q: [question text here]
-A: [numeric answer only]
+    def _math_request(self, level: str, count: int, style: str, fast: bool,
+                      topic_mix: Optional[Dict[str, int]]) -> dict:
+        """`complete()` arguments for one math generation request."""
+        prompt = self._build_math_prompt(level, count, style=style, topic_mix=topic_mix)
+        return dict(
+            feature="math_questions",
+            messages=[{"role": "user", "content": prompt.text}],
+            max_tokens=token_budget.max_tokens("math_questions", count, level=level, style=style),
+            temperature=0.2 if fast else 0.7,
+            level=level,
+            count=count,
+            style=style,
+            **prompt.tags,
+        )
 
-CRITICAL RULES:
-1. EVERY line with Q: must be followed by a line with A:
-2. Q: and A: must be ON SEPARATE LINES
-3. Answer must be a NUMBER ONLY (no units, no text, no "=" sign)
-4. For word problems, make them SHORT but CLEAR with character names and scenarios
-5. Answers must be exact: integers for whole numbers, decimals where needed (e.g., 3.5 not 3.5 cm)
-6. All {count} questions should be DIFFERENT and INTERESTING
-7. Mix difficulty within the level - some easier, some harder
+    def _add_math_batch(self, questions: List[Tuple[str, float]], response, count: int) -> bool:
+        """
+        Add a reply's new Q/A pairs to `questions` (up to `count` in total).
 
-Format example:
-Q: If Sarah has 15 apples and gives 3 to her friend, how many does she have left?
-A: 12
+        Returns:
+            True if the reply was truncated and questions are still missing
+        """
+        truncated = response.finish_reason == "length"
+        batch = self._parse_math_response(response.text)
+        if truncated and batch and response.text.splitlines()[-1].lstrip().startswith("A:"):
+            batch = batch[:-1]  # the last answer may have been cut mid-number
+        self._merge_questions(questions, batch, count)
+        return truncated and len(questions) < count
 
-Q: 25 + 17 = ?
-A: 42
+    @staticmethod
+    def _merge_questions(questions: List[Tuple[str, float]], extra: List[Tuple[str, float]], count: int) -> None:
+        """Append questions from `extra` that are not already in `questions`, up to `count` in total."""
+        seen = {q for q, _ in questions}
+        for question, answer in extra:
+            if len(questions) >= count:
+                break
+            if question not in seen:
+                seen.add(question)
+                questions.append((question, answer))
 
-Now generate {count} diverse, interesting, and well-formatted questions.
+    def _fill_from_bank(self, level: str, questions: List[Tuple[str, float]], count: int,
+                        topic_mix: Optional[Dict[str, int]] = None) -> Tuple[List[Tuple[str, float]], int]:
+        """
+        Top `questions` up to `count` with the level's locally generated questions.
 
-REQUIREMENTS:
-- Be concise and avoid any extra text outside the Q/A pairs.
-- Use the exact Q/A format below and do not number the pairs.
-- Output should be as short as possible while following the format.
+        Returns:
+            (questions, number of them that came from question_bank)
+        """
+        have = len(questions)
+        if not questions:
+            questions = self._fallback_math_questions(level, count, topic_mix=topic_mix)
+        if len(questions) < count:
+            # Any topic, with a few spares: the LLM's questions may repeat, and a topic
+            # in the mix can run out of distinct questions
+            extra = self._fallback_math_questions(level, count - len(questions) + 5)
+            self._merge_questions(questions, extra, count)
+        return questions, len(questions) - have
 
-Format example:
-Q: If Sarah has 15 apples and gives 3 to her friend, how many does she have left?
-A: 12
+    def _build_math_prompt(self, level: str, count: int, style: str = "Balanced (Mixed)",
+                           topic_mix: Optional[Dict[str, int]] = None) -> "prompts.RenderedPrompt":
+        """Render the level's precompiled math prompt (see prompts.MATH_LEVEL_SPECS)."""
+        if level not in prompts.MATH_LEVEL_SPECS:
+            level = "P1"
 
-Q: 25 + 17 = ?
-A: 42
+        # Incorporate style into the prompt to bias question types.
+        style_line = f"Prefer style: {style}." if style else ""
+        if topic_mix:
+            # Adaptive mix: more questions on the learner's weaker topics
+            mix = ", ".join(f"{n} {topic.replace('_', ' ')}" for topic, n in topic_mix.items())
+            style_line += f"\n    Topic mix for this learner (approximate question counts): {mix}."
 
-Now generate {count} diverse, interesting, and well-formatted questions:"""
-        
-        return prompt
+        return prompts.render(f"math_questions.{level}", count=count, style_line=style_line)
     
     def _parse_math_response(self, response_text: str) -> List[Tuple[str, float]]:
-        """Parse LLM response to extract questions and answers."""
+        """Parse LLM response to extract questions and answers (empty if there are none)."""
         questions = []
         lines = response_text.strip().split('\n')
         
@@ -215,112 +291,23 @@ Now generate {count} diverse, interesting, and well-formatted questions:"""
             if line.startswith("Q:"):
                 current_question = line[2:].strip()
             elif line.startswith("A:") and current_question:
-                try:
-                    # Try to convert answer to float
-                    answer_str = line[2:].strip()
-                    answer = float(answer_str)
+                # Parse exactly (fractions, percentages, "1,200", units); percentage keys stay "25%"
+                answer = answer_check.to_key(line[2:].strip())
+                if answer is not None:
                     questions.append((current_question, answer))
                     current_question = None
-                except (ValueError, IndexError):
-                    pass
-        
-        # If parsing failed, return fallback
-        if not questions:
-            return self._fallback_math_questions("P1", 10)
         
         return questions
     
-    def _fallback_math_questions(self, level: str, count: int) -> List[Tuple[str, float]]:
-        """Provide fallback math questions if LLM call fails."""
-        fallback_questions = {
-            "P1": [
-                ("3 + 5 = ?", 8),
-                ("12 - 4 = ?", 8),
-                ("2 × 6 = ?", 12),
-                ("10 - 3 = ?", 7),
-                ("Tom has 4 apples and gets 5 more. How many apples does he have?", 9),
-                ("15 - 5 = ?", 10),
-                ("4 × 3 = ?", 12),
-                ("9 + 1 = ?", 10),
-                ("There are 8 red balls and 2 blue balls. How many balls total?", 10),
-                ("3 × 2 = ?", 6),
-            ],
-            "P2": [
-                ("25 + 18 = ?", 43),
-                ("50 - 23 = ?", 27),
-                ("6 × 7 = ?", 42),
-                ("30 ÷ 5 = ?", 6),
-                ("Sarah has $34 and buys a book for $21. How much money does she have left?", 13),
-                ("48 - 17 = ?", 31),
-                ("8 × 5 = ?", 40),
-                ("24 ÷ 4 = ?", 6),
-                ("A box has 15 candies. After eating 7, how many are left?", 8),
-                ("60 - 28 = ?", 32),
-            ],
-            "P3": [
-                ("234 + 156 = ?", 390),
-                ("500 - 278 = ?", 222),
-                ("9 × 8 = ?", 72),
-                ("48 ÷ 6 = ?", 8),
-                ("Rabbits and chickens have 10 heads and 28 legs total. How many rabbits?", 4),
-                ("600 - 234 = ?", 366),
-                ("11 × 7 = ?", 77),
-                ("56 ÷ 8 = ?", 7),
-                ("A rectangle has length 12cm and width 8cm. What is the area?", 96),
-                ("1/2 + 1/4 = ?", 0.75),
-            ],
-            "P4": [
-                ("1234 + 567 = ?", 1801),
-                ("2000 - 845 = ?", 1155),
-                ("12 × 15 = ?", 180),
-                ("144 ÷ 12 = ?", 12),
-                ("Ducks and goats have 15 heads and 42 feet. How many goats?", 6),
-                ("3000 - 1678 = ?", 1322),
-                ("25 × 4 = ?", 100),
-                ("Apples cost $3 each. If you buy 5 apples, how much do you pay?", 15),
-                ("A box with length 10cm, width 6cm, height 4cm. What is the volume?", 240),
-                ("0.5 + 0.75 = ?", 1.25),
-            ],
-            "P5": [
-                ("3/4 × 2/3 = ?", 0.5),
-                ("15% of 80 = ?", 12),
-                ("0.75 + 0.25 = ?", 1.0),
-                ("2/5 of 100 = ?", 40),
-                ("A shirt costs $50. With a 20% discount, what is the final price?", 40),
-                ("8/10 as percentage = ?", 80),
-                ("Solve: 3x - 5 = 10, x = ?", 5),
-                ("5/8 × 16 = ?", 10),
-                ("If ratio of boys to girls is 3:5 and there are 24 boys, how many girls?", 40),
-                ("20% of 150 = ?", 30),
-            ],
-            "P6": [
-                ("120% of 50 = ?", 60),
-                ("Solve: 2x + 3 = 11, x = ?", 4),
-                ("30% of 250 = ?", 75),
-                ("Ratio 2:3, if first is 10, second = ?", 15),
-                ("Area of triangle with base 12cm and height 10cm = ?", 60),
-                ("Solve: 3x - 5 = 10, x = ?", 5),
-                ("5/8 × 16 = ?", 10),
-                ("45% of 200 = ?", 90),
-                ("Solve: x/2 + 3 = 8, x = ?", 10),
-                ("Perimeter of rectangle: length 8cm, width 5cm = ?", 26),
-            ],
-            "PLSE": [
-                ("Solve: 2x + 5 = 17, x = ?", 6),
-                ("60% of 180 = ?", 108),
-                ("A table costs $100 and profit margin is 25%. Selling price = ?", 125),
-                ("Ratio 3:5:2, if total is 100, what is the first part?", 30),
-                ("Circumference of circle with radius 5cm (π≈3.14) = ?", 31.4),
-                ("Solve: 3(x - 2) = 15, x = ?", 7),
-                ("Area of triangle with base 10cm and height 8cm = ?", 40),
-                ("A discount of 30% on $200, final price = ?", 140),
-                ("Speed is 60km/h, travel time is 2.5 hours, distance = ?", 150),
-                ("Mean of 10, 20, 30, 40, 50 = ?", 30),
-            ]
-        }
-        
-        questions = fallback_questions.get(level.upper(), fallback_questions["P1"])
-        return questions[:count]
+    def _fallback_math_questions(self, level: str, count: int,
+                                 topic_mix: Optional[Dict[str, int]] = None) -> List[Tuple[str, float]]:
+        """Provide locally generated math questions if the LLM call fails."""
+        level = level.upper()
+        if level not in question_bank.LEVELS:
+            level = "P1"
+        if topic_mix and sum(topic_mix.values()) == count:
+            return question_bank.generate_from_mix(level, topic_mix)
+        return question_bank.generate_questions(level, count)
     
     # ==========================================
     # TRANSLATION
@@ -328,49 +315,126 @@ Now generate {count} diverse, interesting, and well-formatted questions:"""
     
     def translate_to_english(self, text: str) -> str:
         """Translate text to English."""
-        return self._translate(text, "en")
+        return self.translate(text, "en").text
     
     def translate_to_myanmar(self, text: str) -> str:
         """Translate text to Myanmar (Burmese)."""
-        return self._translate(text, "my")
+        return self.translate(text, "my").text
+
+    def translate(self, text: str, target_lang: str) -> Translation:
+        """
+        Translate text, returning any error with the result.
+
+        Args:
+            text: Text to translate
+            target_lang: "en" or "my"
+
+        Returns:
+            Translation; on failure .text is a user-friendly message and .error the cause
+        """
+        return self._run_steps(self._translation_steps(text, target_lang))
     
-    def _translate(self, text: str, target_lang: str) -> str:
-        """Call LLM for translation."""
+    def _translation_steps(self, text: str, target_lang: str) -> Steps:
+        """Call LLM for translation (see `Steps`)."""
         try:
-            if target_lang == "en":
-                instruction = "Translate this to English:"
-            else:  # my
-                instruction = "Translate this to Myanmar (Burmese) language:"
-            
-            prompt = f"{instruction}\n\n{text}\n\nOnly provide the translation, no explanations."
-            
-            response = self.client.chat.completions.create(
-                extra_headers={
-                    "HTTP-Referer": "http://localhost:8501",
-                    "X-Title": "Translation Chat App"
-                },
-                model=self.model,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ],
+            prompt = prompts.render(f"translate.{target_lang}", text=text)
+            response = yield dict(
+                feature="translate",
+                messages=[{"role": "user", "content": prompt.text}],
                 max_tokens=1000,
-                temperature=0.3
+                temperature=0.3,
+                title="Translation Chat App",
+                target=target_lang,
+                **prompt.tags,
             )
-            
-            translated_text = response.choices[0].message.content.strip()
-            return translated_text
+            return Translation(response.text)
             
         except Exception as e:
-            self.last_error = str(e)
-            # Return a more user-friendly error message
-            if "401" in str(e):
-                return "Translation error: Invalid API key"
-            elif "402" in str(e):
-                return "Translation error: Insufficient credits"
-            elif "429" in str(e):
-                return "Translation error: Rate limit exceeded"
-            else:
-                return f"Translation error: {str(e)[:100]}"
+            return Translation(self._translation_error(e), error=str(e))
+
+    @staticmethod
+    def _translation_error(e: Exception) -> str:
+        """A user-friendly message to show in place of the translation."""
+        if "401" in str(e):
+            return "Translation error: Invalid API key"
+        elif "402" in str(e):
+            return "Translation error: Insufficient credits"
+        elif "429" in str(e):
+            return "Translation error: Rate limit exceeded"
+        else:
+            return f"Translation error: {str(e)[:100]}"
+
+
+# ==========================================
+# ASYNC VARIANT
+# ==========================================
+
+class AsyncLLMHelper(LLMHelper):
+    """
+    LLMHelper on an AsyncOpenAI client.
+
+    `complete`, the math generation and translation methods are
+    coroutines, so independent calls can run concurrently on one event loop
+    (from Streamlit, via `async_bridge.run_async`). Everything but the calls
+    themselves (prompts, parsing, verification, fallbacks) is shared with
+    LLMHelper through its step generators.
+    """
+
+    def _make_client(self, api_key: str, base_url: str):
+        from openai import AsyncOpenAI
+
+        return AsyncOpenAI(base_url=base_url, api_key=api_key, max_retries=0)
+
+    async def complete(self, feature: str, messages: List[Dict[str, str]], max_tokens: int, temperature: float,
+                       title: str = "Math Practice App", **tags) -> "llm_telemetry.CompletionResult":
+        """Async `LLMHelper.complete`."""
+        return await llm_telemetry.complete_async(
+            self.client,
+            feature=feature,
+            model=self.model,
+            messages=messages,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            extra_headers={"HTTP-Referer": "http://localhost:8501", "X-Title": title},
+            tags=tags,
+        )
+
+    async def _run_steps(self, steps: Steps):
+        """Async `LLMHelper._run_steps`: the same generators, with each request awaited."""
+        try:
+            request = next(steps)
+            while True:
+                try:
+                    response = await self.complete(**request)
+                except Exception as e:
+                    request = steps.throw(e)
+                else:
+                    request = steps.send(response)
+        except StopIteration as done:
+            return done.value
+
+    async def generate_math_questions(self, level: str, count: int = 10, style: str = "Balanced (Mixed)",
+                                      fast: bool = True,
+                                      topic_mix: Optional[Dict[str, int]] = None) -> List[Tuple[str, float]]:
+        """Async `LLMHelper.generate_math_questions`."""
+        result = await self.generate_math_question_set(level, count, style=style, fast=fast, topic_mix=topic_mix)
+        return result.questions
+
+    async def generate_math_question_set(self, level: str, count: int = 10, style: str = "Balanced (Mixed)",
+                                         fast: bool = True,
+                                         topic_mix: Optional[Dict[str, int]] = None) -> MathQuestionSet:
+        """Async `LLMHelper.generate_math_question_set`."""
+        return await self._run_steps(self._math_question_steps(self._check_level(level), count, style, fast, topic_mix))
+
+    async def translate_to_english(self, text: str) -> str:
+        return (await self.translate(text, "en")).text
+
+    async def translate_to_myanmar(self, text: str) -> str:
+        return (await self.translate(text, "my")).text
+
+    async def translate(self, text: str, target_lang: str) -> Translation:
+        """Async `LLMHelper.translate`."""
+        return await self._run_steps(self._translation_steps(text, target_lang))
 
 
 # ==========================================
@@ -388,3 +452,8 @@ def get_llm_helper(api_key: Optional[str] = None) -> LLMHelper:
         LLMHelper instance
     """
     return LLMHelper(api_key)
+
+
+def get_async_llm_helper(api_key: Optional[str] = None) -> AsyncLLMHelper:
+    """Factory for the AsyncOpenAI-backed helper (see async_bridge for calling it from Streamlit)."""
+    return AsyncLLMHelper(api_key)
@@ -0,0 +1,305 @@
+"""
+LLM Telemetry Module
+Instrumented chat completions and the Admin page that summarizes them.
+
+Every completion in the app goes through `complete()` (usually via
+`LLMHelper.complete`) or `complete_async()` (via `AsyncLLMHelper`). It
+streams the response so time-to-first-token can be measured, retries
+transient failures itself (the OpenAI clients are created with
+`max_retries=0` so retries are visible here), and records one event per
+call:
+
+    feature, model, ok, error_type, retries, ttft_ms, latency_ms,
+    prompt_tokens, completion_tokens, cached_tokens, cost, finish_reason
+
+Events are kept in an in-memory ring buffer and appended to
+`llm_metrics.jsonl`, so the Admin page can show p50/p95 per feature across
+restarts, are exported as Prometheus metrics via app_metrics, and train
+the learned max_tokens limits in token_budget.
+"""
+
+import os
+import json
+import asyncio
+import math
+import time
+import random
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Deque, Dict, List, Optional
+
+import app_metrics
+import render_profiler
+import token_budget
+
+METRICS_FILE = os.environ.get("LLM_METRICS_FILE", "llm_metrics.jsonl")
+MAX_METRICS_BYTES = 5 * 1024 * 1024  # rotate to METRICS_FILE + ".1" beyond this
+RING_SIZE = 500
+MAX_RETRIES = 2
+BACKOFF_SECONDS = 1.0
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+RETRYABLE_ERRORS = {"APIConnectionError", "APITimeoutError"}
+
+_lock = threading.Lock()
+_ring: Deque[dict] = deque(maxlen=RING_SIZE)
+
+
+@dataclass
+class CompletionResult:
+    """Text and metadata of one completion."""
+    text: str
+    finish_reason: Optional[str] = None
+    model: Optional[str] = None
+    usage: Dict[str, Optional[float]] = field(default_factory=dict)
+
+
+# ------------------- Recording -------------------
+
+
+def _is_retryable(error: Exception) -> bool:
+    return getattr(error, "status_code", None) in RETRYABLE_STATUS or type(error).__name__ in RETRYABLE_ERRORS
+
+
+def record(event: dict) -> None:
+    """Add an event to the ring buffer and the metrics file."""
+    event.setdefault("at", datetime.now().isoformat(timespec="seconds"))
+    with _lock:
+        _ring.append(event)
+        try:
+            if os.path.exists(METRICS_FILE) and os.path.getsize(METRICS_FILE) > MAX_METRICS_BYTES:
+                os.replace(METRICS_FILE, METRICS_FILE + ".1")
+            with open(METRICS_FILE, "a") as f:
+                f.write(json.dumps(event, ensure_ascii=False) + "\n")
+        except OSError:
+            pass  # telemetry must never break a page
+    app_metrics.observe_llm_event(event)
+    token_budget.observe(event)
+
+
+def _usage_fields(usage) -> Dict[str, Optional[float]]:
+    if usage is None:
+        return {}
+    details = getattr(usage, "prompt_tokens_details", None)
+    return {
+        "prompt_tokens": getattr(usage, "prompt_tokens", None),
+        "completion_tokens": getattr(usage, "completion_tokens", None),
+        "cached_tokens": getattr(details, "cached_tokens", None) if details else None,
+        "cost": getattr(usage, "cost", None),  # OpenRouter extension
+    }
+
+
+class _StreamCollector:
+    """Accumulates streamed chunks into a CompletionResult, noting when the first token arrived."""
+
+    def __init__(self, started: float, timing: dict):
+        self.started, self.timing = started, timing
+        self.parts: List[str] = []
+        self.finish_reason = self.model = self.usage = None
+
+    def add(self, chunk) -> None:
+        self.model = getattr(chunk, "model", None) or self.model
+        if getattr(chunk, "usage", None):
+            self.usage = chunk.usage
+        for choice in chunk.choices or []:
+            content = getattr(choice.delta, "content", None)
+            if content:
+                if "ttft_ms" not in self.timing:
+                    self.timing["ttft_ms"] = (time.perf_counter() - self.started) * 1000
+                self.parts.append(content)
+            if choice.finish_reason:
+                self.finish_reason = choice.finish_reason
+
+    def result(self) -> CompletionResult:
+        return CompletionResult("".join(self.parts).strip(), self.finish_reason, self.model, _usage_fields(self.usage))
+
+
+def _request_kwargs(model: str, messages: List[dict], max_tokens: int, temperature: float,
+                    extra_headers: Optional[dict]) -> dict:
+    return dict(extra_headers=extra_headers, model=model, messages=messages, max_tokens=max_tokens,
+                temperature=temperature, stream=True, stream_options={"include_usage": True})
+
+
+def _stream_once(client, request: dict, started: float, timing: dict) -> CompletionResult:
+    collector = _StreamCollector(started, timing)
+    for chunk in client.chat.completions.create(**request):
+        collector.add(chunk)
+    return collector.result()
+
+
+async def _stream_once_async(client, request: dict, started: float, timing: dict) -> CompletionResult:
+    collector = _StreamCollector(started, timing)
+    async for chunk in await client.chat.completions.create(**request):
+        collector.add(chunk)
+    return collector.result()
+
+
+def _backoff_seconds(attempt: int) -> float:
+    return BACKOFF_SECONDS * (2 ** attempt) * (0.5 + random.random())
+
+
+def _succeeded(event: dict, result: CompletionResult, timing: dict) -> None:
+    event.update(ok=True, model=result.model or event["model"], finish_reason=result.finish_reason,
+                 ttft_ms=round(timing["ttft_ms"], 1) if "ttft_ms" in timing else None, **result.usage)
+
+
+def complete(client, *, feature: str, model: str, messages: List[dict], max_tokens: int,
+             temperature: float, extra_headers: Optional[dict] = None,
+             max_retries: int = MAX_RETRIES, tags: Optional[dict] = None) -> CompletionResult:
+    """
+    Run one chat completion with retries and record its telemetry.
+
+    Args:
+        client: OpenAI-compatible client (created with max_retries=0)
+        feature: Name the call is grouped under on the Admin page (e.g. "math_questions")
+        model, messages, max_tokens, temperature, extra_headers: Passed to the API
+        max_retries: Retries for rate limits, timeouts, connection and 5xx errors
+        tags: Extra fields stored with the event (e.g. {"level": "P3"})
+
+    Returns:
+        CompletionResult
+
+    Raises:
+        The last API error once retries are exhausted
+    """
+    started = time.perf_counter()
+    timing: dict = {}
+    event = {"feature": feature, "model": model, "max_tokens": max_tokens, "retries": 0, **(tags or {})}
+    request = _request_kwargs(model, messages, max_tokens, temperature, extra_headers)
+    try:
+        for attempt in range(max_retries + 1):
+            timing.clear()
+            try:
+                with render_profiler.span(f"llm.{feature}", model=model, attempt=attempt):
+                    result = _stream_once(client, request, time.perf_counter(), timing)
+                break
+            except Exception as e:
+                if attempt >= max_retries or not _is_retryable(e):
+                    raise
+                event["retries"] = attempt + 1
+                time.sleep(_backoff_seconds(attempt))
+        _succeeded(event, result, timing)
+        return result
+    except Exception as e:
+        event.update(ok=False, error_type=type(e).__name__, status=getattr(e, "status_code", None))
+        raise
+    finally:
+        event["latency_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        record(event)
+
+
+async def complete_async(client, *, feature: str, model: str, messages: List[dict], max_tokens: int,
+                         temperature: float, extra_headers: Optional[dict] = None,
+                         max_retries: int = MAX_RETRIES, tags: Optional[dict] = None) -> CompletionResult:
+    """`complete()` for an AsyncOpenAI client; a cancelled call is recorded as error "CancelledError"."""
+    started = time.perf_counter()
+    timing: dict = {}
+    event = {"feature": feature, "model": model, "max_tokens": max_tokens, "retries": 0, **(tags or {})}
+    request = _request_kwargs(model, messages, max_tokens, temperature, extra_headers)
+    try:
+        for attempt in range(max_retries + 1):
+            timing.clear()
+            try:
+                result = await _stream_once_async(client, request, time.perf_counter(), timing)
+                break
+            except Exception as e:
+                if attempt >= max_retries or not _is_retryable(e):
+                    raise
+                event["retries"] = attempt + 1
+                await asyncio.sleep(_backoff_seconds(attempt))
+        _succeeded(event, result, timing)
+        return result
+    except (Exception, asyncio.CancelledError) as e:
+        event.update(ok=False, error_type=type(e).__name__, status=getattr(e, "status_code", None))
+        raise
+    finally:
+        event["latency_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        record(event)
+
+
+# ------------------- Reporting -------------------
+
+
+def recent_events(limit: Optional[int] = None) -> List[dict]:
+    """Events recorded by this process, oldest first."""
+    with _lock:
+        events = list(_ring)
+    return events[-limit:] if limit else events
+
+
+def load_events(limit: int = 5000) -> List[dict]:
+    """The last `limit` events from the metrics file (all processes and restarts)."""
+    try:
+        with open(METRICS_FILE, "r") as f:
+            lines = deque(f, maxlen=limit)
+    except OSError:
+        return recent_events()
+    events = []
+    for line in lines:
+        try:
+            events.append(json.loads(line))
+        except ValueError:
+            continue
+    return events
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile (q in 0..100) of the non-None values."""
+    values = sorted(v for v in values if v is not None)
+    if not values:
+        return None
+    return values[max(0, math.ceil(q / 100 * len(values)) - 1)]
+
+
+def summarize(events: List[dict]) -> List[dict]:
+    """One row per feature: call counts, error rate, latency/TTFT percentiles and token totals."""
+    by_feature: Dict[str, List[dict]] = {}
+    for event in events:
+        by_feature.setdefault(event.get("feature", "unknown"), []).append(event)
+
+    rows = []
+    for feature, group in sorted(by_feature.items()):
+        ok = [e for e in group if e.get("ok")]
+        latency = [e.get("latency_ms") for e in ok]
+        ttft = [e.get("ttft_ms") for e in ok]
+        rows.append({
+            "feature": feature,
+            "calls": len(group),
+            "errors": len(group) - len(ok),
+            "retries": sum(e.get("retries", 0) for e in group),
+            "p50 ms": percentile(latency, 50),
+            "p95 ms": percentile(latency, 95),
+            "p50 TTFT ms": percentile(ttft, 50),
+            "p95 TTFT ms": percentile(ttft, 95),
+            "prompt tokens": sum(e.get("prompt_tokens") or 0 for e in ok),
+            "completion tokens": sum(e.get("completion_tokens") or 0 for e in ok),
+            "truncated": sum(1 for e in ok if e.get("finish_reason") == "length"),
+        })
+    return rows
+
+
+def render_admin_page() -> None:
+    """Admin page: per-feature LLM latency and token usage."""
+    import streamlit as st
+
+    st.title("🛠️ Admin: LLM Telemetry")
+    source = st.radio("Events", ["Metrics file (all runs)", "This process only"], horizontal=True)
+    events = load_events() if source.startswith("Metrics") else recent_events()
+    if not events:
+        st.info("No LLM calls recorded yet.")
+        return
+
+    st.caption(f"{len(events)} calls since {events[0].get('at', '?').replace('T', ' ')}")
+    st.dataframe(summarize(events))
+
+    errors = [e for e in events if not e.get("ok")]
+    if errors:
+        st.subheader("Recent errors")
+        st.dataframe([{k: e.get(k) for k in ("at", "feature", "error_type", "status", "retries", "latency_ms")}
+                      for e in errors[-20:]])
+
+    budgets = token_budget.summary()
+    if budgets:
+        st.subheader("Learned token budgets")
+        st.dataframe(budgets)
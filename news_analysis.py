@@ -2,6 +2,18 @@ import streamlit as st
 import os
 import json
 from llm_helper import get_llm_helper
+import news_ingest
+import prompts
+import session_memory
+import token_budget
+
+def fetch_trending_text(llm) -> str:
+    """Ask the LLM for the trending news list and return the raw response text."""
+    prompt = prompts.render("news_trending")
+    response = llm.complete("news_trending", [{"role": "user", "content": prompt.text}],
+                            max_tokens=token_budget.max_tokens("news_trending"), temperature=0.3,
+                            title="News Analysis", **prompt.tags)
+    return response.text
 
 
 def parse_news_items(news_text):
@@ -52,43 +64,33 @@ def main():
     with tab1:
         st.subheader("🔥 Top 10 Most Popular News/Articles/Videos (Last 7 Days)")
         
+        # Load the latest precomputed snapshot (written by news_ingest)
+        snapshot = news_ingest.load_latest_snapshot()
+        if snapshot and st.session_state.get("news_snapshot_at") != snapshot["fetched_at"]:
+            # Items are shared by every session showing this snapshot (raw text stays in the snapshot)
+            st.session_state.news_items = session_memory.intern_entries(snapshot["items"])
+            st.session_state.news_snapshot_at = snapshot["fetched_at"]
+            st.session_state.selected_news_ids = {}
+
+        if snapshot:
+            st.caption(f"🕒 更新時間: {snapshot['fetched_at'].replace('T', ' ')}")
+
         if st.button('📰 Fetch Top 10 Trending Items', key='fetch_trending'):
             with st.spinner('Fetching trending items...'):
                 try:
                     api_key = os.environ.get('OPENROUTER_API_KEY') or os.environ.get('DEEPSEEK_API_KEY')
                     llm = get_llm_helper(api_key)
-                    
-                    prompt = """你是一位掌握最新熱點新聞、社交媒體趨勢與網路輿論的專家助理。
-請根據過去7天（包括今天）的全球與中文媒體、社交媒體趨勢，列出大約10個最受關注與最熱門的新聞/文章/影片/話題。
-
-對每一項請提供以下信息（用標準化格式，每項之間用---分隔）：
 
-1. **標題**: [新聞/文章/影片標題]
-2. **媒體/來源**: [媒體名稱或社交平台]
-3. **熱度指數**: [1-10 分，代表受關注程度]
-4. **簡介**: [2-3句的簡短摘要，說明發生什麼事]
-5. **涉及公司/個人/組織**: [列出相關的主要方]
+                    # Run the ingestion pipeline so the snapshot is shared with other users
+                    snapshot = news_ingest.run_ingestion(llm)
+                    if not snapshot:
+                        raise ValueError("LLM response contained no news items")
 
----"""
-                    
-                    response = llm.client.chat.completions.create(
-                        extra_headers={"HTTP-Referer": "http://localhost:8501", "X-Title": "News Analysis"},
-                        model=llm.model,
-                        messages=[{"role": "user", "content": prompt}],
-                        max_tokens=2000,
-                        temperature=0.3,
-                    )
-                    
-                    trending_text = response.choices[0].message.content.strip()
-                    
-                    # Parse into structured items
-                    news_items = parse_news_items(trending_text)
-                    
                     # Store in session state for later use
-                    st.session_state.trending_news = trending_text
-                    st.session_state.news_items = news_items
+                    st.session_state.news_items = session_memory.intern_entries(snapshot["items"])
+                    st.session_state.news_snapshot_at = snapshot["fetched_at"]
                     st.session_state.selected_news_ids = {}
-                    
+
                 except Exception as e:
                     st.error(f'獲取熱門話題失敗：{e}')
         
@@ -120,7 +122,8 @@ def main():
                     source = item.get('source', 'Unknown')
                     heat = item.get('heat', 'N/A')
                     
-                    st.markdown(f"**[🔗 {title}]({url})**")
+                    new_badge = "🆕 " if item.get('is_new') else ""
+                    st.markdown(f"**{new_badge}[🔗 {title}]({url})**")
                     st.caption(f"📰 {source} | 🔥 {heat}")
                     st.write(item.get('description', ''))
                     st.write(f"**相關方**: {item.get('companies', '無')}")
@@ -146,41 +149,15 @@ def main():
                             api_key = os.environ.get('OPENROUTER_API_KEY') or os.environ.get('DEEPSEEK_API_KEY')
                             llm = get_llm_helper(api_key)
                             
-                            prompt = f"""你是一位資深的金融分析專家，擅長評估新聞事件對各類金融產品的潛在影響。
-
-請根據以下 {len(selected_items)} 個新聞內容分析對金融市場的影響：
-
-【新聞內容】
-{selected_news_text}
-
-請從以下角度進行分析：
-
-1. **對列舉公司股價的潛在影響**:
-   - 直接受益或受害的公司（列出2-5家）
-   - 對每家公司的影響評估（正面/中性/負面）
-   - 簡短說明原因（1-2句）
-
-2. **對主要金融產品的影響**:
-   - 貴金屬（黃金/白銀）: 影響評估 + 原因
-   - 主要指數（恆生指數/滬深300/納斯達克等）: 影響評估 + 原因
-   - 能源商品（石油/天然氣）: 影響評估 + 原因
-   - 匯率走勢: 影響評估 + 原因
-
-3. **風險評估**:
-   - 事件發展的幾種可能情境及其金融影響
-   - 關鍵監控指標（3-5項）
-
-用清晰的中文回覆，保持簡潔（總共不超過 1000 字）。"""
+                            prompt = prompts.render("news_impact", count=len(selected_items),
+                                                    news_text=selected_news_text)
                             
-                            response = llm.client.chat.completions.create(
-                                extra_headers={"HTTP-Referer": "http://localhost:8501", "X-Title": "Financial Impact Analysis"},
-                                model=llm.model,
-                                messages=[{"role": "user", "content": prompt}],
-                                max_tokens=1500,
-                                temperature=0.2,
-                            )
+                            response = llm.complete("news_impact", [{"role": "user", "content": prompt.text}],
+                                                    max_tokens=token_budget.max_tokens("news_impact"),
+                                                    temperature=0.2, title="Financial Impact Analysis",
+                                                    count=len(selected_items), **prompt.tags)
                             
-                            impact_analysis = response.choices[0].message.content.strip()
+                            impact_analysis = response.text
                             
                             st.markdown("---")
                             st.markdown("### 💰 財經影響分析結果")
@@ -207,25 +184,14 @@ def main():
                     api_key = os.environ.get('OPENROUTER_API_KEY') or os.environ.get('DEEPSEEK_API_KEY')
                     llm = get_llm_helper(api_key)
 
-                    prompt = f"""你是一位能閱讀最新熱點、擅長中文評論與財經風險分析的助理。
-請根據以下關鍵字或連結: "{query}" ，列出大約 {top_n} 個最相關的熱門文章/影片/直播標題（假設目前網路熱度高），
-對每一條給出：
-1) 中文摘要（簡短2-3句）
-2) 涉及的公司或組織（以短句列出）
-3) 對相關公司股價或金融產品的潛在影響評估（簡短：正面/中性/負面，並說明原因）
-4) 若要追蹤此事件，建議監控哪些關鍵詞或指標（最多3項）
-
-請用中文回覆，條列清晰，保持簡潔（每項不超過 5 行）。"""
-
-                    response = llm.client.chat.completions.create(
-                        extra_headers={"HTTP-Referer": "http://localhost:8501", "X-Title": "News Analysis"},
-                        model=llm.model,
-                        messages=[{"role": "user", "content": prompt}],
-                        max_tokens=1000,
-                        temperature=0.2,
-                    )
+                    prompt = prompts.render("news_custom", query=query, top_n=top_n)
+
+                    response = llm.complete("news_custom", [{"role": "user", "content": prompt.text}],
+                                            max_tokens=token_budget.max_tokens("news_custom", top_n),
+                                            temperature=0.2, title="News Analysis", top_n=top_n,
+                                            **prompt.tags)
 
-                    text = response.choices[0].message.content.strip()
+                    text = response.text
                     st.markdown('---')
                     st.subheader('📊 分析結果（中文）')
                     st.markdown(text)
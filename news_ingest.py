@@ -0,0 +1,270 @@
+"""
+News Ingestion Module
+Background pipeline that pre-fetches the trending news list on an interval,
+so the News Analysis page can render from a local snapshot instead of
+waiting on the LLM.
+
+Each run:
+  - sends the trending prompt and parses it with `parse_news_items`
+  - de-duplicates items by normalized title (within the run and against
+    titles seen in previous runs)
+  - writes a JSON snapshot to SNAPSHOT_DIR (skipped if nothing changed)
+
+Snapshots record the version of the trending prompt that produced them;
+after the prompt changes, the next run (and the scheduler's first run)
+replaces the snapshot even if the stories are the same.
+
+Run once from the command line (e.g. from cron):
+    python news_ingest.py --once
+"""
+
+import os
+import re
+import json
+import threading
+import unicodedata
+from datetime import datetime
+from typing import Optional, List, Dict
+
+import prompts
+
+SNAPSHOT_DIR = "news_snapshots"
+INDEX_FILE = os.path.join(SNAPSHOT_DIR, "index.json")
+INGEST_INTERVAL_SECONDS = int(os.environ.get("NEWS_INGEST_INTERVAL", 3 * 60 * 60))
+MAX_SNAPSHOTS = 48
+MAX_SEEN_TITLES = 2000
+
+_TITLE_STRIP_RE = re.compile(r"[\W_]+", re.UNICODE)
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+_snapshot_cache: Dict[str, object] = {"path": None, "mtime": None, "data": None}
+
+
+# ------------------- Helpers -------------------
+
+
+def normalize_title(title: str) -> str:
+    """Normalize a news title for de-duplication (width, case, punctuation, spacing)."""
+    title = unicodedata.normalize("NFKC", title or "").lower()
+    title = title.strip().lstrip(":：").strip()
+    return _TITLE_STRIP_RE.sub("", title)
+
+
+def _load_index() -> dict:
+    if os.path.exists(INDEX_FILE):
+        try:
+            with open(INDEX_FILE, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (json.JSONDecodeError, ValueError):
+            pass
+    return {"latest": None, "fetched_at": None, "seen": {}}
+
+
+def _write_json_atomic(path: str, data) -> None:
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+def _prompt_version() -> str:
+    return prompts.get("news_trending").version
+
+
+def _prune_snapshots(keep: int = MAX_SNAPSHOTS) -> None:
+    names = sorted(n for n in os.listdir(SNAPSHOT_DIR) if n.startswith("snapshot_") and n.endswith(".json"))
+    for name in names[:-keep]:
+        try:
+            os.remove(os.path.join(SNAPSHOT_DIR, name))
+        except OSError:
+            pass
+
+
+def dedupe_items(items: List[Dict], seen: Dict[str, str], now: str) -> List[Dict]:
+    """
+    Drop duplicate titles within a run and annotate items seen in earlier runs.
+
+    Args:
+        items: Parsed news items (as returned by `parse_news_items`)
+        seen: Mapping of normalized title -> first-seen timestamp; updated in place
+        now: ISO timestamp of this run
+
+    Returns:
+        De-duplicated items with `first_seen` and `is_new` fields, re-numbered from 1
+    """
+    unique = []
+    run_keys = set()
+    for item in items:
+        key = normalize_title(item.get("title", ""))
+        if not key or key in run_keys:
+            continue
+        run_keys.add(key)
+        item = dict(item)
+        item["is_new"] = key not in seen
+        item["first_seen"] = seen.setdefault(key, now)
+        unique.append(item)
+
+    for i, item in enumerate(unique, start=1):
+        item["id"] = i
+    return unique
+
+
+# ------------------- Pipeline -------------------
+
+
+def run_ingestion(llm=None) -> Optional[dict]:
+    """
+    Fetch, parse and store one trending snapshot.
+
+    Args:
+        llm: Optional LLMHelper instance. If None, one is created from the environment.
+
+    Returns:
+        The latest snapshot dict, or None if no items could be parsed.
+    """
+    from news_analysis import fetch_trending_text, parse_news_items
+
+    if llm is None:
+        from llm_helper import get_llm_helper
+        llm = get_llm_helper()
+
+    trending_text = fetch_trending_text(llm)
+    now = datetime.now().isoformat(timespec="seconds")
+
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    index = _load_index()
+    seen = index.get("seen", {})
+    items = dedupe_items(parse_news_items(trending_text), seen, now)
+    if not items:
+        return None
+
+    # Skip writing a new snapshot if the set of stories (and the prompt) is unchanged
+    latest = load_latest_snapshot()
+    latest_keys = {normalize_title(i.get("title", "")) for i in latest["items"]} if latest else None
+    if latest_keys != {normalize_title(i["title"]) for i in items} or not _snapshot_is_current(latest):
+        snapshot = {"fetched_at": now, "prompt_version": _prompt_version(),
+                    "raw_text": trending_text, "items": items}
+        filename = f"snapshot_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        _write_json_atomic(os.path.join(SNAPSHOT_DIR, filename), snapshot)
+        index["latest"] = filename
+        _prune_snapshots()
+
+    # Keep the most recently seen titles only, so the index stays small
+    if len(seen) > MAX_SEEN_TITLES:
+        seen = dict(sorted(seen.items(), key=lambda kv: kv[1])[-MAX_SEEN_TITLES:])
+    index["seen"] = seen
+    index["fetched_at"] = now
+    _write_json_atomic(INDEX_FILE, index)
+
+    return load_latest_snapshot()
+
+
+def load_latest_snapshot() -> Optional[dict]:
+    """Load the latest snapshot from disk (cached until the file changes)."""
+    index = _load_index()
+    if not index.get("latest"):
+        return None
+
+    path = os.path.join(SNAPSHOT_DIR, index["latest"])
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+
+    if _snapshot_cache["path"] != path or _snapshot_cache["mtime"] != mtime:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, ValueError, OSError):
+            return None
+        _snapshot_cache.update(path=path, mtime=mtime, data=data)
+
+    data = dict(_snapshot_cache["data"])
+    data["checked_at"] = index.get("fetched_at") or data.get("fetched_at")
+    return data
+
+
+def _snapshot_is_current(snapshot: Optional[dict]) -> bool:
+    """Whether the snapshot was produced by the current trending prompt."""
+    return bool(snapshot) and snapshot.get("prompt_version") == _prompt_version()
+
+
+def _snapshot_age_seconds() -> Optional[float]:
+    fetched_at = _load_index().get("fetched_at")
+    if not fetched_at:
+        return None
+    return (datetime.now() - datetime.fromisoformat(fetched_at)).total_seconds()
+
+
+# ------------------- Scheduler -------------------
+
+
+class NewsIngestScheduler:
+    """Daemon thread that runs `run_ingestion` every `interval` seconds."""
+
+    def __init__(self, interval: int = INGEST_INTERVAL_SECONDS, api_key: Optional[str] = None):
+        self.interval = interval
+        self.api_key = api_key
+        self.last_error: Optional[str] = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="news-ingest", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _run(self) -> None:
+        # Wait out the remaining interval if a fresh snapshot from the current prompt exists
+        age = _snapshot_age_seconds()
+        if age is None or not _snapshot_is_current(load_latest_snapshot()):
+            delay = 0
+        else:
+            delay = max(0, self.interval - age)
+        while not self._stop.wait(delay):
+            try:
+                from llm_helper import get_llm_helper
+                run_ingestion(get_llm_helper(self.api_key))
+                self.last_error = None
+            except Exception as e:
+                self.last_error = str(e)
+            delay = self.interval
+
+
+def start_scheduler(api_key: Optional[str] = None) -> Optional[NewsIngestScheduler]:
+    """
+    Start the process-wide ingestion scheduler (no-op if already running).
+
+    Returns:
+        The scheduler, or None if no API key is configured.
+    """
+    global _scheduler
+    api_key = api_key or os.environ.get("OPENROUTER_API_KEY") or os.environ.get("DEEPSEEK_API_KEY")
+    if not api_key:
+        return None
+
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = NewsIngestScheduler(api_key=api_key)
+            _scheduler.start()
+    return _scheduler
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Pre-fetch trending news snapshots.")
+    parser.add_argument("--once", action="store_true", help="Run a single ingestion and exit")
+    parser.add_argument("--interval", type=int, default=INGEST_INTERVAL_SECONDS, help="Seconds between runs")
+    args = parser.parse_args()
+
+    if args.once:
+        snapshot = run_ingestion()
+        print(f"Stored {len(snapshot['items']) if snapshot else 0} items")
+    else:
+        NewsIngestScheduler(interval=args.interval).start()
+        while True:
+            time.sleep(3600)
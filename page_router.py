@@ -0,0 +1,151 @@
+"""
+Page Router Module
+Declarative page and profile registry for `streamlit_app.py`.
+
+Pages map a name to a module entry point (loaded lazily via `lazy_loader`),
+optional keyword arguments, the profiles allowed to use them, and the pages
+a visitor is likely to open next. Profiles map a Home button to a page. To
+add a profile or page, add an entry here; the dispatch code does not change.
+"""
+
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+import app_metrics
+import lazy_loader
+
+
+@dataclass(frozen=True)
+class PageSpec:
+    """A routable page."""
+    name: str
+    module: str
+    entry: str = "main"
+    kwargs: Dict[str, object] = field(default_factory=dict)
+    allowed_users: Optional[Tuple[str, ...]] = None  # None = any profile
+    warmup: Optional[Callable[[], None]] = None  # pre-loads expensive resources
+    next_pages: Tuple[str, ...] = ()  # likely next pages, warmed in the background
+    show_exception: bool = False  # show the full traceback on errors
+
+
+@dataclass(frozen=True)
+class ProfileSpec:
+    """A profile button on the Home page."""
+    label: str
+    name: str
+    page: str
+
+
+# ------------------- Warm-up Hooks -------------------
+
+
+def _warm_modules(*names: str) -> Callable[[], None]:
+    def warm():
+        for name in names:
+            lazy_loader.load(name)
+    return warm
+
+
+# Page modules plus `openai`, which every LLM-backed page needs on first request
+_warm_math = _warm_modules("primary_math", "openai")
+_warm_chat = _warm_modules("translate_chat", "openai")
+_warm_news = _warm_modules("news_analysis", "openai")
+
+_KIDS_PAGES = ("Ella", "Meimei", "Lucas")
+
+# ------------------- Registry -------------------
+
+PAGES: Dict[str, PageSpec] = {spec.name: spec for spec in [
+    PageSpec("Home", "page_router", entry="render_home",
+             next_pages=_KIDS_PAGES + ("Translate Chat",)),
+    PageSpec("Ella", "primary_math", entry="show", kwargs={"user": "ella"},
+             allowed_users=("Ella",), warmup=_warm_math),
+    PageSpec("Meimei", "primary_math", entry="show", kwargs={"user": "meimei"},
+             allowed_users=("Meimei",), warmup=_warm_math),
+    PageSpec("Lucas", "primary_math", entry="show", kwargs={"user": "lucas"},
+             allowed_users=("Lucas",), warmup=_warm_math),
+    PageSpec("Translate Chat", "translate_chat", allowed_users=("David", "Mika", "Wai Wai"),
+             warmup=_warm_chat, show_exception=True),
+    PageSpec("News Analysis", "news_analysis", warmup=_warm_news, show_exception=True),
+    PageSpec("Admin", "llm_telemetry", entry="render_admin_page", show_exception=True),
+]}
+
+PROFILES: List[ProfileSpec] = [
+    ProfileSpec("👧 Ella", "Ella", "Ella"),
+    ProfileSpec("🧒 Meimei", "Meimei", "Meimei"),
+    ProfileSpec("🧑‍🎓 Lucas", "Lucas", "Lucas"),
+    ProfileSpec("🕵️ David", "David", "Translate Chat"),
+    ProfileSpec("🎧 Mika", "Mika", "Translate Chat"),
+    ProfileSpec("🎨 Wai Wai", "Wai Wai", "Translate Chat"),
+]
+
+PROFILES_PER_ROW = 3
+PROFILE_NAMES = {profile.name for profile in PROFILES}
+
+_warmed = set()
+_warm_lock = threading.Lock()
+
+
+# ------------------- Routing -------------------
+
+
+def prewarm(page_names) -> None:
+    """Run warm-up hooks for pages in a background thread (once per page per process)."""
+    with _warm_lock:
+        hooks = [PAGES[n].warmup for n in page_names
+                 if n in PAGES and PAGES[n].warmup and n not in _warmed]
+        _warmed.update(page_names)
+    if not hooks:
+        return
+
+    def run():
+        for hook in hooks:
+            try:
+                hook()
+            except Exception:
+                pass  # warm-up is best effort; the page reports real errors
+
+    threading.Thread(target=run, name="page-prewarm", daemon=True).start()
+
+
+def render_home() -> None:
+    """Home page: profile buttons, laid out PROFILES_PER_ROW per row."""
+    import streamlit as st
+
+    st.title("Welcome")
+    st.write("Choose a profile to continue:")
+
+    for start in range(0, len(PROFILES), PROFILES_PER_ROW):
+        row = PROFILES[start:start + PROFILES_PER_ROW]
+        for col, profile in zip(st.columns(PROFILES_PER_ROW), row):
+            with col:
+                if st.button(profile.label):
+                    st.session_state.current_user = profile.name
+                    st.session_state.page = profile.page
+                    st.rerun()
+
+
+def route(page: str) -> None:
+    """Render the registered page (O(1) lookup) while warming likely next pages in the background."""
+    import streamlit as st
+
+    spec = PAGES.get(page, PAGES["Home"])
+    app_metrics.PAGE_RERUNS.labels(page=spec.name).inc()
+    # Only enforce for users who picked a profile (sidebar visitors can see every page)
+    current_user = st.session_state.get("current_user")
+    if spec.allowed_users and current_user in PROFILE_NAMES and current_user not in spec.allowed_users:
+        st.warning(f"The {spec.name} page is not available for {current_user}.")
+        if st.button("🔄 Switch profile"):
+            st.session_state.pop("current_user", None)
+            st.session_state.page = "Home"
+            st.rerun()
+        return
+
+    prewarm(spec.next_pages)
+    try:
+        getattr(lazy_loader.load(spec.module), spec.entry)(**spec.kwargs)
+    except Exception as e:
+        st.error(f"Failed to load {spec.name} page: {e}")
+        if spec.show_exception:
+            st.exception(e)
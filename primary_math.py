@@ -9,9 +9,13 @@ import os
 import json
 from datetime import datetime
 from llm_helper import get_llm_helper
-from snake_game import snake_game
-from parkour_game import parkour_game
-from flappy_game import flappy_game
+import adaptive
+import app_metrics
+import answer_check
+import lazy_loader
+import render_profiler
+import review_queue
+import session_memory
 
 LEVELS = ["P1", "P2", "P3", "P4", "P5", "P6", "PLSE"]
 LEVEL_DESCRIPTIONS = {
@@ -26,6 +30,13 @@ LEVEL_DESCRIPTIONS = {
 
 HISTORY_FILE = "history.json"
 
+# Reward games (label -> module, function); only loaded after a perfect score
+GAMES = {
+    "🐍 Snake Game": ("snake_game", "snake_game"),
+    "🏃 Parkour": ("parkour_game", "parkour_game"),
+    "🐦 Flappy Bird": ("flappy_game", "flappy_game"),
+}
+
 
 # ------------------- Helpers -------------------
 
@@ -34,11 +45,13 @@ def get_llm_helper_instance():
     """Get or create LLM Helper instance."""
     if 'llm_helper' not in st.session_state:
         try:
-            import streamlit as st_inner
-            api_key = (
-                st_inner.secrets.get("OPENROUTER_API_KEY", None) if hasattr(st_inner, "secrets") else None
-            ) or os.environ.get("OPENROUTER_API_KEY") or os.environ.get("DEEPSEEK_API_KEY")
-            st.session_state.llm_helper = get_llm_helper(api_key)
+            try:
+                secret_key = st.secrets.get("OPENROUTER_API_KEY", None)
+            except Exception:  # no secrets.toml: use the environment
+                secret_key = None
+            api_key = secret_key or os.environ.get("OPENROUTER_API_KEY") or os.environ.get("DEEPSEEK_API_KEY")
+            # One helper (and HTTP client) per API key, shared by all sessions
+            st.session_state.llm_helper = session_memory.shared("llm_helper", api_key, lambda: get_llm_helper(api_key))
         except Exception as e:
             st.error(f"Failed to initialize LLM Helper: {e}")
             return None
@@ -49,7 +62,8 @@ def load_user_history(user: str):
     """Load history for a specific user."""
     if os.path.exists(HISTORY_FILE):
         try:
-            with open(HISTORY_FILE, "r") as f:
+            with render_profiler.span("history.load", user=user), \
+                    app_metrics.timer(app_metrics.HISTORY_SECONDS, op="read"), open(HISTORY_FILE, "r") as f:
                 all_history = json.load(f)
                 # Convert old format to new format if needed
                 if isinstance(all_history, dict) and not any(k.startswith(user) for k in all_history.keys()):
@@ -65,7 +79,7 @@ def load_user_history(user: str):
 def save_practice_result(user: str, level: str, results: list, score: int):
     """Save practice results to history."""
     try:
-        with open(HISTORY_FILE, "r") as f:
+        with app_metrics.timer(app_metrics.HISTORY_SECONDS, op="read"), open(HISTORY_FILE, "r") as f:
             all_history = json.load(f)
     except:
         all_history = {}
@@ -83,9 +97,14 @@ def save_practice_result(user: str, level: str, results: list, score: int):
         "results": results
     }
     
-    with open(HISTORY_FILE, "w") as f:
+    with render_profiler.span("history.save", user=user), \
+            app_metrics.timer(app_metrics.HISTORY_SECONDS, op="write"), open(HISTORY_FILE, "w") as f:
         json.dump(all_history, f, indent=2)
 
+    # Feed the results into the adaptive engine's topic ratings and the review queue
+    adaptive.record_session(user, level, results)
+    review_queue.record_results(user, level, results)
+
 
 def get_calendar_stats(user: str) -> dict:
     """Get practice stats for calendar display."""
@@ -127,6 +146,8 @@ def show(user: str = "ella"):
         st.session_state.primary_math_reward_unlocked = False
     if "primary_math_current_user" not in st.session_state:
         st.session_state.primary_math_current_user = user
+    if "primary_math_review_questions" not in st.session_state:
+        st.session_state.primary_math_review_questions = set()
 
     user_upper = user.upper()
 
@@ -136,7 +157,8 @@ def show(user: str = "ella"):
     # Calendar/History section
     st.sidebar.markdown("---")
     st.sidebar.subheader("📅 Practice History")
-    calendar_stats = get_calendar_stats(user)
+    with render_profiler.span("calendar_stats", user=user):
+        calendar_stats = get_calendar_stats(user)
     if calendar_stats:
         for date in sorted(calendar_stats.keys(), reverse=True)[:7]:  # Last 7 days
             stats = calendar_stats[date]
@@ -145,17 +167,26 @@ def show(user: str = "ella"):
     else:
         st.sidebar.write("No practice history yet")
 
+    suggested_level = adaptive.recommend_level(user)
+    weak_topics = adaptive.focus_topics(user, st.session_state.primary_math_level or suggested_level or "P1")
+    if weak_topics:
+        st.sidebar.subheader("🎯 Needs Practice")
+        st.sidebar.write(", ".join(t.replace("_", " ") for t in weak_topics))
+
     # ------------------- Main Content -------------------
     # Level selection moved to main page
     st.title(f"🧮 {user_upper}'s Math Practice")
 
     if st.session_state.primary_math_level is None:
         st.info("📚 Please select a level below to start practice")
-    # Present selectbox on main page
+    if suggested_level:
+        st.caption(f"🎯 Suggested level from your practice history: {suggested_level}")
+    # Present selectbox on main page (defaults to the suggested level)
+    default_level = st.session_state.primary_math_level or suggested_level
     selected_level = st.selectbox(
         "📚 Select Level:",
         LEVELS,
-        index=(LEVELS.index(st.session_state.primary_math_level) if st.session_state.primary_math_level in LEVELS else 0),
+        index=(LEVELS.index(default_level) if default_level in LEVELS else 0),
         format_func=lambda x: LEVEL_DESCRIPTIONS.get(x, x),
         key="level_select_main"
     )
@@ -185,13 +216,37 @@ def show(user: str = "ella"):
                 llm = get_llm_helper_instance()
                 if llm:
                     try:
-                        # Use faster generation settings when possible
-                        questions = llm.generate_math_questions(
-                            st.session_state.primary_math_level,
-                            count=int(count),
-                            style=question_style,
-                            fast=True,
+                        # Due review questions come from the local queue (no LLM call)
+                        reviews = review_queue.due_questions(
+                            user, st.session_state.primary_math_level, review_queue.review_limit(int(count))
                         )
+                        new_count = int(count) - len(reviews)
+
+                        # Bias the mix towards weak topics once there is practice history
+                        topic_mix = None
+                        if adaptive.get_user_mastery(user):
+                            topic_mix = adaptive.plan_session(user, st.session_state.primary_math_level, new_count)
+
+                        # Use faster generation settings when possible
+                        questions = []
+                        if new_count:
+                            question_set = llm.generate_math_question_set(
+                                st.session_state.primary_math_level,
+                                count=new_count,
+                                style=question_style,
+                                fast=True,
+                                topic_mix=topic_mix,
+                            )
+                            questions = question_set.questions
+                            if question_set.error:
+                                st.warning(f"The LLM request failed ({question_set.error[:100]}).")
+                            if question_set.rejected:
+                                st.caption(f"{len(question_set.rejected)} generated questions had wrong answers "
+                                           "and were replaced.")
+                            if question_set.local_count:
+                                st.info(f"{question_set.local_count} of the questions came from the built-in question bank.")
+                        questions = reviews + questions
+                        st.session_state.primary_math_review_questions = {q for q, _ in reviews}
                         st.session_state.primary_math_questions = questions
                         st.session_state.primary_math_answers = [""] * len(questions)
                     except Exception as e:
@@ -205,13 +260,15 @@ def show(user: str = "ella"):
             return
 
     # Display questions with better layout
-    st.subheader("📝 Solve these 10 questions:")
+    total = len(st.session_state.primary_math_questions)
+    st.subheader(f"📝 Solve these {total} questions:")
     st.write("Enter your answers below:")
     
     for i, (q, correct_ans) in enumerate(st.session_state.primary_math_questions):
         if not st.session_state.primary_math_completed:
             # Better layout for questions with larger text
-            st.write(f"### Q{i+1}: {q}")
+            review_mark = "🔁 " if q in st.session_state.primary_math_review_questions else ""
+            st.write(f"### Q{i+1}: {review_mark}{q}")
             st.session_state.primary_math_answers[i] = st.text_input(
                 "Answer:",
                 value=st.session_state.primary_math_answers[i],
@@ -231,28 +288,26 @@ def show(user: str = "ella"):
         for i, ((q, correct), user_ans) in enumerate(
             zip(st.session_state.primary_math_questions, st.session_state.primary_math_answers)
         ):
-            try:
-                ua = float(user_ans) if user_ans else None
-            except (ValueError, TypeError):
-                ua = None
+            parsed = answer_check.parse_answer(user_ans)
+            ua = answer_check.to_number(parsed) if parsed is not None else None
             
-            is_correct = (ua == correct)
-            symbol = "✅" if is_correct else f"❌ (Correct: {correct})"
-            st.write(f"**Q{i+1}**: {q} → {ua} {symbol}")
+            is_correct = answer_check.grade(user_ans, correct)
+            symbol = "✅" if is_correct else f"❌ (Correct: {answer_check.format_answer(correct)})"
+            st.write(f"**Q{i+1}**: {q} → {user_ans.strip() if user_ans else None} {symbol}")
             
             if is_correct:
                 score += 1
             
-            results.append({"q": q, "ans": ua, "correct": correct})
+            results.append({"q": q, "ans": ua, "correct": correct, "is_correct": is_correct})
 
-        st.success(f"🎉 You got {score}/10 correct!")
+        st.success(f"🎉 You got {score}/{total} correct!")
         st.session_state.primary_math_completed = True
         
         # Save results to history
         save_practice_result(user, st.session_state.primary_math_level, results, score)
 
         # Unlock reward if perfect score
-        if score == 10:
+        if score == total:
             st.session_state.primary_math_reward_unlocked = True
             st.success("🎁 Perfect score! Reward games unlocked!")
 
@@ -263,17 +318,13 @@ def show(user: str = "ella"):
         
         game_choice = st.radio(
             "Select a game to play:",
-            ["🐍 Snake Game", "🏃 Parkour", "🐦 Flappy Bird"],
+            list(GAMES),
             horizontal=True
         )
         
-        # Display selected game full-width
-        if game_choice == "🐍 Snake Game":
-            snake_game()
-        elif game_choice == "🏃 Parkour":
-            parkour_game()
-        elif game_choice == "🐦 Flappy Bird":
-            flappy_game()
+        # Display selected game full-width (the game module is imported on first use)
+        module_name, func_name = GAMES[game_choice]
+        getattr(lazy_loader.load(module_name), func_name)(user=user)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,256 @@
+"""
+Prompts Module
+Registry of the LLM prompt templates used across the app.
+
+Templates are `str.format` strings registered once at import. Registering
+parses the placeholders up front (a typo fails at import, not mid-request)
+and versions the template with a hash of its text; rendering is then a
+single `format_map` call.
+
+The math prompt is precompiled per level: each level's syllabus details are
+substituted at import, so a request only fills in the count and style line,
+and every level (`math_questions.P3`, ...) has its own version.
+
+A rendered prompt carries its template's name and version. They are sent
+with every LLM call as telemetry tags and stored with cached results (the
+news snapshot), so editing a prompt invalidates exactly what it produced.
+"""
+
+import hashlib
+from dataclasses import dataclass
+from string import Formatter
+from typing import Dict, FrozenSet
+
+
+@dataclass(frozen=True)
+class RenderedPrompt:
+    """Prompt text plus the template it came from."""
+    name: str
+    version: str
+    text: str
+
+    @property
+    def tags(self) -> Dict[str, str]:
+        """Telemetry fields identifying the template."""
+        return {"prompt": self.name, "prompt_version": self.version}
+
+
+@dataclass(frozen=True)
+class PromptTemplate:
+    """A registered template: its text, placeholder names and content hash."""
+    name: str
+    text: str
+    version: str
+    fields: FrozenSet[str]
+
+    def render(self, **values) -> RenderedPrompt:
+        missing = self.fields - values.keys()
+        if missing:
+            raise KeyError(f"Prompt {self.name!r} needs {sorted(missing)}")
+        return RenderedPrompt(self.name, self.version, self.text.format_map(values))
+
+
+class _KeepMissing(dict):
+    """format_map mapping that leaves unknown placeholders in place (for partial rendering)."""
+
+    def __missing__(self, key):
+        return "{" + key + "}"
+
+
+_registry: Dict[str, PromptTemplate] = {}
+
+
+# ------------------- Registry -------------------
+
+
+def register(name: str, text: str) -> PromptTemplate:
+    """Compile and register a template (replacing any template of the same name)."""
+    fields = set()
+    for _, field, spec, conversion in Formatter().parse(text):
+        if field is None:
+            continue
+        if not field.isidentifier() or spec or conversion:
+            raise ValueError(f"Prompt {name!r}: unsupported placeholder {{{field}}}")
+        fields.add(field)
+    template = PromptTemplate(name, text, hashlib.sha256(text.encode("utf-8")).hexdigest()[:12], frozenset(fields))
+    _registry[name] = template
+    return template
+
+
+def get(name: str) -> PromptTemplate:
+    """The registered template `name` (KeyError if unknown)."""
+    return _registry[name]
+
+
+def render(name: str, **values) -> RenderedPrompt:
+    """Render the registered template `name` with `values`."""
+    return _registry[name].render(**values)
+
+
+def versions() -> Dict[str, str]:
+    """{template name: version} for every registered template."""
+    return {name: template.version for name, template in sorted(_registry.items())}
+
+
+# ------------------- Math Questions -------------------
+
+MATH_LEVEL_SPECS: Dict[str, Dict[str, str]] = {
+    "P1": {
+        "desc": "Primary 1 (Ages 6-7), matching Singapore Primary 1 Math syllabus",
+        "topics": "addition and subtraction within 20, simple multiplication facts, basic word problems",
+        "examples": "3 + 5, 12 - 4, 2 × 3, simple story problems with objects",
+        "bonus": "Use simple numbers, friendly characters like animals and kids"
+    },
+    "P2": {
+        "desc": "Primary 2 (Ages 7-8), matching Singapore Primary 2 Math syllabus",
+        "topics": "addition and subtraction within 100, multiplication and division facts (1-12 times tables), word problems with everyday items",
+        "examples": "25 + 18, 50 - 23, 6 × 7, 30 ÷ 5, 'Tom has 15 apples, buys 8 more, how many total?'",
+        "bonus": "Make scenarios about school, toys, snacks, animals, daily life"
+    },
+    "P3": {
+        "desc": "Primary 3 (Ages 8-9), matching Singapore Primary 3 Math syllabus",
+        "topics": "operations within 1000, multiplication/division (up to 12×12), fractions, word problems, logic/puzzle problems",
+        "examples": "234 + 156, 500 - 278, 9 × 8, 48 ÷ 6, 1/2 + 1/4, 'Rabbits and chickens have 10 heads and 28 legs, how many of each?'",
+        "bonus": "Include logic puzzles and multi-step decisions"
+    },
+    "P4": {
+        "desc": "Primary 4 (Ages 9-10), matching Singapore Primary 4 Math syllabus",
+        "topics": "multi-digit operations, fractions and decimals, geometry (area/perimeter), word problems, mixed operations",
+        "examples": "1234 + 567, 2000 - 845, 12 × 15, 144 ÷ 12, 0.5 + 0.25, 'Rectangle 12cm × 8cm, find area', 'If apples cost $3 each and I buy 5, total cost?'",
+        "bonus": "Include money problems, shopping, measurements, real-world scenarios",
+        "requirment": "More focus on word problems and real-world applications, less on pure calculations compared to earlier levels"
+    },
+    "P5": {
+        "desc": "Primary 5 (Ages 10-11), matching Singapore Primary 5 Math syllabus",
+        "topics": "fractions/decimals/percentages, ratios, basic algebra, geometry, word problems with multiple steps, consumer math",
+        "examples": "3/4 × 2/3, 15% of 80, ratio 2:3, solve x + 5 = 12, 'Discount of 20% on $50, final price?', 'Speed and distance problems'",
+        "bonus": "Include discounts, taxes, speed-distance-time, proportion problems",
+        "requirment": "More focus on word problems and real-world applications, less on pure calculations compared to earlier levels"
+    },
+    "P6": {
+        "desc": "Primary 6 (Ages 11-12), matching Singapore Primary 6 Math syllabus",
+        "topics": "advanced algebra, percentages/ratios/proportions, geometry (area, volume, perimeter), statistics, multi-step problems, profit/loss",
+        "examples": "120% of 50, solve 2x + 3 = 11, 'If cost is $80 and profit margin is 25%, selling price?', 'Ratio 2:5, if total is 70, find first part'",
+        "bonus": "Include complex scenarios with profit/loss, compound ratios, advanced geometry",
+        "requirment": "More focus on word problems and real-world applications, less on pure calculations compared to earlier levels"
+    },
+    "PLSE": {
+        "desc": "Pre-Lower Secondary Exam (Ages 11-13), matching Singapore PLSE syllabus, preparing for secondary school math",
+        "topics": "comprehensive: algebra equations, geometry proofs, statistics, number theory, problem-solving, real-world applications",
+        "examples": "Solve quadratic equations, find area and volume, 'A train travels at 60km/h for 2.5 hours, distance?', 'Profit and loss calculations', 'Probability problems'",
+        "bonus": "Include challenging multi-step problems, algebra, geometry proofs, statistics",
+        "requirment": "More focus on real PSLE questions."
+    }
+}
+
+MATH_QUESTIONS = """Generate {count} DIVERSE and ENGAGING math questions suitable for {desc}.
+
+Topics to cover: {topics}
+Example question types: {examples}
+Special focus: {bonus}
+
+    {style_line}
+
+IMPORTANT: Create a BALANCED MIX of question types:
+1. Pure calculations (mental math, operations) - about 3-4 questions
+2. REAL WORLD WORD PROBLEMS - about 4-5 questions (with context, names, items, money)
+3. LOGIC/PUZZLE PROBLEMS - about 1-2 questions (multi-step thinking)
+4. GEOMETRY/MEASUREMENTS - about 1-2 questions (where applicable for this level)
+
+Format each question EXACTLY as follows (IMPORTANT):
+Q: [question text here]
+A: [numeric answer only]
+
+CRITICAL RULES:
+1. EVERY line with Q: must be followed by a line with A:
+2. Q: and A: must be ON SEPARATE LINES
+3. Answer must be a NUMBER ONLY (no units, no text, no "=" sign)
+4. For word problems, make them SHORT but CLEAR with character names and scenarios
+5. Answers must be exact: integers for whole numbers, decimals where needed (e.g., 3.5 not 3.5 cm)
+6. All {count} questions should be DIFFERENT and INTERESTING
+7. Mix difficulty within the level - some easier, some harder
+
+Format example:
+Q: If Sarah has 15 apples and gives 3 to her friend, how many does she have left?
+A: 12
+
+Q: 25 + 17 = ?
+A: 42
+
+Now generate {count} diverse, interesting, and well-formatted questions.
+
+REQUIREMENTS:
+- Be concise and avoid any extra text outside the Q/A pairs.
+- Use the exact Q/A format below and do not number the pairs.
+- Output should be as short as possible while following the format.
+
+Format example:
+Q: If Sarah has 15 apples and gives 3 to her friend, how many does she have left?
+A: 12
+
+Q: 25 + 17 = ?
+A: 42
+
+Now generate {count} diverse, interesting, and well-formatted questions:"""
+
+# One template per level with the syllabus filled in; requests only add {count} and {style_line}
+for _level, _spec in MATH_LEVEL_SPECS.items():
+    register(f"math_questions.{_level}", MATH_QUESTIONS.format_map(_KeepMissing(_spec)))
+
+
+# ------------------- Translation -------------------
+
+register("translate.en", "Translate this to English:\n\n{text}\n\nOnly provide the translation, no explanations.")
+register("translate.my", "Translate this to Myanmar (Burmese) language:\n\n{text}\n\nOnly provide the translation, no explanations.")
+
+
+# ------------------- News Analysis -------------------
+
+register("news_trending", """你是一位掌握最新熱點新聞、社交媒體趨勢與網路輿論的專家助理。
+請根據過去7天（包括今天）的全球與中文媒體、社交媒體趨勢，列出大約10個最受關注與最熱門的新聞/文章/影片/話題。
+
+對每一項請提供以下信息（用標準化格式，每項之間用---分隔）：
+
+1. **標題**: [新聞/文章/影片標題]
+2. **媒體/來源**: [媒體名稱或社交平台]
+3. **熱度指數**: [1-10 分，代表受關注程度]
+4. **簡介**: [2-3句的簡短摘要，說明發生什麼事]
+5. **涉及公司/個人/組織**: [列出相關的主要方]
+
+---""")
+
+register("news_impact", """你是一位資深的金融分析專家，擅長評估新聞事件對各類金融產品的潛在影響。
+
+請根據以下 {count} 個新聞內容分析對金融市場的影響：
+
+【新聞內容】
+{news_text}
+
+請從以下角度進行分析：
+
+1. **對列舉公司股價的潛在影響**:
+   - 直接受益或受害的公司（列出2-5家）
+   - 對每家公司的影響評估（正面/中性/負面）
+   - 簡短說明原因（1-2句）
+
+2. **對主要金融產品的影響**:
+   - 貴金屬（黃金/白銀）: 影響評估 + 原因
+   - 主要指數（恆生指數/滬深300/納斯達克等）: 影響評估 + 原因
+   - 能源商品（石油/天然氣）: 影響評估 + 原因
+   - 匯率走勢: 影響評估 + 原因
+
+3. **風險評估**:
+   - 事件發展的幾種可能情境及其金融影響
+   - 關鍵監控指標（3-5項）
+
+用清晰的中文回覆，保持簡潔（總共不超過 1000 字）。""")
+
+register("news_custom", """你是一位能閱讀最新熱點、擅長中文評論與財經風險分析的助理。
+請根據以下關鍵字或連結: "{query}" ，列出大約 {top_n} 個最相關的熱門文章/影片/直播標題（假設目前網路熱度高），
+對每一條給出：
+1) 中文摘要（簡短2-3句）
+2) 涉及的公司或組織（以短句列出）
+3) 對相關公司股價或金融產品的潛在影響評估（簡短：正面/中性/負面，並說明原因）
+4) 若要追蹤此事件，建議監控哪些關鍵詞或指標（最多3項）
+
+請用中文回覆，條列清晰，保持簡潔（每項不超過 5 行）。""")
@@ -0,0 +1,359 @@
+"""
+Question Bank Module
+Template-driven local math question generator for P1-P6 and PLSE.
+
+Every template builds its answer with `fractions.Fraction` (usually by
+choosing the answer first and working backwards), so answers are exact and
+verified by construction. Generation is pure Python and fast enough to
+produce thousands of distinct questions per second, so the LLM is only
+needed for rich word problems.
+"""
+
+import random
+from fractions import Fraction
+from typing import Callable, Dict, List, Optional, Tuple
+
+from answer_check import to_number
+
+LEVELS = ["P1", "P2", "P3", "P4", "P5", "P6", "PLSE"]
+
+NAMES = ["Tom", "Sarah", "Ali", "Mei", "Ravi", "Ella", "Lucas", "Nina", "Ben", "Aisha"]
+ITEMS = ["apples", "stickers", "marbles", "pencils", "cookies", "cards", "sweets", "books"]
+ANIMAL_PAIRS = [("chickens", 2, "rabbits", 4), ("ducks", 2, "goats", 4), ("spiders", 8, "beetles", 6)]
+
+# Number ranges used by the shared arithmetic templates
+ADD_LIMITS = {"P1": 20, "P2": 100, "P3": 1000, "P4": 10000, "P5": 10000, "P6": 10000, "PLSE": 10000}
+TABLE_LIMITS = {"P1": 5, "P2": 10, "P3": 12, "P4": 12, "P5": 12, "P6": 12, "PLSE": 12}
+
+Template = Callable[[random.Random, str], Tuple[str, Fraction]]
+_TEMPLATES: Dict[str, List[Tuple[str, Template]]] = {level: [] for level in LEVELS}
+
+
+def template(topic: str, *levels: str):
+    """Register a question template for a topic at the given levels."""
+    def register(func: Template) -> Template:
+        for level in levels:
+            _TEMPLATES[level].append((topic, func))
+        return func
+    return register
+
+
+# ------------------- Helpers -------------------
+
+
+def _fmt(value) -> str:
+    """Format a Fraction/number for question text (integers without decimals)."""
+    value = Fraction(value)
+    if value.denominator == 1:
+        return str(value.numerator)
+    return f"{float(value):g}"
+
+
+def _frac(value: Fraction) -> str:
+    return f"{value.numerator}/{value.denominator}"
+
+
+def _is_terminating(value: Fraction) -> bool:
+    """True if the value has a finite decimal expansion of at most 4 places."""
+    return (Fraction(value) * 10000).denominator == 1
+
+
+# ------------------- Arithmetic -------------------
+
+
+@template("addition", *LEVELS[:4])
+def _addition(rng, level):
+    limit = ADD_LIMITS[level]
+    a = rng.randint(1, limit - 1)
+    b = rng.randint(1, limit - a)
+    return f"{a} + {b} = ?", Fraction(a + b)
+
+
+@template("subtraction", *LEVELS[:4])
+def _subtraction(rng, level):
+    limit = ADD_LIMITS[level]
+    a = rng.randint(2, limit)
+    b = rng.randint(1, a)
+    return f"{a} - {b} = ?", Fraction(a - b)
+
+
+@template("multiplication", *LEVELS[:4])
+def _multiplication(rng, level):
+    limit = TABLE_LIMITS[level]
+    a, b = rng.randint(2, limit), rng.randint(2, limit)
+    if level == "P4":
+        a = rng.randint(11, 99)
+    return f"{a} × {b} = ?", Fraction(a * b)
+
+
+@template("division", "P2", "P3", "P4")
+def _division(rng, level):
+    limit = TABLE_LIMITS[level]
+    divisor, quotient = rng.randint(2, limit), rng.randint(2, limit)
+    if level == "P4":
+        quotient = rng.randint(11, 99)
+    return f"{divisor * quotient} ÷ {divisor} = ?", Fraction(quotient)
+
+
+@template("word_problem", "P1", "P2", "P3")
+def _word_add_sub(rng, level):
+    name, item = rng.choice(NAMES), rng.choice(ITEMS)
+    limit = ADD_LIMITS[level] // 2
+    have = rng.randint(3, limit)
+    if rng.random() < 0.5:
+        more = rng.randint(1, limit)
+        return f"{name} has {have} {item} and gets {more} more. How many {item} does {name} have now?", Fraction(have + more)
+    give = rng.randint(1, have)
+    return f"{name} has {have} {item} and gives away {give}. How many {item} are left?", Fraction(have - give)
+
+
+@template("money", "P2", "P3", "P4")
+def _money(rng, level):
+    name = rng.choice(NAMES)
+    price, qty = rng.randint(2, 9 if level == "P2" else 25), rng.randint(2, 9)
+    return f"{name} buys {qty} toys at ${price} each. How much does {name} pay in dollars?", Fraction(price * qty)
+
+
+@template("mixed_operations", "P4", "P5", "P6", "PLSE")
+def _mixed_operations(rng, level):
+    a, b, c = rng.randint(2, 50), rng.randint(2, 12), rng.randint(2, 12)
+    if rng.random() < 0.5:
+        return f"{a} + {b} × {c} = ?", Fraction(a + b * c)
+    return f"({a} + {b}) × {c} = ?", Fraction((a + b) * c)
+
+
+# ------------------- Fractions & Decimals -------------------
+
+
+@template("fractions", "P3", "P4")
+def _fraction_same_denominator(rng, level):
+    den = rng.choice([2, 4, 5, 8, 10])
+    a = rng.randint(1, den - 1)
+    b = rng.randint(1, den)
+    return f"{a}/{den} + {b}/{den} = ? (give your answer as a decimal)", Fraction(a + b, den)
+
+
+@template("fractions", "P4", "P5", "P6", "PLSE")
+def _fraction_of_quantity(rng, level):
+    den = rng.choice([2, 3, 4, 5, 6, 8, 10])
+    num = rng.randint(1, den - 1)
+    whole = den * rng.randint(2, 20)
+    return f"{num}/{den} of {whole} = ?", Fraction(num, den) * whole
+
+
+@template("fractions", "P5", "P6", "PLSE")
+def _fraction_multiply(rng, level):
+    # Only pick denominators whose product terminates as a decimal
+    a = Fraction(rng.randint(1, 7), rng.choice([2, 4, 5, 8]))
+    b = Fraction(rng.randint(1, 7), rng.choice([2, 4, 5]))
+    return f"{_frac(a)} × {_frac(b)} = ? (give your answer as a decimal)", a * b
+
+
+@template("decimals", "P4", "P5")
+def _decimal_add(rng, level):
+    a = Fraction(rng.randint(1, 999), 100)
+    b = Fraction(rng.randint(1, 999), 100)
+    return f"{_fmt(a)} + {_fmt(b)} = ?", a + b
+
+
+@template("decimals", "P5", "P6")
+def _decimal_multiply(rng, level):
+    a = Fraction(rng.randint(11, 99), 10)
+    b = rng.randint(2, 9)
+    return f"{_fmt(a)} × {b} = ?", a * b
+
+
+# ------------------- Percentages & Ratios -------------------
+
+
+@template("percentages", "P5", "P6", "PLSE")
+def _percent_of(rng, level):
+    pct = rng.choice([5, 10, 15, 20, 25, 30, 40, 45, 50, 60, 75] + ([120, 150] if level != "P5" else []))
+    base = rng.randint(1, 40) * 20
+    return f"{pct}% of {base} = ?", Fraction(pct, 100) * base
+
+
+@template("percentages", "P5", "P6", "PLSE")
+def _discount(rng, level):
+    pct = rng.choice([10, 20, 25, 30, 40, 50])
+    price = rng.randint(2, 40) * 10
+    item = rng.choice(["shirt", "bag", "bicycle", "lamp", "game"])
+    return f"A {item} costs ${price}. With a {pct}% discount, what is the final price in dollars?", price * (1 - Fraction(pct, 100))
+
+
+@template("percentages", "P6", "PLSE")
+def _profit(rng, level):
+    pct = rng.choice([10, 20, 25, 30, 50])
+    cost = rng.randint(2, 30) * 20
+    return f"A shop buys a table for ${cost} and sells it at a {pct}% profit. What is the selling price in dollars?", cost * (1 + Fraction(pct, 100))
+
+
+@template("ratios", "P5", "P6", "PLSE")
+def _ratio_scale(rng, level):
+    a, b = rng.sample(range(1, 10), 2)
+    k = rng.randint(2, 12)
+    return f"The ratio of boys to girls is {a}:{b}. There are {a * k} boys. How many girls are there?", Fraction(b * k)
+
+
+@template("ratios", "P6", "PLSE")
+def _ratio_share(rng, level):
+    parts = rng.sample(range(1, 8), 3 if level == "PLSE" else 2)
+    k = rng.randint(2, 20)
+    total = sum(parts) * k
+    ratio = ":".join(str(p) for p in parts)
+    return f"{total} marbles are shared in the ratio {ratio}. How many marbles are in the first share?", Fraction(parts[0] * k)
+
+
+# ------------------- Measurement & Geometry -------------------
+
+
+@template("area", "P3", "P4", "P5", "P6", "PLSE")
+def _rectangle_area(rng, level):
+    length, width = rng.randint(3, 30), rng.randint(2, 20)
+    return f"A rectangle is {length} cm long and {width} cm wide. What is its area in cm²?", Fraction(length * width)
+
+
+@template("perimeter", "P3", "P4", "P5")
+def _rectangle_perimeter(rng, level):
+    length, width = rng.randint(3, 40), rng.randint(2, 30)
+    return f"A rectangle is {length} cm long and {width} cm wide. What is its perimeter in cm?", Fraction(2 * (length + width))
+
+
+@template("area", "P5", "P6", "PLSE")
+def _triangle_area(rng, level):
+    base, height = rng.randint(2, 30), rng.randint(2, 20)
+    return f"A triangle has base {base} cm and height {height} cm. What is its area in cm²?", Fraction(base * height, 2)
+
+
+@template("volume", "P4", "P5", "P6", "PLSE")
+def _cuboid_volume(rng, level):
+    l, w, h = rng.randint(2, 20), rng.randint(2, 15), rng.randint(2, 12)
+    return f"A box is {l} cm long, {w} cm wide and {h} cm high. What is its volume in cm³?", Fraction(l * w * h)
+
+
+@template("circles", "P6", "PLSE")
+def _circle(rng, level):
+    radius = rng.randint(1, 20)
+    pi = Fraction(314, 100)
+    if rng.random() < 0.5:
+        return f"Find the circumference of a circle with radius {radius} cm (take π = 3.14).", 2 * pi * radius
+    return f"Find the area of a circle with radius {radius} cm (take π = 3.14).", pi * radius * radius
+
+
+@template("speed", "P6", "PLSE")
+def _speed(rng, level):
+    speed = rng.randint(4, 24) * 5
+    hours = Fraction(rng.randint(3, 12), 2)
+    return f"A car travels at {speed} km/h for {_fmt(hours)} hours. How far does it travel in km?", speed * hours
+
+
+# ------------------- Algebra & Puzzles -------------------
+
+
+@template("equations", "P5", "P6", "PLSE")
+def _linear_equation(rng, level):
+    x = rng.randint(1, 20)
+    a, b = rng.randint(2, 9), rng.randint(1, 30)
+    if rng.random() < 0.5:
+        return f"Solve: {a}x + {b} = {a * x + b}, x = ?", Fraction(x)
+    return f"Solve: {a}x - {b} = {a * x - b}, x = ?", Fraction(x)
+
+
+@template("equations", "PLSE")
+def _bracket_equation(rng, level):
+    x = rng.randint(1, 20)
+    a, b = rng.randint(2, 9), rng.randint(1, 9)
+    return f"Solve: {a}(x - {b}) = {a * (x - b)}, x = ?", Fraction(x)
+
+
+@template("heads_and_legs", "P3", "P4", "P5", "P6", "PLSE")
+def _heads_and_legs(rng, level):
+    small, small_legs, big, big_legs = rng.choice(ANIMAL_PAIRS)
+    n_small, n_big = rng.randint(1, 15), rng.randint(1, 15)
+    heads = n_small + n_big
+    legs = n_small * small_legs + n_big * big_legs
+    return f"A farm has {small} and {big}. There are {heads} heads and {legs} legs. How many {big} are there?", Fraction(n_big)
+
+
+@template("statistics", "P6", "PLSE")
+def _mean(rng, level):
+    n = rng.randint(3, 6)
+    values = [rng.randint(1, 100) for _ in range(n)]
+    values[-1] += (-sum(values)) % n  # make the mean a whole number
+    return f"Find the mean of {', '.join(str(v) for v in values)}.", Fraction(sum(values), n)
+
+
+# ------------------- Public API -------------------
+
+
+def topics_for_level(level: str) -> List[str]:
+    """List the topics available at a level."""
+    return sorted({topic for topic, _ in _TEMPLATES[level.upper()]})
+
+
+def generate_questions(
+    level: str,
+    count: int = 10,
+    topics: Optional[List[str]] = None,
+    seed: Optional[int] = None,
+    rng: Optional[random.Random] = None,
+) -> List[Tuple[str, float]]:
+    """
+    Generate distinct questions with exact answers for a level.
+
+    Args:
+        level: One of "P1", "P2", "P3", "P4", "P5", "P6", or "PLSE"
+        count: Number of questions to generate
+        topics: Optional list of topics to draw from (defaults to all topics for the level)
+        seed: Optional seed for reproducible question sets
+        rng: Optional random.Random instance (takes precedence over seed)
+
+    Returns:
+        List of tuples (question_string, correct_answer), in the same form as
+        `LLMHelper.generate_math_questions`
+    """
+    level = level.upper()
+    if level not in _TEMPLATES:
+        raise ValueError(f"Invalid level: {level}. Must be one of {LEVELS}")
+
+    rng = rng or random.Random(seed)
+    templates = _TEMPLATES[level]
+    if topics:
+        templates = [t for t in templates if t[0] in topics] or templates
+
+    # Cycle through topics so a set gets a balanced mix, then shuffle
+    by_topic: Dict[str, List[Template]] = {}
+    for topic, func in templates:
+        by_topic.setdefault(topic, []).append(func)
+    topic_order = list(by_topic)
+    rng.shuffle(topic_order)
+
+    questions = []
+    seen = set()
+    attempts = 0
+    while len(questions) < count and attempts < count * 20:
+        topic = topic_order[attempts % len(topic_order)]
+        attempts += 1
+        text, answer = rng.choice(by_topic[topic])(rng, level)
+        if text in seen or not _is_terminating(answer) or answer < 0:
+            continue
+        seen.add(text)
+        questions.append((text, to_number(answer)))
+
+    rng.shuffle(questions)
+    return questions
+
+
+def generate_from_mix(level: str, mix: Dict[str, int], seed: Optional[int] = None) -> List[Tuple[str, float]]:
+    """
+    Generate questions following a {topic: count} mix (e.g. from adaptive.plan_session).
+
+    Returns:
+        Shuffled list of (question_string, correct_answer) tuples
+    """
+    rng = random.Random(seed)
+    questions = []
+    for topic, n in mix.items():
+        questions.extend(generate_questions(level, n, topics=[topic], rng=rng))
+    rng.shuffle(questions)
+    return questions
@@ -0,0 +1,177 @@
+"""
+Render Profiler Module
+Opt-in timing of what a Streamlit rerun spends its time on.
+
+Set `APP_PROFILE` before starting the app:
+
+  - `APP_PROFILE=spans`     time named sections (`span()`) of every rerun
+  - `APP_PROFILE=cprofile`  spans plus a cProfile of the whole rerun, saved to
+                            PROFILE_DIR/<page>-<time>.prof (open with snakeviz
+                            or flameprof)
+
+Spans of recent reruns are kept in memory and exported as a Chrome trace
+(`export_chrome_trace()`, or the download button in the debug panel), which
+chrome://tracing, Perfetto and speedscope show as a flame chart.
+
+When `APP_PROFILE` is unset `span()` returns one shared no-op context
+manager, so instrumented code pays a function call and nothing else.
+"""
+
+import os
+import io
+import json
+import time
+import pstats
+import cProfile
+import threading
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from typing import Deque, List, Optional
+
+MODE = os.environ.get("APP_PROFILE", "").strip().lower()
+ENABLED = MODE in ("1", "spans", "cprofile")
+CPROFILE = MODE == "cprofile"
+PROFILE_DIR = os.environ.get("APP_PROFILE_DIR", "profiles")
+MAX_RERUNS = int(os.environ.get("APP_PROFILE_RERUNS", "50"))  # reruns kept for the trace export
+
+_NOOP = nullcontext()
+_local = threading.local()  # the current and last rerun of this script thread
+_lock = threading.Lock()
+_reruns: Deque[dict] = deque(maxlen=MAX_RERUNS)
+_epoch = time.perf_counter()
+
+
+# ------------------- Spans -------------------
+
+
+class _Span:
+    __slots__ = ("name", "args", "started")
+
+    def __init__(self, name: str, args: dict):
+        self.name, self.args = name, args
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        rerun = getattr(_local, "rerun", None)
+        if rerun is not None:  # spans outside a profiled rerun (e.g. background threads) are dropped
+            rerun["spans"].append({"name": self.name, "start": self.started,
+                                   "duration": time.perf_counter() - self.started, "args": self.args})
+        return False
+
+
+def span(name: str, **args):
+    """
+    Time a section of the current rerun.
+
+    Args:
+        name: Span name, dotted by area (e.g. "history.load", "llm.translate")
+        **args: Extra fields shown with the span in the trace viewer
+
+    Returns:
+        A context manager (a shared no-op when profiling is off)
+    """
+    if not ENABLED:
+        return _NOOP
+    return _Span(name, args)
+
+
+@contextmanager
+def rerun(page: str):
+    """Profile one script run: the page's root span, plus cProfile in cprofile mode."""
+    if not ENABLED:
+        yield
+        return
+    record = {"page": page, "thread": threading.get_ident(), "at": datetime.now().isoformat(timespec="seconds"),
+              "spans": [], "profile": None}
+    _local.rerun = record
+    profiler = _start_cprofile()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:  # st.rerun()/st.stop() end a run early; still record it
+        duration = time.perf_counter() - started
+        if profiler is not None:
+            profiler.disable()
+            record["profile"] = _save_cprofile(profiler, page)
+        record["spans"].insert(0, {"name": f"page.{page}", "start": started, "duration": duration, "args": {}})
+        record["duration"] = duration
+        _local.rerun, _local.last = None, record
+        with _lock:
+            _reruns.append(record)
+
+
+def _start_cprofile() -> Optional[cProfile.Profile]:
+    if not CPROFILE:
+        return None
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:  # another profiler is active on this thread
+        return None
+    return profiler
+
+
+def _save_cprofile(profiler: cProfile.Profile, page: str) -> Optional[str]:
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    safe_page = "".join(c if c.isalnum() else "_" for c in page)
+    path = os.path.join(PROFILE_DIR, f"{safe_page}-{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}.prof")
+    try:
+        profiler.dump_stats(path)
+    except OSError:
+        return None
+    return path
+
+
+# ------------------- Reporting -------------------
+
+
+def recent_reruns(limit: Optional[int] = None) -> List[dict]:
+    """Profiled reruns of this process, oldest first."""
+    with _lock:
+        reruns = list(_reruns)
+    return reruns[-limit:] if limit else reruns
+
+
+def chrome_trace(reruns: Optional[List[dict]] = None) -> dict:
+    """Spans of `reruns` (default: all kept) in Chrome trace event format."""
+    events = []
+    for record in recent_reruns() if reruns is None else reruns:
+        for s in record["spans"]:
+            events.append({"name": s["name"], "cat": record["page"], "ph": "X", "pid": os.getpid(),
+                           "tid": record["thread"], "ts": round((s["start"] - _epoch) * 1e6),
+                           "dur": round(s["duration"] * 1e6), "args": s["args"]})
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def export_chrome_trace(path: str) -> str:
+    """Write the kept reruns as a Chrome trace JSON file and return its path."""
+    with open(path, "w") as f:
+        json.dump(chrome_trace(), f)
+    return path
+
+
+def top_functions(path: str, limit: int = 15) -> str:
+    """The `limit` most expensive functions (cumulative time) of a saved cProfile."""
+    out = io.StringIO()
+    pstats.Stats(path, stream=out).sort_stats("cumulative").print_stats(limit)
+    return out.getvalue()
+
+
+def render_debug_panel(st) -> None:
+    """Show this session's last profiled rerun and a trace download in a sidebar expander."""
+    last = getattr(_local, "last", None)
+    if not ENABLED or last is None:
+        return
+    with st.sidebar.expander("🛠️ Debug: Rerun Profile"):
+        st.write(f"**{last['page']}**: {last['duration'] * 1000:.0f} ms")
+        for s in sorted(last["spans"][1:], key=lambda s: s["duration"], reverse=True)[:10]:
+            st.write(f"- `{s['name']}`: {s['duration'] * 1000:.1f} ms")
+        st.download_button("Download Chrome trace", json.dumps(chrome_trace()),
+                           file_name="rerun-trace.json", mime="application/json")
+        if last["profile"]:
+            st.caption(f"cProfile: {last['profile']}")
+            st.code(top_functions(last["profile"]))
@@ -0,0 +1,176 @@
+"""
+Review Queue Module
+Spaced-repetition review of missed practice questions.
+
+Wrong answers saved by `primary_math.save_practice_result` are added to a
+per-user queue with a due date (Leitner boxes: 1, 2, 4, 8, 16 days). A
+correct review moves the question to the next box; another miss sends it
+back to the first. Items are kept in a min-heap ordered by due date plus an
+index by question, so due items are found without scanning the whole queue
+and a session's review portion needs no LLM call.
+"""
+
+import os
+import re
+import json
+import heapq
+import threading
+import itertools
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+
+REVIEW_FILE = "review_queue.json"
+INTERVALS_DAYS = [1, 2, 4, 8, 16]  # after the last box the question counts as mastered
+MAX_REVIEW_SHARE = 0.5  # at most half of a session is review questions
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+_lock = threading.Lock()
+_queues: Dict[str, "ReviewQueue"] = {}
+_cache: Dict[str, object] = {"mtime": None}
+
+
+def question_key(question: str) -> str:
+    """Normalize question text so the same question maps to one queue entry."""
+    return _WHITESPACE_RE.sub(" ", question.strip().lower())
+
+
+class ReviewQueue:
+    """Per-user review items in a due-date min-heap with an index by question key."""
+
+    def __init__(self, items: Optional[List[dict]] = None):
+        self._items: Dict[str, dict] = {}
+        self._heap: List[Tuple[str, int, str]] = []  # (due, seq, key); stale entries skipped lazily
+        self._live: Dict[str, int] = {}  # key -> seq of its current heap entry
+        self._seq = itertools.count()
+        for item in items or []:
+            self._items[question_key(item["q"])] = item
+        for key, item in self._items.items():
+            self._live[key] = next(self._seq)
+            self._heap.append((item["due"], self._live[key], key))
+        heapq.heapify(self._heap)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, question: str) -> bool:
+        return question_key(question) in self._items
+
+    def _schedule(self, key: str, item: dict, now: datetime) -> None:
+        item["due"] = (now + timedelta(days=INTERVALS_DAYS[item["box"]])).isoformat(timespec="seconds")
+        self._items[key] = item
+        self._live[key] = next(self._seq)  # any earlier entry for the key is now stale
+        heapq.heappush(self._heap, (item["due"], self._live[key], key))
+
+    def record(self, question: str, correct, level: str, is_correct: bool, now: datetime) -> None:
+        """Update the queue with one graded answer."""
+        key = question_key(question)
+        item = self._items.get(key)
+        if item is None:
+            if not is_correct:
+                self._schedule(key, {"q": question, "correct": correct, "level": level, "box": 0, "misses": 1}, now)
+            return
+
+        if is_correct:
+            item["box"] += 1
+            if item["box"] >= len(INTERVALS_DAYS):
+                del self._items[key]  # mastered; its heap entry becomes stale
+                del self._live[key]
+                return
+        else:
+            item["box"] = 0
+            item["misses"] += 1
+        self._schedule(key, item, now)
+
+    def due(self, now: datetime, level: Optional[str] = None, limit: Optional[int] = None) -> List[dict]:
+        """Return due items (earliest first) without removing them from the queue."""
+        now_iso = now.isoformat(timespec="seconds")
+        popped, result = [], []
+        while self._heap and self._heap[0][0] <= now_iso and (limit is None or len(result) < limit):
+            entry = heapq.heappop(self._heap)
+            item = self._items.get(entry[2])
+            if item is None or self._live.get(entry[2]) != entry[1]:
+                continue  # stale entry from a reschedule or removal
+            popped.append(entry)
+            if level is None or item.get("level") == level:
+                result.append(item)
+        for entry in popped:
+            heapq.heappush(self._heap, entry)
+        return result
+
+    def to_list(self) -> List[dict]:
+        return sorted(self._items.values(), key=lambda item: item["due"])
+
+
+# ------------------- Storage -------------------
+
+
+def _load_all() -> Dict[str, "ReviewQueue"]:
+    """Load all queues (cached until the file changes)."""
+    try:
+        mtime = os.path.getmtime(REVIEW_FILE)
+    except OSError:
+        return _queues
+    if _cache["mtime"] != mtime:
+        try:
+            with open(REVIEW_FILE, "r") as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, ValueError):
+            data = {}
+        _queues.clear()
+        _queues.update({user: ReviewQueue(items) for user, items in data.items()})
+        _cache["mtime"] = mtime
+    return _queues
+
+
+def _save_all(queues: Dict[str, "ReviewQueue"]) -> None:
+    tmp_path = f"{REVIEW_FILE}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({user: q.to_list() for user, q in queues.items()}, f, indent=2)
+    os.replace(tmp_path, REVIEW_FILE)
+    _cache["mtime"] = os.path.getmtime(REVIEW_FILE)
+
+
+def get_queue(user: str) -> ReviewQueue:
+    """Return a user's review queue (empty if none yet)."""
+    return _load_all().get(user) or ReviewQueue()
+
+
+# ------------------- Public API -------------------
+
+
+def record_results(user: str, level: str, results: list, now: Optional[datetime] = None) -> None:
+    """
+    Add missed questions to the user's queue and reschedule reviewed ones.
+
+    Args:
+        user: The user name/profile
+        level: Level of the practice session
+        results: List of {"q", "ans", "correct", "is_correct"} dicts as saved to history
+    """
+    now = now or datetime.now()
+    with _lock:
+        queues = _load_all()
+        queue = queues.setdefault(user, ReviewQueue())
+        for result in results:
+            # Use the page's grade: "ans" is only the numeric value of what was typed
+            queue.record(result.get("q", ""), result.get("correct"), level, bool(result.get("is_correct")), now)
+        _save_all(queues)
+
+
+def due_questions(user: str, level: str, limit: int, now: Optional[datetime] = None) -> List[Tuple[str, float]]:
+    """
+    Return up to `limit` due review questions for a level.
+
+    Returns:
+        List of (question_string, correct_answer) tuples, earliest due first
+    """
+    with _lock:
+        items = get_queue(user).due(now or datetime.now(), level=level, limit=limit)
+    return [(item["q"], item["correct"]) for item in items]
+
+
+def review_limit(count: int) -> int:
+    """Maximum number of review questions in a session of `count` questions."""
+    return int(count * MAX_REVIEW_SHARE)
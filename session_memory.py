@@ -0,0 +1,252 @@
+"""
+Session Memory Module
+Memory accounting, sharing and eviction for Streamlit session state.
+
+  - `account()` runs at the end of every rerun: it measures each key of the
+    current session's state (deep size) and, when the process-wide total is
+    over budget, flags bulky entries of the least recently used idle
+    sessions for eviction. Each session drops its own flagged entries in
+    `apply_evictions()` at the start of its next rerun, so no session's
+    state is touched from another session's thread. Evicted keys are ones
+    their page rebuilds on the next visit (news items from the snapshot, a
+    finished question set whose reward is not unlocked).
+  - `intern_entries()` replaces records (e.g. snapshot news items) with one
+    canonical copy per content hash, so sessions showing the same data
+    share the objects instead of each holding its own.
+  - `shared()` returns one process-wide instance per (kind, key), e.g. the
+    LLM helper for an API key or the chat history cache for a gist.
+
+Interned and shared objects are charged once to the process, not to every
+session that references them.
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Mapping, Optional, Tuple
+
+MEMORY_BUDGET_MB = float(os.environ.get("SESSION_MEMORY_BUDGET_MB", "64"))
+MIN_IDLE_SECONDS = 60  # never evict from a session that was active this recently
+
+
+@dataclass(frozen=True)
+class Evictable:
+    """Session keys dropped together; the owning page rebuilds them when missing."""
+    keys: Tuple[str, ...]
+    when: Optional[Callable[[Mapping], bool]] = None  # extra condition on the session state
+
+
+# Checked in order; a group is present when its first key is in the session state
+EVICTABLE: List[Evictable] = [
+    Evictable(("news_items", "news_snapshot_at", "selected_news_ids")),
+    Evictable(
+        ("primary_math_questions", "primary_math_answers", "primary_math_review_questions",
+         "primary_math_completed", "primary_math_reward_unlocked"),
+        # Finished sets only, and not while the reward game is open: the game's iframe
+        # causes no reruns, so the session can look idle while a child plays
+        when=lambda state: bool(state.get("primary_math_completed")) and not state.get("primary_math_reward_unlocked"),
+    ),
+]
+
+_lock = threading.Lock()
+_sessions: Dict[str, dict] = {}  # session id -> {"last_seen", "sizes", "evictable", "evict"}
+_interned: Dict[str, object] = {}  # content hash -> canonical record
+_shared: Dict[Tuple[str, str], object] = {}
+_stats = {"evictions": 0, "evicted_bytes": 0}
+
+
+# ------------------- Sizing -------------------
+
+
+def deep_size(obj, skip: frozenset = frozenset()) -> int:
+    """
+    Approximate memory held by `obj`: containers are followed, other objects count shallow.
+
+    Args:
+        obj: Object to measure
+        skip: ids of objects charged elsewhere (interned or shared)
+    """
+    total, seen, stack = 0, set(), [obj]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen or id(item) in skip:
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+    return total
+
+
+def _shared_ids() -> frozenset:
+    return frozenset(map(id, list(_interned.values()) + list(_shared.values())))
+
+
+# ------------------- Sharing -------------------
+
+
+def _content_hash(record) -> str:
+    encoded = json.dumps(record, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")
+    return hashlib.sha1(encoded).hexdigest()
+
+
+def intern_entries(entries: list) -> list:
+    """Return `entries` with each record replaced by the process-wide copy of equal content."""
+    with _lock:
+        return [_interned.setdefault(_content_hash(entry), entry) for entry in entries]
+
+
+def shared(kind: str, key: str, factory: Callable[[], object]):
+    """Return the process-wide object for (kind, key), creating it with `factory` once."""
+    with _lock:
+        if (kind, key) not in _shared:
+            _shared[(kind, key)] = factory()
+        return _shared[(kind, key)]
+
+
+def _prune_interned() -> None:
+    """Forget interned records no session references any more (caller holds _lock)."""
+    for digest in list(_interned):
+        if sys.getrefcount(_interned[digest]) <= 2:  # the pool itself + the call argument
+            del _interned[digest]
+
+
+# ------------------- Accounting -------------------
+
+
+def _evictable_groups(state: Mapping) -> List[Evictable]:
+    return [group for group in EVICTABLE
+            if group.keys[0] in state and (group.when is None or group.when(state))]
+
+
+def _flag_for_eviction(record: dict) -> int:
+    """Flag an idle session's evictable groups; returns the bytes they hold."""
+    released = 0
+    for name in record["evictable"]:
+        group = next(g for g in EVICTABLE if g.keys[0] == name)
+        record["evict"][name] = sum(record["sizes"].pop(key, 0) for key in group.keys)
+        released += record["evict"][name]
+    record["evictable"] = []
+    return released
+
+
+def apply_evictions() -> None:
+    """
+    Drop the groups flagged for the current session while it was idle.
+
+    Call at the start of every rerun, before any page reads its state.
+    """
+    import streamlit as st
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    ctx = get_script_run_ctx()
+    if ctx is None:
+        return
+    with _lock:
+        record = _sessions.get(ctx.session_id)
+        if not record or not record["evict"]:
+            return
+        flagged, record["evict"] = record["evict"], {}
+    for group in _evictable_groups(st.session_state):  # re-checked: the state is current now
+        if group.keys[0] not in flagged:
+            continue
+        for key in group.keys:
+            st.session_state.pop(key, None)
+        with _lock:
+            _stats["evictions"] += 1
+            _stats["evicted_bytes"] += flagged[group.keys[0]]
+
+
+def _is_active(session_id: str) -> bool:
+    try:
+        from streamlit.runtime import Runtime
+        return not Runtime.exists() or Runtime.instance().is_active_session(session_id)
+    except Exception:
+        return True
+
+
+def account(now: Optional[float] = None) -> Optional[dict]:
+    """
+    Measure the current session and enforce the memory budget.
+
+    Call once per rerun, after the page has rendered.
+
+    Returns:
+        The current session's {key: bytes}, or None outside a Streamlit run
+    """
+    import streamlit as st
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    ctx = get_script_run_ctx()
+    if ctx is None:
+        return None
+    now = now or time.time()
+    state = st.session_state.to_dict()
+
+    with _lock:
+        skip = _shared_ids()
+        sizes = {key: deep_size(value, skip) for key, value in state.items()}
+        evict = _sessions.get(ctx.session_id, {}).get("evict", {})  # group name -> bytes
+        _sessions[ctx.session_id] = {"last_seen": now, "sizes": sizes, "evict": evict,
+                                     "evictable": [g.keys[0] for g in _evictable_groups(state)]}
+
+        # Closed sessions are Streamlit's to clean up; stop tracking them
+        for session_id in [sid for sid in _sessions if sid != ctx.session_id and not _is_active(sid)]:
+            del _sessions[session_id]
+
+        budget = MEMORY_BUDGET_MB * 1024 * 1024
+        total = _total_bytes()
+        if total > budget:
+            idle = sorted((s for s in _sessions.values() if now - s["last_seen"] >= MIN_IDLE_SECONDS),
+                          key=lambda s: s["last_seen"])
+            for record in idle:
+                total -= _flag_for_eviction(record)
+                if total <= budget:
+                    break
+        _prune_interned()
+        return sizes
+
+
+def _total_bytes() -> int:
+    """Session bytes plus interned/shared objects counted once (caller holds _lock)."""
+    sessions = sum(sum(s["sizes"].values()) for s in _sessions.values())
+    pooled = deep_size(list(_interned.values())) + sum(sys.getsizeof(o) for o in _shared.values())
+    return sessions + pooled
+
+
+def session_count() -> int:
+    """Number of active sessions seen by account()."""
+    with _lock:
+        return len(_sessions)
+
+
+def memory_report() -> dict:
+    """Process-wide totals for the debug panel."""
+    with _lock:
+        return {
+            "sessions": len(_sessions),
+            "total_bytes": _total_bytes(),
+            "budget_bytes": int(MEMORY_BUDGET_MB * 1024 * 1024),
+            "interned_records": len(_interned),
+            "shared_objects": len(_shared),
+            **_stats,
+        }
+
+
+def render_debug_panel(st, sizes: Optional[dict]) -> None:
+    """Show this session's largest keys and the process totals in a sidebar expander."""
+    with st.sidebar.expander("🛠️ Debug: Session Memory"):
+        report = memory_report()
+        st.write(f"**All sessions:** {report['total_bytes'] / 1024:.0f} KB of "
+                 f"{report['budget_bytes'] / 1024:.0f} KB budget ({report['sessions']} sessions)")
+        st.write(f"Interned records: {report['interned_records']}, shared objects: "
+                 f"{report['shared_objects']}, evictions: {report['evictions']}")
+        for key, size in sorted((sizes or {}).items(), key=lambda kv: kv[1], reverse=True)[:10]:
+            st.write(f"- `{key}`: {size / 1024:.1f} KB")
@@ -2,6 +2,11 @@ import streamlit as st
 import json
 import os
 
+import lazy_loader
+import page_router
+import render_profiler
+import session_memory
+
 HISTORY_FILE = "history.json"
 
 # ------------------- Helpers -------------------
@@ -18,12 +23,25 @@ def save_history(history):
     with open(HISTORY_FILE, "w") as f:
         json.dump(history, f, indent=2)
 
+# ------------------- Background Jobs -------------------
+# Pre-fetch trending news so the News Analysis page reads a local snapshot
+# instead of waiting on the LLM (no-op if already running in this process).
+import news_ingest
+news_ingest.start_scheduler()
+
+# Prometheus /metrics on METRICS_PORT (once per process; no-op without prometheus_client)
+import app_metrics
+app_metrics.start_metrics_server(session_count=session_memory.session_count)
+
+# Drop state this session was asked to give up while it sat idle (see session_memory.account)
+session_memory.apply_evictions()
+
 # ------------------- Page Selection -------------------
 if "page" not in st.session_state:
     st.session_state.page = "Home"
 
-# Build available pages. Home is the front page with buttons.
-pages = ["Home", "Ella", "Meimei", "Lucas", "Translate Chat", "News Analysis"]
+# Available pages come from the registry. Home is the front page with profile buttons.
+pages = list(page_router.PAGES)
 
 # Preserve the last selected page 
 current_page = st.session_state.get("page", "Home")
@@ -43,93 +61,21 @@ if is_valid_page:
 
 page = st.session_state.page
 
-# ------------------- Home / Front Page -------------------
-if page == "Home":
-    st.title("Welcome")
-    st.write("Choose a profile to continue:")
-
-    # passwords for protected profiles; required value is '1314'
-    SECRET_PW = "1314"
-
-    # First row: Ella, Meimei, Lucas
-    c1, c2, c3 = st.columns(3)
-    with c1:
-        if st.button("👧 Ella"):
-            st.session_state.page = "Ella"
-            st.rerun()
-    with c2:
-        if st.button("🧒 Meimei"):
-            st.session_state.page = "Meimei"
-            st.rerun()
-    with c3:
-        if st.button("🧑‍🎓 Lucas"):
-            st.session_state.page = "Lucas"
-            st.rerun()
-
-    # Second row: David, Mika, Wai Wai (all use Translate Chat)
-    c4, c5, c6 = st.columns(3)
-    with c4:
-        if st.button("🕵️ David"):
-            st.session_state.page = "Translate Chat"
-            st.rerun()
-    with c5:
-        if st.button("🎧 Mika"):
-            st.session_state.page = "Translate Chat"
-            st.rerun()
-    with c6:
-        if st.button("🎨 Wai Wai"):
-            st.session_state.page = "Translate Chat"
-            st.rerun()
-
-# ------------------- Practice Pages -------------------
-
-# Ella page
-if page == "Ella":
-    try:
-        import primary_math
-        primary_math.show(user="ella")
-    except Exception as e:
-        st.error(f"Failed to load Ella page: {e}")
-    st.stop()
-
-# Meimei page
-if page == "Meimei":
-    try:
-        import primary_math
-        primary_math.show(user="meimei")
-    except Exception as e:
-        st.error(f"Failed to load Meimei page: {e}")
-    st.stop()
-
-# Lucas page
-if page == "Lucas":
-    try:
-        import primary_math
-        primary_math.show(user="lucas")
-    except Exception as e:
-        st.error(f"Failed to load Lucas page: {e}")
-    st.stop()
-
-# ------------------- Translate Chat page (load module) -------------------
-if page == "Translate Chat":
-    try:
-        import translate_chat
-        # translate_chat is import-safe and exposes a `main()` function
-        # that must be called to render the page (it does not render on import).
-        translate_chat.main()
-    except Exception as e:
-        st.error(f"Failed to load Translate Chat page: {e}")
-        st.exception(e)
-    st.stop()
-
-# ------------------- News Analysis page -------------------
-if page == "News Analysis":
-    try:
-        import news_analysis
-        news_analysis.main()
-    except Exception as e:
-        st.error(f"Failed to load News Analysis page: {e}")
-        st.exception(e)
-    st.stop()
-
-
+# Debug panel (enable with APP_DEBUG=1 or ?debug=1)
+debug = os.environ.get("APP_DEBUG") == "1" or st.query_params.get("debug") == "1"
+if debug:
+    lazy_loader.render_debug_panel(st, ("primary_math", "translate_chat", "news_analysis"))
+
+# ------------------- Dispatch -------------------
+# Pages, their entry points and the Home profile buttons are declared in page_router.
+# With APP_PROFILE set, the rerun's sections are timed (see render_profiler).
+with render_profiler.rerun(page):
+    page_router.route(page)
+
+    # ------------------- Memory Budget -------------------
+    # Measure this session's state and evict bulky entries from idle sessions if over budget
+    with render_profiler.span("session_memory.account"):
+        memory_sizes = session_memory.account()
+if debug:
+    session_memory.render_debug_panel(st, memory_sizes)
+render_profiler.render_debug_panel(st)
@@ -0,0 +1,27 @@
+import random
+
+import adaptive
+import question_bank
+
+
+def test_mixed_operations_bank_questions_are_classified():
+    questions = question_bank.generate_questions("P5", 20, topics=["mixed_operations"], rng=random.Random(0))
+    assert questions
+    for question, _ in questions:
+        assert adaptive.classify_topic(question) == "mixed_operations", question
+
+
+def test_single_operations_keep_their_topics():
+    assert adaptive.classify_topic("7 × 8 = ?") == "multiplication"
+    assert adaptive.classify_topic("144 ÷ 12 = ?") == "division"
+    assert adaptive.classify_topic("25 + 17 = ?") == "addition"
+    assert adaptive.classify_topic("40 - 18 = ?") == "subtraction"
+
+
+def test_record_session_uses_the_page_grade(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    # "80%" typed for an answer of 80 is stored as 0.8 but was graded correct on the page
+    results = [{"q": "What is 40% of 200?", "ans": 0.8, "correct": 80, "is_correct": True}]
+    start = adaptive.LEVEL_RATINGS["P5"] + adaptive.TARGET_GAP
+    topics = adaptive.record_session("tester", "P5", results)
+    assert topics["percentages"]["rating"] > start
@@ -0,0 +1,41 @@
+from fractions import Fraction
+
+import answer_check
+from llm_helper import LLMHelper
+
+
+def test_exact_and_rounded_answers():
+    assert answer_check.grade("3/4", 0.75)
+    assert answer_check.grade("1 1/2", 1.5)
+    assert answer_check.grade("1,200", 1200)
+    assert answer_check.grade("$40", 40)
+    assert answer_check.grade("0.33", Fraction(1, 3))
+    assert answer_check.grade("2/3", 2 / 3)
+    assert answer_check.grade("0.3", 0.1 + 0.2)
+    assert not answer_check.grade("0.3", Fraction(1, 3))
+    assert not answer_check.grade("", 5)
+    assert not answer_check.grade(None, 5)
+
+
+def test_percent_answer_against_plain_key_is_divided_by_100():
+    assert answer_check.grade("80%", 0.8)
+    assert answer_check.grade("25%", Fraction(1, 4))
+    assert not answer_check.grade("12%", 12)
+    assert not answer_check.grade("0.8%", 0.8)
+
+
+def test_percent_key_is_compared_in_percent_units():
+    key = answer_check.to_key("25%")
+    assert key == "25%"
+    assert answer_check.grade("25", key)
+    assert answer_check.grade("25%", key)
+    assert not answer_check.grade("0.25", key)
+    assert answer_check.format_answer(key) == "25%"
+    assert answer_check.to_fraction(key) == Fraction(1, 4)
+
+
+def test_llm_percent_key_is_kept_as_percentage():
+    helper = LLMHelper(api_key="test", base_url="http://127.0.0.1:9/v1")  # never called
+    questions = helper._parse_math_response("Q: What percentage of 80 is 20?\nA: 25%\n\nQ: 7 × 8 = ?\nA: 56")
+    assert questions == [("What percentage of 80 is 20?", "25%"), ("7 × 8 = ?", 56)]
+    assert answer_check.grade("25", questions[0][1])
@@ -0,0 +1,23 @@
+from fractions import Fraction
+
+import answer_check
+import answer_verify
+
+
+def test_non_terminating_keys_are_accepted():
+    # Keys are stored as floats by LLMHelper._parse_math_response
+    assert answer_verify.verify_question("1/3 + 1/3 = ?", answer_check.to_number(Fraction(2, 3))) is True
+    assert answer_verify.verify_question("2/3 × 1 = ?", 2 / 3) is True
+    assert answer_verify.verify_question("10 ÷ 3 = ?", answer_check.to_number(Fraction(10, 3))) is True
+
+
+def test_wrong_keys_are_rejected():
+    assert answer_verify.verify_question("10 ÷ 3 = ?", 3.33) is False
+    assert answer_verify.verify_question("15% of 80 = ?", 11) is False
+    kept, rejected = answer_verify.verify_questions([("144 ÷ 12 = ?", 12), ("7 × 8 = ?", 54)])
+    assert kept == [("144 ÷ 12 = ?", 12)]
+    assert rejected == [("7 × 8 = ?", 54)]
+
+
+def test_word_problems_are_not_verifiable():
+    assert answer_verify.verify_question("Sarah has 5 apples and eats 2. How many are left?", 3) is None
@@ -0,0 +1,17 @@
+from llm_helper import LLMHelper
+
+
+class _FailingHelper(LLMHelper):
+    def complete(self, *args, **kwargs):
+        raise RuntimeError("provider down")
+
+
+def test_bank_fill_returns_exactly_count_when_a_topic_runs_out():
+    helper = _FailingHelper(api_key="test", base_url="http://127.0.0.1:9/v1")
+    # P1 multiplication has fewer than 18 distinct questions
+    mix = {"multiplication": 18, "addition": 1, "subtraction": 1}
+    result = helper.generate_math_question_set("P1", 20, topic_mix=mix)
+    assert len(result.questions) == 20
+    assert len({q for q, _ in result.questions}) == 20
+    assert result.local_count == 20
+    assert result.error == "provider down"
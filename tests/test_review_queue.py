@@ -0,0 +1,27 @@
+from datetime import datetime, timedelta
+
+import review_queue
+
+
+def test_record_results_uses_the_page_grade(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    now = datetime(2026, 1, 1, 16, 0)
+    results = [
+        {"q": "What is 40% of 200?", "ans": 0.8, "correct": 80, "is_correct": True},
+        {"q": "7 × 8 = ?", "ans": 54, "correct": 56, "is_correct": False},
+    ]
+    review_queue.record_results("tester", "P5", results, now=now)
+    queue = review_queue.get_queue("tester")
+    assert "7 × 8 = ?" in queue
+    assert "What is 40% of 200?" not in queue
+
+
+def test_rescheduling_to_the_same_due_date_returns_the_question_once():
+    now = datetime(2026, 1, 1, 16, 0)
+    queue = review_queue.ReviewQueue()
+    queue.record("7 × 8 = ?", 56, "P3", False, now)
+    queue.record("7 × 8 = ?", 56, "P3", False, now)  # same box, so the same due date
+    due = queue.due(now + timedelta(days=1), level="P3")
+    assert [item["q"] for item in due] == ["7 × 8 = ?"]
+    # due() leaves items in the queue
+    assert len(queue.due(now + timedelta(days=1))) == 1
@@ -0,0 +1,166 @@
+"""
+Token Budget Module
+Learned `max_tokens` limits for LLM calls whose output size is predictable.
+
+For each budgeted feature the completion tokens per unit of output (a math
+question, a news item, or the whole reply) are tracked as an exponentially
+weighted mean and variance, from llm_telemetry events: seeded from the
+metrics file on first use and updated by every new call. Estimates are kept
+per key (e.g. math level and style) and per feature, and the most specific
+one with enough samples is used:
+
+    max_tokens = units * (mean + SIGMAS * std), at least units * mean * (1 + MARGIN)
+
+clamped to the feature's floor and cap. Until a feature has MIN_SAMPLES
+calls its prior (the previous fixed limit) applies.
+
+A reply cut off at max_tokens only shows that the need was larger, so it
+is counted as TRUNCATION_BUMP times what it used (or the mean, if higher).
+"""
+
+import math
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+ALPHA = 0.2  # weight of the newest sample
+MARGIN = 0.2
+SIGMAS = 2.0
+MIN_SAMPLES = 3
+TRUNCATION_BUMP = 1.5
+SEED_EVENTS = 5000
+
+
+@dataclass(frozen=True)
+class BudgetSpec:
+    """How a feature's output is measured and limited."""
+    prior_per_unit: float  # tokens per unit before there are samples
+    floor: int
+    cap: int
+    unit_field: Optional[str] = None  # event field with the number of units (None: one per call)
+    key_fields: Tuple[str, ...] = ()  # event fields estimates are kept per
+
+
+SPECS: Dict[str, BudgetSpec] = {
+    "math_questions": BudgetSpec(80, floor=300, cap=4000, unit_field="count", key_fields=("level", "style")),
+    "news_trending": BudgetSpec(2000, floor=800, cap=4000),
+    "news_impact": BudgetSpec(1500, floor=600, cap=3000),
+    "news_custom": BudgetSpec(340, floor=400, cap=2500, unit_field="top_n"),
+}
+
+
+class _Estimate:
+    """Exponentially weighted mean and variance of tokens per unit."""
+
+    def __init__(self):
+        self.samples = 0
+        self.mean = 0.0
+        self.var = 0.0
+
+    def add(self, value: float) -> None:
+        self.samples += 1
+        if self.samples == 1:
+            self.mean = value
+            return
+        delta = value - self.mean
+        self.mean += ALPHA * delta
+        self.var = (1 - ALPHA) * (self.var + ALPHA * delta * delta)
+
+    def per_unit(self) -> float:
+        return max(self.mean + SIGMAS * math.sqrt(self.var), self.mean * (1 + MARGIN))
+
+
+_lock = threading.Lock()
+_estimates: Dict[tuple, _Estimate] = {}
+_seeded = False
+
+
+def _keys(feature: str, spec: BudgetSpec, fields: dict) -> List[tuple]:
+    """Most specific key first, then the feature-wide key."""
+    keys = [(feature,)]
+    if spec.key_fields:
+        keys.insert(0, (feature, *(str(fields.get(f)) for f in spec.key_fields)))
+    return keys
+
+
+# ------------------- Learning -------------------
+
+
+def _observe(event: dict) -> None:
+    """Update the estimates from one event (caller holds the lock)."""
+    spec = SPECS.get(event.get("feature"))
+    tokens = event.get("completion_tokens")
+    if spec is None or not event.get("ok") or not tokens:
+        return
+    units = event.get(spec.unit_field, 1) if spec.unit_field else 1
+    if not isinstance(units, (int, float)) or units <= 0:
+        return
+
+    keys = _keys(event["feature"], spec, event)
+    value = tokens / units
+    if event.get("finish_reason") == "length":
+        current = _estimates.get(keys[0])
+        value = max(value, current.mean if current else 0.0) * TRUNCATION_BUMP
+    for key in keys:
+        _estimates.setdefault(key, _Estimate()).add(value)
+
+
+def observe(event: dict) -> None:
+    """Learn from a telemetry event (called by llm_telemetry.record)."""
+    if _ensure_seeded():
+        return  # the replay already included this event
+    with _lock:
+        _observe(event)
+
+
+def _ensure_seeded() -> bool:
+    """Replay the metrics file once, so estimates survive restarts; True if this call did it."""
+    global _seeded
+    if _seeded:
+        return False
+    import llm_telemetry  # imported here: llm_telemetry imports this module
+
+    events = llm_telemetry.load_events(SEED_EVENTS)
+    with _lock:
+        if _seeded:
+            return False
+        for event in events:
+            _observe(event)
+        _seeded = True
+    return True
+
+
+# ------------------- Budgets -------------------
+
+
+def max_tokens(feature: str, units: float = 1, **fields) -> int:
+    """
+    The max_tokens to request for a call.
+
+    Args:
+        feature: Telemetry feature name (a key of SPECS)
+        units: Amount of output asked for, in the feature's unit (e.g. question count)
+        **fields: Values of the feature's key fields (e.g. level="P3", style="Balanced (Mixed)")
+
+    Returns:
+        Token limit for the request
+    """
+    spec = SPECS[feature]
+    _ensure_seeded()
+    per_unit = spec.prior_per_unit
+    with _lock:
+        for key in _keys(feature, spec, fields):
+            estimate = _estimates.get(key)
+            if estimate and estimate.samples >= MIN_SAMPLES:
+                per_unit = estimate.per_unit()
+                break
+    return int(min(spec.cap, max(spec.floor, math.ceil(max(1, units) * per_unit))))
+
+
+def summary() -> List[dict]:
+    """One row per learned key for the Admin page."""
+    _ensure_seeded()
+    with _lock:
+        return [{"key": " / ".join(key), "samples": e.samples, "mean tokens/unit": round(e.mean, 1),
+                 "std": round(math.sqrt(e.var), 1), "budget tokens/unit": round(e.per_unit(), 1)}
+                for key, e in sorted(_estimates.items())]
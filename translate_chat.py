@@ -2,9 +2,16 @@ import streamlit as st
 import requests
 import os
 import json
+import time
+import threading
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Dict, List, Optional
-from llm_helper import get_llm_helper
+from typing import Dict, List, Optional, Tuple
+from llm_helper import Translation, get_async_llm_helper
+import app_metrics
+import async_bridge
+import render_profiler
+import session_memory
 
 # NOTE: Do not import `streamlit` or access `st.secrets` at module import time.
 # This file is now import-safe: Streamlit is imported inside `main()`.
@@ -22,7 +29,10 @@ GITHUB_GIST_ID: Optional[str] = None
 
 # App configuration
 MAX_HISTORY = 100
+GITHUB_API_URL = os.environ.get("GITHUB_API_URL", "https://api.github.com")
 GIST_FILENAME = "chat_history.json"
+REFRESH_SECONDS = 30  # re-read the gist (for messages written elsewhere) at most this often
+TRANSLATE_TIMEOUT = 90  # seconds for both translations of a message
 
 # ============================================
 # GITHUB GIST STORAGE MANAGER
@@ -34,7 +44,7 @@ class GitHubGistStorage:
     def __init__(self, gist_id: str, github_token: str):
         self.gist_id = gist_id
         self.github_token = github_token
-        self.gist_api_url = f"https://api.github.com/gists/{gist_id}"
+        self.gist_api_url = f"{GITHUB_API_URL}/gists/{gist_id}"
         self.headers = {
             "Authorization": f"token {github_token}",
             "Accept": "application/vnd.github.v3+json",
@@ -144,6 +154,127 @@ class GitHubGistStorage:
         except:
             return False
 
+# ============================================
+# SHARED HISTORY CACHE (ONE PER GIST, ALL SESSIONS)
+# ============================================
+
+class ReadWriteLock:
+    """Many readers or one writer; waiting writers block new readers so they are not starved."""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._readers = 0
+        self._writer = False
+        self._waiting_writers = 0
+
+    @contextmanager
+    def read(self):
+        with self._cond:
+            while self._writer or self._waiting_writers:
+                self._cond.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def write(self):
+        with self._cond:
+            self._waiting_writers += 1
+            while self._writer or self._readers:
+                self._cond.wait()
+            self._waiting_writers -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writer = False
+                self._cond.notify_all()
+
+
+class SharedChatHistory:
+    """
+    Process-wide chat history for one gist.
+
+    All sessions read the same list and subscribe by version number, so the
+    gist is downloaded once per REFRESH_SECONDS instead of once per session.
+    Appends replace the list (copy-on-write), so a list handed to a reader
+    never changes under it. All gist I/O for the chat goes through here.
+    """
+
+    def __init__(self, storage: GitHubGistStorage):
+        self.storage = storage
+        self._lock = ReadWriteLock()
+        self._entries: List[Dict] = []
+        self._version = 0
+        self._saved_version = 0
+        self._loaded_at: Optional[float] = None
+        self._refresh_lock = threading.Lock()  # one gist download at a time
+        self._save_lock = threading.Lock()  # one gist upload at a time
+
+    def read(self) -> Tuple[int, List[Dict]]:
+        """Return (version, entries); entries must not be modified by the caller."""
+        self._refresh_if_stale()
+        with self._lock.read():
+            return self._version, self._entries
+
+    def append(self, entry: Dict) -> int:
+        """Add a message once for every session and save it to the gist. Returns the new version."""
+        self._refresh_if_stale()  # never save over a gist we have not read yet
+        with self._lock.write():
+            self._entries = (self._entries + [entry])[-MAX_HISTORY:]
+            self._version += 1
+            version = self._version
+        self._save()
+        return version
+
+    def _save(self) -> None:
+        with self._save_lock:
+            with self._lock.read():
+                version, entries = self._version, self._entries
+            if version <= self._saved_version:
+                return  # a concurrent save already included this message
+            started = time.perf_counter()
+            saved = self.storage.save(entries)
+            app_metrics.GIST_SECONDS.labels(op="save", outcome="ok" if saved else "error").observe(
+                time.perf_counter() - started)
+            if saved:
+                self._saved_version = version
+
+    def _refresh_if_stale(self) -> None:
+        if self._loaded_at is not None and time.time() - self._loaded_at < REFRESH_SECONDS:
+            return
+        # The first load blocks; later refreshes are skipped while another thread is downloading
+        if not self._refresh_lock.acquire(blocking=self._loaded_at is None):
+            return
+        try:
+            if self._loaded_at is not None and time.time() - self._loaded_at < REFRESH_SECONDS:
+                return
+            started = time.perf_counter()
+            loaded = self.storage.load()
+            app_metrics.GIST_SECONDS.labels(op="load", outcome="ok" if loaded else "empty").observe(
+                time.perf_counter() - started)
+            with self._lock.write():
+                # Keep unsaved local messages, and don't let a failed download ([]) wipe the cache
+                if self._version == self._saved_version and (loaded or not self._entries) and loaded != self._entries:
+                    self._entries = loaded
+                    self._version += 1
+                    self._saved_version = self._version
+                self._loaded_at = time.time()
+        finally:
+            self._refresh_lock.release()
+
+
+def get_shared_history(gist_id: str, github_token: str) -> SharedChatHistory:
+    """The process-wide history cache for a gist."""
+    return session_memory.shared(
+        "chat_history", gist_id, lambda: SharedChatHistory(GitHubGistStorage(gist_id, github_token)))
+
 # ============================================
 # OPENROUTER TRANSLATOR (REPLACES DEEPSEEK TRANSLATOR)
 # ============================================
@@ -204,12 +335,14 @@ def main():
             st.stop()
 
         # Initialize components (store instances in session state)
-        if 'storage' not in st.session_state:
-            st.session_state.storage = GitHubGistStorage(gist_id, github_token)
-            st.session_state.chat_history = st.session_state.storage.load()
+        # One history per gist for the whole process; sessions only keep the version they have seen
+        chat = get_shared_history(gist_id, github_token)
+        with render_profiler.span("chat.history"):
+            chat_version, chat_history = chat.read()
 
-        if 'llm_helper' not in st.session_state:
-            st.session_state.llm_helper = get_llm_helper(openrouter_key)
+        if 'async_llm_helper' not in st.session_state:
+            st.session_state.async_llm_helper = session_memory.shared(
+                "async_llm_helper", openrouter_key, lambda: get_async_llm_helper(openrouter_key))
     except Exception as _e:
         st.error("An error occurred during app initialization — check details below.")
         st.exception(_e)
@@ -221,31 +354,38 @@ def main():
     
     st.write("##### Chat Room")
     st.divider()
-    
+
+    # Subscription: tell the user when others posted since this session last looked
+    seen_version = st.session_state.get('chat_version')
+    if seen_version is not None and chat_version > seen_version:
+        st.toast("💬 New messages")
+    st.session_state.chat_version = chat_version
+
     # Chat history display
-    if st.session_state.chat_history:
-        # Show last 100 items
-        for entry in st.session_state.chat_history[-100:]:
-            sender = entry.get('sender', 'Unknown')
-            is_current_user = sender == st.session_state.current_user
+    if chat_history:
+        with render_profiler.span("chat.render", messages=min(len(chat_history), 100)):
+            # Show last 100 items
+            for entry in chat_history[-100:]:
+                sender = entry.get('sender', 'Unknown')
+                is_current_user = sender == st.session_state.current_user
             
-            # Determine alignment
-            if is_current_user:
-                # Left aligned for current user
-                col1, col2 = st.columns([0.3, 0.7])
-                with col1:
-                    st.markdown(f"<small style='color: gray;'>{sender} • {entry['timestamp']}</small>", unsafe_allow_html=True)
-                    st.markdown(f"<small>{entry['english']}</small>", unsafe_allow_html=True)
-                    st.markdown(f"<small>{entry['myanmar']}</small>", unsafe_allow_html=True)
-            else:
-                # Right aligned for others
-                col1, col2 = st.columns([0.7, 0.3])
-                with col2:
-                    st.markdown(f"<small style='color: gray; text-align: right;'>{sender} • {entry['timestamp']}</small>", unsafe_allow_html=True)
-                    st.markdown(f"<small style='text-align: right;'>{entry['english']}</small>", unsafe_allow_html=True)
-                    st.markdown(f"<small style='text-align: right;'>{entry['myanmar']}</small>", unsafe_allow_html=True)
+                # Determine alignment
+                if is_current_user:
+                    # Left aligned for current user
+                    col1, col2 = st.columns([0.3, 0.7])
+                    with col1:
+                        st.markdown(f"<small style='color: gray;'>{sender} • {entry['timestamp']}</small>", unsafe_allow_html=True)
+                        st.markdown(f"<small>{entry['english']}</small>", unsafe_allow_html=True)
+                        st.markdown(f"<small>{entry['myanmar']}</small>", unsafe_allow_html=True)
+                else:
+                    # Right aligned for others
+                    col1, col2 = st.columns([0.7, 0.3])
+                    with col2:
+                        st.markdown(f"<small style='color: gray; text-align: right;'>{sender} • {entry['timestamp']}</small>", unsafe_allow_html=True)
+                        st.markdown(f"<small style='text-align: right;'>{entry['english']}</small>", unsafe_allow_html=True)
+                        st.markdown(f"<small style='text-align: right;'>{entry['myanmar']}</small>", unsafe_allow_html=True)
             
-            st.write("")  # Minimal spacing
+                st.write("")  # Minimal spacing
     else:
         st.write("No chat history yet. Start translating!")
     
@@ -273,6 +413,13 @@ def main():
                 st.markdown(f"<small style='color: gray; text-align: right;'>{sender} • {current_entry['timestamp']}</small>", unsafe_allow_html=True)
                 st.markdown(f"<small style='text-align: right;'>{current_entry['english']}</small>", unsafe_allow_html=True)
                 st.markdown(f"<small style='text-align: right;'>{current_entry['myanmar']}</small>", unsafe_allow_html=True)
+
+        # If a translation failed, show the cause behind the message
+        errors = st.session_state.get('translation_errors')
+        if errors:
+            with st.expander("Debug: Error Details"):
+                for error in errors:
+                    st.write(f"Error: {error}")
     
     st.divider()
     # Main input area
@@ -281,9 +428,14 @@ def main():
     if st.button("Send"):
         if txt:
             with st.spinner("Translating..."):
-                # Get translations
-                english_text = st.session_state.llm_helper.translate_to_english(txt)
-                myanmar_text = st.session_state.llm_helper.translate_to_myanmar(txt)
+                # Both translations run concurrently on the background event loop
+                llm = st.session_state.async_llm_helper
+                try:
+                    english, myanmar = async_bridge.gather(
+                        llm.translate(txt, "en"), llm.translate(txt, "my"), timeout=TRANSLATE_TIMEOUT)
+                except TimeoutError:
+                    english = myanmar = Translation("Translation error: timed out", error="timed out")
+                english_text, myanmar_text = english.text, myanmar.text
 
                 # Create chat history entry
                 new_entry = {
@@ -296,20 +448,13 @@ def main():
 
                 # Store current response in session state before adding to history
                 st.session_state.current_response = new_entry
+                st.session_state.translation_errors = [t.error for t in (english, myanmar) if t.error]
 
                 # Add to history and save
-                st.session_state.chat_history.append(new_entry)
-                st.session_state.storage.save(st.session_state.chat_history)
+                st.session_state.chat_version = chat.append(new_entry)
 
                 # Force a rerun to show the current response
                 st.rerun()
-                    
-                # If there was an error, show debug info
-                if (isinstance(english_text, str) and english_text.startswith("Translation error")) or (
-                    isinstance(myanmar_text, str) and myanmar_text.startswith("Translation error")):
-                    with st.expander("Debug: Error Details"):
-                        if st.session_state.llm_helper.last_error:
-                            st.write(f"Error: {st.session_state.llm_helper.last_error}")
         else:
             st.info("Enter some text first")
 